@@ -170,10 +170,15 @@
 #
 # Apr 17 2025: read VERSION_PHOTOMETRY keys from BBC FITRES file and write them to INFO.YAML
 #
+# Oct 2026: new --batch_task_file option to process a queue of covmat tasks
+#   in one process (used by submit_batch_jobs with COVMAT_BATCH_MODE).
+#   Parsed hubble diagrams are cached per input dir so that each M0DIF/FITRES
+#   file is read once for all COVMATOPTs.
+#
 # ===============================================
 
 import os, argparse, logging, shutil, time, datetime, subprocess
-import re, yaml, sys, gzip, math, gc
+import re, yaml, sys, gzip, math, gc, shlex
 import numpy  as np
 import pandas as pd
 from   pathlib import Path
@@ -271,6 +276,16 @@ DATE_STAMP = ('%4.4d-%2.2d-%2.2d' % (tnow.year,tnow.month,tnow.day) )
 
 MAXROW_DETCOV_TEST = 1000  # compute and print det(cov) for regression tests if fewer than 1000 rows
 
+# Oct 2026: keys for --batch_task_file, and cache of parsed hubble diagrams
+#   HD_CACHE[data_dir][infile] = (mtime, subtract_vpec, df) ; 
+#   only used in batch mode.
+KEY_BATCH_TASK_LIST = "TASK_LIST"
+KEY_BATCH_LOG_FILE  = "LOG_FILE"
+KEY_BATCH_DONE_FILE = "DONE_FILE"
+KEY_BATCH_ARGS      = "ARGS"
+USE_HD_CACHE        = False
+HD_CACHE            = {}
+
 # ============================
 def setup_logging():
 
@@ -290,7 +305,8 @@ def read_yaml(path):
         return yaml.safe_load(f.read())
 
 
-def get_args():
+def get_args(argv=None):
+    # Oct 2026: optional argv list for tasks in --batch_task_file
     parser = argparse.ArgumentParser()
     
     msg = "HELP menu for config options"
@@ -381,12 +397,16 @@ def get_args():
     parser.add_argument("--yaml_file", help=msg, 
                         nargs='?', type=str, default=None )
 
+    msg = "yaml file with list of tasks to process in one job (for submit_batch_jobs)"
+    parser.add_argument("--batch_task_file", help=msg, 
+                        nargs='?', type=str, default=None )
+
     msg = "debug flag for development"
     parser.add_argument("--debug_flag", help=msg,
                         nargs='?', type=int, default=0 ) 
     
     # parse it
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     if args.subtract_vpec:
         args.unbinned = True
 
@@ -403,7 +423,7 @@ def get_args():
     else:
         sys.exit(f"\n ERROR: invalid --write_format_cov {args.write_format_cov}") 
 
-    if len(sys.argv) == 1:
+    if argv is None and len(sys.argv) == 1:
         parser.print_help()
         sys.exit()
 
@@ -611,6 +631,36 @@ def load_hubble_diagram(hd_file, args, config):
     # end load_hubble_diagram
 
 
+def load_hubble_diagram_cached(hd_file, args, config):
+
+    # Created Oct 2026
+    # In batch mode, return copy of previously parsed hubble diagram 
+    # if hd_file is unchanged; otherwise call load_hubble_diagram.
+    # Cache is per data dir, and the cache for other dirs is dropped
+    # to limit memory when the task queue moves on to next data dir.
+
+    if not USE_HD_CACHE :
+        return load_hubble_diagram(hd_file, args, config)
+
+    data_dir  = str(Path(hd_file).parent)
+    infile    = Path(hd_file).name
+    mtime     = os.path.getmtime(hd_file)
+
+    for cache_dir in list(HD_CACHE.keys()):
+        if cache_dir != data_dir : del HD_CACHE[cache_dir]
+    dir_cache = HD_CACHE.setdefault(data_dir,{})
+
+    if infile in dir_cache :
+        mtime_cache, subtract_vpec, df = dir_cache[infile]
+        if mtime_cache == mtime and subtract_vpec == args.subtract_vpec :
+            logging.debug(f"\tUse cached hubble diagram for {hd_file}")
+            return df.copy()
+
+    df = load_hubble_diagram(hd_file, args, config)
+    dir_cache[infile] = (mtime, args.subtract_vpec, df)
+    return df.copy()
+    # end load_hubble_diagram_cached
+
 def get_hubble_diagrams(folder, args, config):
 
     # return table for each Hubble diagram 
@@ -659,7 +709,7 @@ def get_hubble_diagrams(folder, args, config):
             hd_file = folder_expand/infile
 
             # grab contents of every M0DIF(binned) or FITRES(unbinned) hd file 
-            HD_list[label] = load_hubble_diagram(hd_file, args, config)
+            HD_list[label] = load_hubble_diagram_cached(hd_file, args, config)
             if first_load:  
                 hd_header_info  = read_header_info(hd_file)
                 cospar_biascor  = get_cospar_sim(hd_header_info)
@@ -2410,6 +2460,63 @@ def write_yaml(args, n_cov, covsize):
     return
     # end write_yaml
 
+def run_batch_tasks(args):
+
+    # Created Oct 2026
+    # Process each task in args.batch_task_file within this process 
+    # so that python modules are imported once and hubble diagrams are
+    # parsed once per data dir. Each task has its own LOG and DONE file
+    # (same as a separate create_covariance job) and a task failure
+    # does not stop the remaining tasks; submit_batch_jobs identifies
+    # failed tasks from missing --yaml_file output.
+
+    global USE_HD_CACHE, m_REF
+    USE_HD_CACHE = True
+    m_REF_orig   = m_REF
+
+    task_info  = read_yaml(args.batch_task_file)
+    task_list  = task_info[KEY_BATCH_TASK_LIST]
+    n_task     = len(task_list)
+    root_log   = logging.getLogger()
+    log_format = "[%(levelname)6s |%(filename)10s] %(message)s"
+    n_fail     = 0
+
+    logging.info(f"Process {n_task} tasks from {args.batch_task_file}")
+
+    for itask, task in enumerate(task_list):
+        log_file  = task[KEY_BATCH_LOG_FILE]
+        done_file = task[KEY_BATCH_DONE_FILE]
+        argv      = [ args.input_file ] + shlex.split(task[KEY_BATCH_ARGS])
+        logging.info(f"Begin task {itask+1} of {n_task}: {log_file}")
+        sys.stdout.flush()
+
+        handler = logging.FileHandler(log_file, mode='w')
+        handler.setFormatter(logging.Formatter(log_format))
+        root_log.addHandler(handler)
+        try:
+            m_REF           = m_REF_orig
+            task_args       = get_args(argv)
+            task_args.tstart_all = time.time()
+            logging.info(f"# Task args: {' '.join(argv)}")
+            config          = read_yaml(task_args.input_file)
+            prep_config(config,task_args)
+            create_covariance(config, task_args)
+            loginfo_cpu_summary(task_args)
+            logging.info('Done.')
+        except (Exception, SystemExit) as e:
+            logging.exception(e)
+            n_fail += 1
+        finally:
+            root_log.removeHandler(handler)
+            handler.close()
+            gc.collect()
+
+        Path(done_file).touch()
+
+    logging.info(f"Finished {n_task} tasks ({n_fail} failed)")
+    return
+    # end run_batch_tasks
+
 # ===================================================
 if __name__ == "__main__":
 
@@ -2423,6 +2530,11 @@ if __name__ == "__main__":
 
         args            = get_args()
         args.tstart_all = time.time()
+
+        if args.batch_task_file is not None:
+            run_batch_tasks(args)
+            sys.exit(0)
+
         config          = read_yaml(args.input_file)
         prep_config(config,args)  # expand vars, set defaults, etc ...
 
@@ -0,0 +1,513 @@
+#!/usr/bin/env python
+#
+# Created Oct 2026
+# Throughput benchmark for the makeDataFiles ingestion path.
+# A fake in-memory reader (data_bench) generates synthetic LSST events
+# with a fixed seed, and the events are processed by the unmodified
+# Program.read_data_driver for each output writer:
+#   TEXT    : --outdir_snana (TEXT files only; no snana.exe TEXT->FITS)
+#   FITS    : --outdir_snana --write_fits_direct
+#   CSV     : --outdir_csv
+#   PARQUET : --outdir_csv --parquet  (requires pyarrow)
+#
+# For each writer, report events/sec, observations/sec, and per-stage
+#   ncall and time. With --tracemalloc, also report per stage the
+#   number of allocated python memory blocks and allocated MB (net
+#   change summed over calls), and the largest peak allocation above
+#   start of stage in any call. Allocation stats are opt-in because
+#   they slow down every stage (sys.getallocatedblocks loops over
+#   memory arenas).
+#
+# Stages:
+#   init       Program init and writer init (e.g., imports, open files)
+#   read       fake reader: prep_read_data_subgroup, read_event[_batch]
+#   select     select_subsample[_batch]
+#   data_unit  which_data_unit[_batch]
+#   compute    compute_data_event, compute_data_batch
+#   unpack     get_batch_event (--batch_read only)
+#   write      write_data_event (writer + README stats)
+#   end_write  after end_read_data: close files, aux & README files
+#   other      driver loop, screen updates, ...
+#
+# Usage:
+#   bench_makeDataFiles.py --nevt 20000 --nobs 100
+#   bench_makeDataFiles.py --nevt 20000 --nobs 100 --writers FITS CSV \
+#         --batch_read --tracemalloc --output_yaml_file bench.yaml
+#   bench_makeDataFiles.py --nevt 20000 --writers TEXT --profile
+#
+# Use the same --nevt, --nobs and --seed to compare numbers before and
+# after a code change.
+#
+
+import argparse, contextlib, logging, os, shutil, sys, tempfile, time
+import tracemalloc
+
+import numpy as np
+import yaml
+
+import makeDataFiles_params as gpar
+import makeDataFiles_util   as util
+import makeDataFiles_main
+from   makeDataFiles_base   import Program
+from   write_data_csv       import PYARROW_EXISTS
+
+BENCH_SURVEY       = "LSST"
+BENCH_SNID_START   = 1000000
+BENCH_MJD_START    = 60800.0    # LSST season 1 starts at MJD 60750
+BENCH_MJD_RANGE    = 600.0      # range of first MJD of events
+BENCH_NDAY_LCURVE  = 150.0      # days of light curve per event
+BENCH_BAND_LIST    = list(gpar.SURVEY_INFO['FILTERS'][BENCH_SURVEY])
+BENCH_FIELD        = "WFD"
+BENCH_SNR_DETECT   = 5.0
+
+BENCH_WRITER_LIST = [ gpar.FORMAT_TEXT, gpar.FORMAT_FITS,
+                      gpar.FORMAT_CSV,  gpar.FORMAT_PARQUET ]
+
+BENCH_STAGE_LIST = [ 'init', 'read', 'select', 'data_unit', 'compute', 'unpack',
+                     'write', 'end_write', 'other' ]
+
+# PHOT columns that are filled; other columns of VARNAMES_OBS_LIST are
+# left undefined (None) as for readers without these columns.
+BENCH_PHOT_VARLIST = [ 'MJD', 'BAND', 'FIELD', 'PHOTFLAG', 'FLUXCAL',
+                       'FLUXCALERR', 'PSF_SIG1', 'ZEROPT', 'SKY_SIG' ]
+
+# =======================================================
+def init_stage_dict():
+    stage_dict = {}
+    for stage in BENCH_STAGE_LIST:
+        stage_dict[stage] = { 'ncall': 0, 'time': 0.0, 'nblock': 0,
+                              'mem_net': 0, 'mem_peak': 0 }
+    return stage_dict
+
+def make_subgroup_columns(rng, snid_start, nevt, nobs):
+
+    # return dictionary of synthetic HEAD & PHOT columns for nevt events
+    # with nobs observations each. PHOT rows for event evt are
+    # evt*nobs to (evt+1)*nobs.
+
+    photflag_detect = 4096
+
+    snid     = np.char.mod('%d', snid_start + np.arange(nevt))
+    ra       = rng.uniform(0.0, 360.0, size=nevt)
+    dec      = rng.uniform(-60.0, 5.0, size=nevt)
+    zhel     = rng.uniform(0.05, 1.0, size=nevt)
+    mwebv    = rng.uniform(0.01, 0.10, size=nevt)
+    specz    = np.where(rng.uniform(size=nevt) < 0.5, zhel, -9.0)
+    mjd0     = BENCH_MJD_START + rng.uniform(0.0, BENCH_MJD_RANGE, size=nevt)
+    peakmjd  = mjd0 + 40.0
+    amp      = rng.uniform(500.0, 5000.0, size=nevt)
+
+    ptr_obs  = nobs * np.arange(nevt+1, dtype=np.int64)
+    ievt     = np.repeat(np.arange(nevt), nobs)
+    dt_obs   = np.sort(rng.uniform(0.0, BENCH_NDAY_LCURVE,
+                                   size=(nevt,nobs)), axis=1).ravel()
+    mjd      = mjd0[ievt] + dt_obs
+    band     = np.array(BENCH_BAND_LIST)[np.arange(nevt*nobs) % len(BENCH_BAND_LIST)]
+    fluxerr  = rng.uniform(15.0, 40.0, size=nevt*nobs)
+    flux     = amp[ievt] * np.exp(-0.5*((mjd-peakmjd[ievt])/20.0)**2) + \
+               fluxerr * rng.normal(size=nevt*nobs)
+    photflag = np.where(flux/fluxerr > BENCH_SNR_DETECT, photflag_detect, 0)
+
+    # MJD of 1st, 2nd and last detection
+    is_detect    = (photflag > 0).reshape(nevt, nobs)
+    ndetect      = np.sum(is_detect, axis=1)
+    mjd_detect   = np.where(is_detect, mjd.reshape(nevt, nobs), np.inf)
+    mjd_detect   = np.sort(mjd_detect, axis=1)  # non-detections at end
+    mjd_first    = np.full(nevt, -9.0)
+    mjd_second   = np.full(nevt, -9.0)
+    mjd_last     = np.full(nevt, -9.0)
+    if nobs > 0:
+        i_last     = np.maximum(ndetect-1, 0)
+        mjd_first  = np.where(ndetect > 0, mjd_detect[:,0], -9.0)
+        mjd_last   = np.where(ndetect > 0,
+                              mjd_detect[np.arange(nevt),i_last], -9.0)
+    if nobs > 1:
+        mjd_second = np.where(ndetect > 1, mjd_detect[:,1], -9.0)
+
+    columns = {
+        'nevt'  : nevt,  'ptr_obs' : ptr_obs,
+        'head_raw' : {
+            gpar.DATAKEY_SNID      : snid,
+            gpar.DATAKEY_RA        : ra,
+            gpar.DATAKEY_DEC       : dec,
+            gpar.DATAKEY_zHEL      : zhel,
+            gpar.DATAKEY_zHEL_ERR  : np.full(nevt, 0.001),
+            gpar.DATAKEY_FIELD     : np.full(nevt, BENCH_FIELD),
+            gpar.HOSTKEY_SPECZ     : specz,
+            gpar.HOSTKEY_SPECZ_ERR : np.where(specz > 0.0, 0.001, -9.0),
+        },
+        'head_calc' : {
+            gpar.DATAKEY_PEAKMJD           : peakmjd,
+            gpar.DATAKEY_MWEBV             : mwebv,
+            gpar.DATAKEY_MWEBV_ERR         : 0.1 * mwebv,
+            gpar.DATAKEY_MJD_DETECT_FIRST  : mjd_first,
+            gpar.DATAKEY_MJD_DETECT_SECOND : mjd_second,
+            gpar.DATAKEY_MJD_DETECT_LAST   : mjd_last,
+            gpar.DATAKEY_NDETECT           : ndetect,
+        },
+        'phot_raw' : {
+            'MJD'        : mjd,
+            'BAND'       : band,
+            'FIELD'      : np.full(nevt*nobs, BENCH_FIELD),
+            'PHOTFLAG'   : photflag,
+            'FLUXCAL'    : flux,
+            'FLUXCALERR' : fluxerr,
+            'PSF_SIG1'   : rng.uniform(1.5, 3.0, size=nevt*nobs),
+            'ZEROPT'     : rng.uniform(30.5, 31.5, size=nevt*nobs),
+            'SKY_SIG'    : rng.uniform(50.0, 150.0, size=nevt*nobs)
+        }
+    }
+    return columns
+    # end make_subgroup_columns
+
+# =======================================================
+class data_bench(Program):
+
+    # Fake reader: each subgroup of events is generated in memory;
+    # read_event and read_event_batch return the same values.
+    # Program methods for each stage are wrapped with time_stage.
+
+    def __init__(self, config_inputs) :
+        config_data = {}
+        self.stage_dict = init_stage_dict()
+        self.NOBS_WRITE = 0
+        super().__init__(config_inputs, config_data)
+
+    @contextlib.contextmanager
+    def time_stage(self, stage):
+        stats   = self.stage_dict[stage]
+        trace   = tracemalloc.is_tracing()
+        if trace:
+            nblock0 = sys.getallocatedblocks()
+            mem0    = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        t0      = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats['time']   += time.perf_counter() - t0
+            stats['ncall']  += 1
+            if trace:
+                stats['nblock']  += sys.getallocatedblocks() - nblock0
+                mem, peak = tracemalloc.get_traced_memory()
+                stats['mem_net']  += mem - mem0
+                stats['mem_peak']  = max(stats['mem_peak'], peak - mem0)
+        # end time_stage
+
+    def init_read_data(self):
+        args = self.config_inputs['args']
+        self.rng        = np.random.default_rng(args.bench_seed)
+        self.columns    = None
+        self.t_init_end = None
+        self.t_end_read = None
+        return
+
+    def prep_read_data_subgroup(self, i_subgroup):
+        if self.t_init_end is None :
+            self.t_init_end = time.perf_counter()  # end of init stage
+
+        args      = self.config_inputs['args']
+        nevt_sub  = args.bench_nevt_subgroup
+        nevt_done = i_subgroup * nevt_sub
+        nevt      = min(nevt_sub, args.nevt - nevt_done)
+        if nevt <= 0 : return -1
+
+        with self.time_stage('read'):
+            self.columns = make_subgroup_columns(self.rng,
+                                                 BENCH_SNID_START + nevt_done,
+                                                 nevt, args.bench_nobs)
+        return nevt
+        # end prep_read_data_subgroup
+
+    def end_read_data_subgroup(self):
+        self.columns = None
+
+    def end_read_data(self):
+        # start of end_write stage in run_bench
+        self.t_end_read = time.perf_counter()
+
+    def read_event(self, evt):
+        with self.time_stage('read'):
+            columns  = self.columns
+            ROWMIN   = columns['ptr_obs'][evt]
+            ROWMAX   = columns['ptr_obs'][evt+1]
+
+            head_raw, head_calc, head_sim = util.reset_data_event_dict()
+            for key, col in columns['head_raw'].items():
+                head_raw[key]  = col[evt]
+            for key, col in columns['head_calc'].items():
+                head_calc[key] = col[evt]
+
+            phot_raw = self.init_phot_dict(ROWMAX - ROWMIN)
+            for varname in BENCH_PHOT_VARLIST:
+                phot_raw[varname] = columns['phot_raw'][varname][ROWMIN:ROWMAX]
+
+        data_dict = {
+            'head_raw'  : head_raw,
+            'head_calc' : head_calc,
+            'phot_raw'  : phot_raw
+        }
+        # same as READ_SNANA_FOLDER.get_data_dict & get_batch_event
+        if len(head_sim) > 0:
+            data_dict['head_sim'] = head_sim
+
+        return data_dict
+        # end read_event
+
+    def read_event_batch(self, i_subgroup):
+        with self.time_stage('read'):
+            columns  = self.columns
+            phot_raw = {}
+            for varname in gpar.VARNAMES_OBS_LIST:
+                phot_raw[varname] = columns['phot_raw'].get(varname)
+
+            batch_dict = {
+                'nevt'         : columns['nevt'],
+                'head_raw'     : dict(columns['head_raw']),
+                'head_calc'    : dict(columns['head_calc']),
+                'head_private' : {},
+                'head_sim'     : {},
+                'phot_raw'     : phot_raw,
+                'ptr_obs'      : columns['ptr_obs']
+            }
+        return batch_dict
+        # end read_event_batch
+
+    def select_subsample(self, data_event_dict):
+        with self.time_stage('select'):
+            return super().select_subsample(data_event_dict)
+
+    def select_subsample_batch(self, batch_dict):
+        with self.time_stage('select'):
+            return super().select_subsample_batch(batch_dict)
+
+    def which_data_unit(self, data_dict):
+        with self.time_stage('data_unit'):
+            return super().which_data_unit(data_dict)
+
+    def which_data_unit_batch(self, batch_dict):
+        with self.time_stage('data_unit'):
+            return super().which_data_unit_batch(batch_dict)
+
+    def compute_data_event(self, data_event_dict):
+        with self.time_stage('compute'):
+            return super().compute_data_event(data_event_dict)
+
+    def compute_data_batch(self, batch_dict):
+        with self.time_stage('compute'):
+            return super().compute_data_batch(batch_dict)
+
+    def get_batch_event(self, batch_dict, evt):
+        with self.time_stage('unpack'):
+            return super().get_batch_event(batch_dict, evt)
+
+    def write_data_event(self, data_event_dict, writer):
+        with self.time_stage('write'):
+            super().write_data_event(data_event_dict, writer)
+        self.NOBS_WRITE += int(data_event_dict['phot_raw']['NOBS'])
+
+    def iyear_data(self, MJD, RA, DEC, FIELD):
+        # not used; see util.iyear_survey
+        return -1
+
+    # end data_bench
+
+# =======================================================
+def get_program_args(args_bench, writer, outdir):
+
+    # return command-line args for makeDataFiles Program by parsing
+    # a synthetic command line with makeDataFiles_main.get_args, so that
+    # all other args have the same defaults as makeDataFiles.sh.
+    # Only the bench-reader args are added here.
+
+    argv = [ 'makeDataFiles.sh', '--nevt', str(args_bench.nevt), '--text' ]
+    if args_bench.batch_read : argv.append('--batch_read')
+    if args_bench.profile    : argv.append('--profile')
+
+    if writer in [ gpar.FORMAT_TEXT, gpar.FORMAT_FITS ] :
+        argv += [ '--outdir_snana', outdir ]
+        if writer == gpar.FORMAT_FITS : argv.append('--write_fits_direct')
+    else:
+        argv += [ '--outdir_csv', outdir ]
+        if writer == gpar.FORMAT_PARQUET : argv.append('--parquet')
+
+    argv_orig = sys.argv
+    try:
+        sys.argv = argv
+        args     = makeDataFiles_main.get_args()
+    finally:
+        sys.argv = argv_orig
+
+    args.survey              = BENCH_SURVEY
+    args.read_class          = "BENCH"
+    args.bench_nobs          = args_bench.nobs
+    args.bench_seed          = args_bench.seed
+    args.bench_nevt_subgroup = args_bench.nevt_subgroup
+    return args
+    # end get_program_args
+
+def run_bench(args_bench, writer, outdir):
+
+    # process synthetic events with this writer;
+    # return dictionary of throughput and per-stage stats.
+
+    args = get_program_args(args_bench, writer, outdir)
+
+    # Program init appends HOSTGAL keys to this global list;
+    # restore it after each writer.
+    datakey_list_raw = list(gpar.DATAKEY_LIST_RAW)
+
+    t0      = time.perf_counter()
+    program = data_bench({'args': args})
+    program.read_data_driver()
+    t1      = time.perf_counter()
+
+    gpar.DATAKEY_LIST_RAW[:] = datakey_list_raw
+
+    stage_dict = program.stage_dict
+    stage_dict['init']['time']       = program.t_init_end - t0
+    stage_dict['init']['ncall']      = 1
+    stage_dict['end_write']['time']  = t1 - program.t_end_read
+    stage_dict['end_write']['ncall'] = 1
+    t_stage_sum = sum([ stage_dict[stage]['time'] for stage in BENCH_STAGE_LIST
+                        if stage != 'other' ])
+    stage_dict['other']['time']  = (t1 - t0) - t_stage_sum
+    stage_dict['other']['ncall'] = 1
+
+    t_total = t1 - t0
+    result = {
+        'WRITER'       : writer,
+        'BATCH_READ'   : args.batch_read,
+        'NEVT_READ'    : args.nevt,
+        'NEVT_WRITE'   : program.NEVT_WRITE,
+        'NOBS_WRITE'   : int(program.NOBS_WRITE),
+        'TIME_TOTAL'   : round(t_total, 4),
+        'EVT_PER_SEC'  : round(program.NEVT_WRITE / t_total, 1),
+        'OBS_PER_SEC'  : round(program.NOBS_WRITE / t_total, 1),
+        'STAGES'       : {}
+    }
+    for stage in BENCH_STAGE_LIST:
+        stats = stage_dict[stage]
+        if stats['ncall'] == 0 : continue
+        result['STAGES'][stage] = {
+            'NCALL'      : stats['ncall'],
+            'TIME'       : round(stats['time'], 4),
+            'NBLOCK'     : int(stats['nblock']),
+            'MB_NET'     : round(stats['mem_net']/1.0E6, 3),
+            'MB_PEAK'    : round(stats['mem_peak']/1.0E6, 3)
+        }
+    return result
+    # end run_bench
+
+def print_result(result, trace):
+
+    t_total = result['TIME_TOTAL']
+    logging.info(f"\n# ==================================================== ")
+    logging.info(f" BENCH {result['WRITER']:8s} (batch_read={result['BATCH_READ']}): " \
+                 f"{result['NEVT_WRITE']} events, {result['NOBS_WRITE']} obs " \
+                 f"written in {t_total:.2f} sec")
+    logging.info(f"   {result['EVT_PER_SEC']:12.1f} events/sec")
+    logging.info(f"   {result['OBS_PER_SEC']:12.1f} obs/sec\n")
+
+    line = f"   {'STAGE':10s} {'NCALL':>9s} {'TIME(s)':>9s} {'FRAC':>6s} " \
+           f"{'usec/call':>10s}"
+    if trace: line += f" {'NBLOCK':>10s} {'MB_NET':>9s} {'MB_PEAK':>9s}"
+    logging.info(line)
+
+    for stage, stats in result['STAGES'].items():
+        usec = 1.0E6 * stats['TIME'] / stats['NCALL']
+        line = f"   {stage:10s} {stats['NCALL']:9d} {stats['TIME']:9.3f} " \
+               f"{stats['TIME']/t_total:6.3f} {usec:10.1f}"
+        if trace:
+            line += f" {stats['NBLOCK']:10d} {stats['MB_NET']:9.3f} " \
+                    f"{stats['MB_PEAK']:9.3f}"
+        logging.info(line)
+    sys.stdout.flush()
+    return
+    # end print_result
+
+# =======================================================
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    msg = "number of synthetic events (default=10000)"
+    parser.add_argument("--nevt", help=msg, type=int, default=10000)
+
+    msg = "number of observations per event (default=100)"
+    parser.add_argument("--nobs", help=msg, type=int, default=100)
+
+    msg = "number of events per subgroup (default=2000)"
+    parser.add_argument("--nevt_subgroup", help=msg, type=int, default=2000)
+
+    msg = f"output writers (default={' '.join(BENCH_WRITER_LIST)})"
+    parser.add_argument("--writers", help=msg, nargs='+', type=str,
+                        default=BENCH_WRITER_LIST)
+
+    msg = "read each subgroup as columns (--batch_read)"
+    parser.add_argument("--batch_read", help=msg, action="store_true")
+
+    msg = "report allocated blocks & MB per stage with tracemalloc (slow)"
+    parser.add_argument("--tracemalloc", help=msg, action="store_true")
+
+    msg = "dump cProfile & tracemalloc stats in screen_update (--profile)"
+    parser.add_argument("--profile", help=msg, action="store_true")
+
+    msg = "random seed for synthetic events (default=1)"
+    parser.add_argument("--seed", help=msg, type=int, default=1)
+
+    msg = "keep output data files in this dir (default: remove temp dir)"
+    parser.add_argument("--outdir", help=msg, type=str, default=None)
+
+    msg = "write results to this yaml file"
+    parser.add_argument("--output_yaml_file", help=msg, type=str, default=None)
+
+    args = parser.parse_args()
+    args.writers = [ w.upper() for w in args.writers ]
+    for writer in args.writers:
+        if writer not in BENCH_WRITER_LIST:
+            sys.exit(f"\n ERROR: invalid writer {writer}; " \
+                     f"valid writers are {BENCH_WRITER_LIST}\n")
+    return args
+
+if __name__ == "__main__":
+    args = get_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.tracemalloc:
+        tracemalloc.start(gpar.NFRAME_TRACEMALLOC)
+
+    if args.outdir:
+        top_dir = os.path.expandvars(args.outdir)
+        os.makedirs(top_dir, exist_ok=True)
+    else:
+        top_dir = tempfile.mkdtemp(prefix="bench_makeDataFiles_")
+
+    result_list = []
+    try:
+        for writer in args.writers:
+            if writer == gpar.FORMAT_PARQUET and not PYARROW_EXISTS:
+                logging.info(f"\n Skip {writer} writer because pyarrow " \
+                             f"is not installed.")
+                continue
+            outdir = f"{top_dir}/{writer}"
+            if os.path.exists(outdir): shutil.rmtree(outdir)
+            result = run_bench(args, writer, outdir)
+            result_list.append(result)
+            print_result(result, args.tracemalloc)
+    finally:
+        if args.outdir is None:
+            shutil.rmtree(top_dir, ignore_errors=True)
+
+    if args.output_yaml_file:
+        bench_dict = {
+            'NEVT'        : args.nevt,
+            'NOBS'        : args.nobs,
+            'SEED'        : args.seed,
+            'BATCH_READ'  : args.batch_read,
+            'RESULTS'     : result_list
+        }
+        with open(args.output_yaml_file, "wt") as f:
+            yaml.dump(bench_dict, f, sort_keys=False)
+        logging.info(f"\n Wrote bench results to {args.output_yaml_file}")
+
+# end:
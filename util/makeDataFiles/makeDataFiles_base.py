@@ -9,6 +9,26 @@
 #   Continue on nevt=0 and stop on nevt < 0 ; allows small samples
 #   in which some of the FITS files have zero events.
 #
+# Oct 2026: add pipelined read_data_driver (--nthread_pipeline) where
+#   a reader thread prefetches events/subgroups into a bounded queue,
+#   a thread pool runs compute_data_event, and events are written
+#   in read order so that output and README stats match serial mode.
+#
+# Oct 2026: add optional columnar batch read (--batch_read) where
+#   read_event_batch returns header columns and CSR-style PHOT arrays
+#   for an entire subgroup; selection, data unit and computed
+#   quantities are evaluated per column (see prep_event_batch).
+#
+# Oct 2026: undefined MWEBV (<0) is computed from SFD98 dust maps in
+#   --mwdust_dir; zCMB & MWEBV are computed per column for --batch_read.
+#
+# Oct 2026: --write_fits_direct appends events to per-data-unit FITS
+#   tables (fitsWriter) instead of one TEXT file per event.
+#
+# Oct 2026: opt-in --profile hook in screen_update: cProfile and
+#   tracemalloc are started at the first screen update, and top
+#   functions & allocations are dumped every NEVT_PROFILE_UPDATE events.
+#
 """Base meta-class Program, built to include the basic infrastructre for more
 general data file parsers.
 """
@@ -17,8 +37,17 @@ import os
 import sys
 import logging
 import datetime
+import threading
+import queue
+import collections
+import cProfile
+import io
+import pstats
+import tracemalloc
+
+from concurrent.futures import ThreadPoolExecutor
 
-# import numpy as np
+import numpy as np
 # import yaml
 
 from abc import abstractmethod
@@ -28,7 +57,8 @@ import makeDataFiles_params as gpar
 import makeDataFiles_util as util
 import write_data_snana 
 
-from write_data_csv import csvWriter
+from write_data_csv  import csvWriter
+from write_data_fits import fitsWriter
 
 
 # =============================================================================
@@ -75,6 +105,8 @@ class Program:
         self.NEVT_WRITE            = 0
         self.NEVT_REJECT_CUTS      = 0
         self.NEVT_REJECT_DATA_UNIT = 0
+
+        self.profiler = None   # cProfile object for --profile
         
         # end Program __init__
 
@@ -379,9 +411,9 @@ class Program:
         else:
             zcmb = gpar.VAL_NULL
 
-        # no urgency for loading MWEBV because TEXT->FITS translator
-        # computes and stores MWEBV. However, if we want correct MWEBV
-        # in the TEXT files, need to compute it here:
+        # TEXT->FITS translator computes and stores MWEBV, but for
+        # correct MWEBV in the TEXT files, compute undefined MWEBV here
+        # from SFD98 maps (if they exist).
 
         if gpar.DATAKEY_MWEBV in d_calc:
             mwebv     = d_calc[gpar.DATAKEY_MWEBV]
@@ -390,6 +422,13 @@ class Program:
             mwebv     = -9.0
             mwebv_err = -9.0
 
+        if mwebv < 0.0 :
+            mwdust_dir = self.config_inputs['args'].mwdust_dir
+            mwebv_sfd, mwebv_err_sfd = util.get_mwebv_sfd(ra, dec, mwdust_dir)
+            if mwebv_sfd is not None:
+                mwebv     = float(mwebv_sfd[0])
+                mwebv_err = float(mwebv_err_sfd[0])
+
         # - - - -
         dump_flag = False
         if dump_flag:
@@ -482,6 +521,204 @@ class Program:
 
         # end select_subsample
 
+    def select_subsample_batch(self, batch_dict):
+
+        # Column version of select_subsample for readers whose
+        # read_event_batch does not evaluate batch_dict['select'].
+
+        args          = self.config_inputs['args']
+        nevt          = batch_dict['nevt']
+        d_raw         = batch_dict['head_raw']
+        d_calc        = batch_dict['head_calc']
+
+        SNID_raw = np.asarray(d_raw[gpar.DATAKEY_SNID])
+        SNID     = SNID_raw
+        if SNID_raw.dtype.kind in 'SU' and np.all(np.char.isdigit(SNID_raw)):
+            SNID = SNID_raw.astype(np.int64)
+
+        KEY0 = gpar.DATAKEY_MJD_DETECT_FIRST
+        mjd_detect_first = d_calc.setdefault(KEY0, np.full(nevt, -9.0))
+
+        var_dict = {
+            gpar.DATAKEY_SNID             : SNID,
+            gpar.DATAKEY_RA               : d_raw[gpar.DATAKEY_RA],
+            gpar.DATAKEY_DEC              : d_raw[gpar.DATAKEY_DEC],
+            gpar.DATAKEY_PEAKMJD          : d_calc[gpar.DATAKEY_PEAKMJD],
+            gpar.DATAKEY_MJD_DETECT_FIRST : mjd_detect_first
+        }
+        sel = util.select_subsample_batch(args, var_dict)
+
+        return sel
+
+        # end select_subsample_batch
+
+    def which_data_unit_batch(self, batch_dict):
+
+        # Column version of which_data_unit.
+        # Returns integer array of index_unit per event; -1 for events
+        # that do not belong to any data unit.
+
+        n_season      = self.config_data['n_season']
+        args          = self.config_inputs['args']
+        nsplit        = args.nsplitran
+        isplit_select = args.isplitran
+        iyear_select  = args.year
+        field_select  = args.field
+        survey        = args.survey
+
+        data_unit_name_list = self.config_data['data_unit_name_list']
+
+        nevt     = batch_dict['nevt']
+        d_raw    = batch_dict['head_raw']
+        d_calc   = batch_dict['head_calc']
+
+        SNID       = d_raw[gpar.DATAKEY_SNID]
+        RA         = d_raw[gpar.DATAKEY_RA]
+        DEC        = d_raw[gpar.DATAKEY_DEC]
+        FIELD      = d_raw[gpar.DATAKEY_FIELD]
+        PEAKMJD    = d_calc[gpar.DATAKEY_PEAKMJD]
+        MJD_DETECT_FIRST  = \
+            d_calc.setdefault(gpar.DATAKEY_MJD_DETECT_FIRST, np.full(nevt,-9.0))
+        MJD_DETECT_SECOND = \
+            d_calc.setdefault(gpar.DATAKEY_MJD_DETECT_SECOND,np.full(nevt,-9.0))
+
+        index_unit = np.full(nevt, -1, dtype=np.int64)
+
+        # field match
+        if field_select == gpar.FIELD_VOID:
+            match = np.ones(nevt, dtype=bool)
+        else:
+            match = np.array([ f == field_select for f in FIELD ], dtype=bool)
+
+        # season/year; iyear_survey is evaluated per event
+        YY = np.full(nevt, -1, dtype=np.int64)
+        if n_season > 1:
+            for evt in np.flatnonzero(match):
+                small_event_dict = {
+                    'peakmjd'   :  PEAKMJD[evt],
+                    'mjd_detect':  [ MJD_DETECT_FIRST[evt],
+                                     MJD_DETECT_SECOND[evt] ],
+                    'ra':          RA[evt],
+                    'dec':         DEC[evt],
+                    'field':       FIELD[evt]
+                }
+                YY[evt] = util.iyear_survey(survey, small_event_dict)
+
+        if iyear_select > 0:
+            match &= (YY == iyear_select)
+
+        # split job
+        ISPLIT = np.full(nevt, -9, dtype=np.int64)
+        if nsplit > 1:
+            iSNID  = np.asarray(SNID).astype(np.int64)
+            ISPLIT = (iSNID % nsplit) + 1
+            if isplit_select > 0:
+                match &= (ISPLIT == isplit_select)
+
+        # - - - - - - - -
+        # evaluate unit name once per unique (YY,ISPLIT)
+        index_map = {}
+        for evt in np.flatnonzero(match):
+            yy_split = (YY[evt], ISPLIT[evt])
+            if yy_split not in index_map:
+                data_unit_name  = \
+                    self.assign_data_unit_name(survey, field_select,
+                                               yy_split[0], yy_split[1])
+                if data_unit_name not in data_unit_name_list:
+                    msgerr = []
+                    msgerr.append(f"Invalid data_unit_name = {data_unit_name}")
+                    msgerr.append(f"for SNID = {SNID[evt]} .")
+                    msgerr.append(f"RA={RA[evt]}  DEC={DEC[evt]}  " \
+                                  f"PEAKMJD={PEAKMJD[evt]}")
+                    msgerr.append(f"Valid data_unit_name_list = ")
+                    msgerr.append(f"    {data_unit_name_list}")
+                    util.log_assert(False, msgerr)
+                index_map[yy_split] = data_unit_name_list.index(data_unit_name)
+            index_unit[evt] = index_map[yy_split]
+
+        return index_unit
+        # end which_data_unit_batch
+
+    def compute_data_batch(self, batch_dict):
+
+        # Column version of compute_data_event; computed values are
+        # stored in batch_dict['head_raw'] and batch_dict['head_calc'],
+        # either as a column or as one value for all events.
+        # Only events that are selected and have a data unit are
+        # evaluated; others keep VAL_NULL.
+
+        msgerr   = []
+        survey   = self.config_inputs['args'].survey
+        nevt     = batch_dict['nevt']
+        d_raw    = batch_dict['head_raw']
+        d_calc   = batch_dict['head_calc']
+
+        zhel     = d_raw[gpar.DATAKEY_zHEL]
+        zhel_err = d_raw[gpar.DATAKEY_zHEL_ERR]
+        ra       = d_raw[gpar.DATAKEY_RA]
+        dec      = d_raw[gpar.DATAKEY_DEC]
+
+        snana_flag_fake = gpar.SNANA_FLAG_DATA
+        if gpar.VARNAME_TRUEMAG in batch_dict['phot_raw']:
+            snana_flag_fake = gpar.SNANA_FLAG_FAKE
+
+        is_write = batch_dict['select'] & (batch_dict['index_unit'] >= 0)
+
+        zcmb = np.full(nevt, gpar.VAL_NULL, dtype=object)
+        is_z = is_write & (zhel > 0.0)
+        zcmb[is_z] = util.helio_to_cmb(zhel[is_z], ra[is_z], dec[is_z])
+
+        if gpar.DATAKEY_MWEBV in d_calc:
+            mwebv     = d_calc[gpar.DATAKEY_MWEBV]
+            mwebv_err = d_calc[gpar.DATAKEY_MWEBV_ERR]
+        else:
+            mwebv     = np.full(nevt, -9.0)
+            mwebv_err = np.full(nevt, -9.0)
+
+        if not isinstance(mwebv, np.ndarray):
+            mwebv     = np.full(nevt, mwebv)
+            mwebv_err = np.full(nevt, mwebv_err)
+
+        # compute undefined MWEBV from SFD98 maps (if they exist)
+        is_mw = is_write & (mwebv < 0.0)
+        if np.any(is_mw):
+            mwdust_dir = self.config_inputs['args'].mwdust_dir
+            mwebv_sfd, mwebv_err_sfd = \
+                util.get_mwebv_sfd(ra[is_mw], dec[is_mw], mwdust_dir)
+            if mwebv_sfd is not None:
+                mwebv     = util.set_column_values(mwebv,     is_mw, mwebv_sfd)
+                mwebv_err = util.set_column_values(mwebv_err, is_mw,
+                                                   mwebv_err_sfd)
+
+        # - - - - - - -
+        d_raw[gpar.DATAKEY_SURVEY] = survey
+        d_raw[gpar.DATAKEY_FAKE]   = snana_flag_fake
+
+        if survey not in gpar.SURVEY_INFO['FILTERS']:
+            msgerr.append(f"{survey} filters not defined")
+            msgerr.append(f"Check SURVEY_INFO dictionary in " \
+                          f"makeDataFiles_params.py")
+            util.log_assert(False, msgerr)
+        else:
+            d_raw[gpar.DATAKEY_FILTERS] = gpar.SURVEY_INFO['FILTERS'][survey]
+
+        if survey in gpar.SURVEY_INFO['CCD']:
+            d_raw[gpar.DATAKEY_NXPIX]   = gpar.SURVEY_INFO['CCD'][survey][0]
+            d_raw[gpar.DATAKEY_NYPIX]   = gpar.SURVEY_INFO['CCD'][survey][1]
+            d_raw[gpar.DATAKEY_PIXSIZE] = gpar.SURVEY_INFO['CCD'][survey][2]
+
+        d_calc[gpar.DATAKEY_zCMB]      = zcmb
+        d_calc[gpar.DATAKEY_zCMB_ERR]  = zhel_err
+        d_calc[gpar.DATAKEY_MWEBV]     = mwebv
+        d_calc[gpar.DATAKEY_MWEBV_ERR] = mwebv_err
+
+        if gpar.DATAKEY_VPEC not in d_calc :
+            d_calc[gpar.DATAKEY_VPEC]     = gpar.VPEC_DEFAULT[0]
+            d_calc[gpar.DATAKEY_VPEC_ERR] = gpar.VPEC_DEFAULT[1]
+
+        return
+        # end compute_data_batch
+
     def init_phot_dict(self, NOBS):
 
         # The read_event function for each source should call this
@@ -553,6 +790,7 @@ class Program:
             #time_0  = datetime.datetime.now()
             #self.config_data['time_0'] =  time_0
             self.config_data['time_0'] = datetime.datetime.now()
+            self.init_profile()
             return
         rmd = evt % gpar.NEVT_SCREEN_UPDATE
         if rmd == 0 or evt == NEVT_TOT-1:
@@ -565,7 +803,60 @@ class Program:
                          f" ({rate}/sec) --> wrote {self.NEVT_WRITE}")
             sys.stdout.flush()
 
+            if evt % gpar.NEVT_PROFILE_UPDATE == 0 or evt == NEVT_TOT-1:
+                self.dump_profile()
+
+        return
+
+    def init_profile(self):
+
+        # Created Oct 2026
+        # For --profile, start cProfile and tracemalloc once (first
+        # screen update). cProfile only profiles the calling thread,
+        # i.e., the write thread for --nthread_pipeline.
+
+        args = self.config_inputs['args']
+        if not args.profile          : return
+        if self.profiler is not None : return
+
+        logging.info(f" Start cProfile and tracemalloc for --profile")
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(gpar.NFRAME_TRACEMALLOC)
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return
+        # end init_profile
+
+    def dump_profile(self):
+
+        # Created Oct 2026
+        # For --profile, dump top NROW_PROFILE_DUMP functions (cumulative
+        # time since init_profile) and top lines with allocated memory
+        # that is still in use.
+
+        if self.profiler is None : return
+
+        nrow = gpar.NROW_PROFILE_DUMP
+        self.profiler.disable()
+
+        stream = io.StringIO()
+        stats  = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(nrow)
+        logging.info(f"\n PROFILE after {self.NEVT_WRITE} events written:")
+        logging.info(stream.getvalue())
+
+        mem_current, mem_peak = tracemalloc.get_traced_memory()
+        logging.info(f" TRACEMALLOC: current = {mem_current/1.0E6:.2f} MB, " \
+                     f"peak = {mem_peak/1.0E6:.2f} MB; top {nrow} lines:")
+        snapshot  = tracemalloc.take_snapshot()
+        for stat in snapshot.statistics('lineno')[0:nrow]:
+            logging.info(f"\t {stat}")
+        logging.info("")
+        sys.stdout.flush()
+
+        self.profiler.enable()
         return
+        # end dump_profile
 
     def read_data_driver(self):
 
@@ -581,10 +872,21 @@ class Program:
 
         data_unit_name_list   = self.config_data['data_unit_name_list']
 
-        if args.outdir_csv is not None: 
-            csv_writer = csvWriter( args, self.config_data )
+        # optional writer object; TEXT output (default) needs no writer
+        writer = None
+        if args.write_fits_direct:
+            writer = fitsWriter( args, self.config_data )
+        elif args.outdir_csv is not None: 
+            writer = csvWriter( args, self.config_data )
+
+        batch_read = args.batch_read
 
         # - - - - - - - - - - - - - - - 
+        if args.nthread_pipeline > 0:
+            # overlap reading with compute & write
+            self.read_data_pipeline(writer)
+            nevent_subgroup = -1  # skip serial loop below
+
         while nevent_subgroup >= 0:
 
             nevent_subgroup = self.prep_read_data_subgroup(i_subgroup)
@@ -593,56 +895,30 @@ class Program:
 
             self.screen_update(-1,0)  # init clock for rate monitor
 
+            if batch_read:
+                batch_dict = self.read_prep_event_batch(i_subgroup,
+                                                        nevent_subgroup)
+
             for evt in range(0, nevent_subgroup):
 
                 NEVT_READ += 1
 
-                # call source-dependent function to read event
-                data_event_dict = self.read_event(evt)
-
-                # check optional subsample selection defined by reader;
-                # if selection is not evaluated by reader, evaluate here.
-                if 'select' in data_event_dict:
-                    sel = data_event_dict['select']
+                # read event and figure out selection and data unit
+                if batch_read:
+                    data_event_dict, sel = \
+                        self.get_batch_event(batch_dict, evt)
                 else:
-                    # read_event did not select subsample, so do it here.
-                    sel = self.select_subsample(data_event_dict)
-
-                # figure out which data unit
-                data_unit_name = self.which_data_unit(data_event_dict)
-                if data_unit_name is None:
-                    self.NEVT_REJECT_DATA_UNIT += 1
-                    continue
+                    data_event_dict, sel = self.read_select_event(evt)
 
-                # add index_unit to data_event_dict BEFORE rejecting event ..
-                # to enable rejected event count-vs-data_unit
-                index_unit  = data_unit_name_list.index(data_unit_name)
-                data_event_dict['data_unit_name'] = data_unit_name
-                data_event_dict['index_unit']     = index_unit
-                
-                if sel is False:
-                    self.NEVT_REJECT_CUTS += 1
-                    self.update_readme_stats(gpar.STRING_REJECT, data_event_dict)     
+                if not self.accept_data_event(data_event_dict, sel):
                     continue
 
                 # add computed variables; e.g., zCMB, MWEBV ...
-                self.compute_data_event(data_event_dict)
-
-
-                if args.outdir_snana :
-                    write_data_snana.write_event_text_snana(args, self.config_data,
-                                                            data_event_dict)
-
-                elif args.outdir_csv :
-                    csv_writer.write_event_csv(data_event_dict)
-
-                self.NEVT_WRITE += 1
-                
-                # increment number of events for this data unit
+                # (already done for batch_read)
+                if not batch_read:
+                    self.compute_data_event(data_event_dict)
 
-                self.config_data['data_unit_nevent_list'][index_unit] += 1
-
-                self.update_readme_stats(gpar.STRING_SELECT, data_event_dict)
+                self.write_data_event(data_event_dict, writer)
 
                 self.screen_update(evt,nevent_subgroup)
 
@@ -669,17 +945,324 @@ class Program:
             
             if nevent == 0 : continue
                 
-            if args.outdir_snana:
+            if args.write_fits_direct:
+                writer.end_write(index_unit)
+
+            elif args.outdir_snana:
                 write_data_snana.write_aux_files_snana(name, args, self.config_data)
 
             elif args.outdir_csv :
-                csv_writer.end_write(index_unit)
+                writer.end_write(index_unit)
 
         if args.output_yaml_file:
             self.write_yaml_file()
                 
         # end read_data_driver
 
+    def read_select_event(self, evt):
+
+        # call source-dependent function to read event "evt" in current
+        # subgroup, then evaluate subsample selection and data unit.
+        # Returns data_event_dict and sel; data_event_dict['index_unit']
+        # is None if event does not belong to any data unit.
+
+        data_unit_name_list   = self.config_data['data_unit_name_list']
+
+        data_event_dict = self.read_event(evt)
+
+        # check optional subsample selection defined by reader;
+        # if selection is not evaluated by reader, evaluate here.
+        if 'select' in data_event_dict:
+            sel = data_event_dict['select']
+        else:
+            # read_event did not select subsample, so do it here.
+            sel = self.select_subsample(data_event_dict)
+
+        # figure out which data unit
+        data_unit_name = self.which_data_unit(data_event_dict)
+
+        # add index_unit to data_event_dict BEFORE rejecting event ..
+        # to enable rejected event count-vs-data_unit
+        index_unit = None
+        if data_unit_name is not None:
+            index_unit  = data_unit_name_list.index(data_unit_name)
+        data_event_dict['data_unit_name'] = data_unit_name
+        data_event_dict['index_unit']     = index_unit
+
+        return data_event_dict, sel
+        # end read_select_event
+
+    def read_prep_event_batch(self, i_subgroup, nevent_subgroup):
+
+        # read entire subgroup as columns, then evaluate selection,
+        # data unit and computed quantities per column.
+
+        msgerr = []
+        batch_dict = self.read_event_batch(i_subgroup)
+
+        if batch_dict is None:
+            read_class = self.config_inputs['args'].read_class
+            msgerr.append(f"--batch_read is not supported for {read_class}")
+            msgerr.append(f"Remove --batch_read argument.")
+            util.log_assert(False, msgerr)
+
+        if batch_dict['nevt'] != nevent_subgroup:
+            msgerr.append(f"batch nevt = {batch_dict['nevt']} does not match")
+            msgerr.append(f"nevent_subgroup = {nevent_subgroup} for " \
+                          f"i_subgroup = {i_subgroup}")
+            util.log_assert(False, msgerr)
+
+        if 'select' not in batch_dict:
+            batch_dict['select'] = self.select_subsample_batch(batch_dict)
+
+        batch_dict['index_unit'] = self.which_data_unit_batch(batch_dict)
+
+        self.compute_data_batch(batch_dict)
+
+        return batch_dict
+        # end read_prep_event_batch
+
+    def get_batch_event(self, batch_dict, evt):
+
+        # Return data_event_dict and sel for event "evt" in batch_dict,
+        # same as read_select_event + compute_data_event.
+        # PHOT arrays are views of the flat batch columns.
+
+        data_unit_name_list   = self.config_data['data_unit_name_list']
+
+        def fill_head(head_store, head_batch):
+            for key, val in head_batch.items():
+                if isinstance(val, np.ndarray):
+                    head_store[key] = val[evt]
+                else:
+                    head_store[key] = val
+
+        head_raw, head_calc, head_sim = util.reset_data_event_dict()
+        head_private = {}
+        fill_head(head_raw,     batch_dict['head_raw'])
+        fill_head(head_calc,    batch_dict['head_calc'])
+        fill_head(head_private, batch_dict.setdefault('head_private',{}))
+
+        sel        = bool(batch_dict['select'][evt])
+        index_unit = int(batch_dict['index_unit'][evt])
+
+        data_event_dict = {
+            'head_raw'  : head_raw,
+            'head_calc' : head_calc,
+            'select'    : sel
+        }
+
+        if index_unit < 0:
+            data_event_dict['data_unit_name'] = None
+            data_event_dict['index_unit']     = None
+            return data_event_dict, sel
+
+        data_event_dict['data_unit_name'] = data_unit_name_list[index_unit]
+        data_event_dict['index_unit']     = index_unit
+
+        if not sel:
+            return data_event_dict, sel
+
+        # - - - - -
+        ptr_obs  = batch_dict['ptr_obs']
+        ROWMIN   = ptr_obs[evt]
+        ROWMAX   = ptr_obs[evt+1]
+        NOBS     = ROWMAX - ROWMIN
+
+        phot_raw = {}
+        phot_raw['NOBS'] = NOBS
+        for varname, col in batch_dict['phot_raw'].items():
+            if col is None:
+                phot_raw[varname] = [ None ] * NOBS
+            else:
+                phot_raw[varname] = col[ROWMIN:ROWMAX]
+
+        data_event_dict['head_private'] = head_private
+        data_event_dict['phot_raw']     = phot_raw
+        data_event_dict['spec_raw']     = {}
+        data_event_dict['n_spectra']    = 0
+
+        fill_head(head_sim, batch_dict.setdefault('head_sim',{}))
+        if len(head_sim) > 0:
+            data_event_dict['head_sim'] = head_sim
+
+        return data_event_dict, sel
+        # end get_batch_event
+
+    def accept_data_event(self, data_event_dict, sel):
+
+        # Return True if event is to be written; otherwise increment
+        # reject counters and return False.
+
+        if data_event_dict['index_unit'] is None:
+            self.NEVT_REJECT_DATA_UNIT += 1
+            return False
+
+        if sel is False:
+            self.NEVT_REJECT_CUTS += 1
+            self.update_readme_stats(gpar.STRING_REJECT, data_event_dict)     
+            return False
+
+        return True
+        # end accept_data_event
+
+    def write_data_event(self, data_event_dict, writer):
+
+        # write one selected event and update counters & README stats
+        # writer is None (TEXT), csvWriter or fitsWriter.
+
+        args       = self.config_inputs['args']
+        index_unit = data_event_dict['index_unit']
+
+        if args.write_fits_direct :
+            writer.write_event_fits(data_event_dict)
+
+        elif args.outdir_snana :
+            write_data_snana.write_event_text_snana(args, self.config_data,
+                                                    data_event_dict)
+
+        elif args.outdir_csv :
+            writer.write_event_csv(data_event_dict)
+
+        self.NEVT_WRITE += 1
+                
+        # increment number of events for this data unit
+        self.config_data['data_unit_nevent_list'][index_unit] += 1
+
+        self.update_readme_stats(gpar.STRING_SELECT, data_event_dict)
+
+        return
+        # end write_data_event
+
+    def read_data_pipeline(self, writer):
+
+        # Pipelined version of the serial read loop in read_data_driver:
+        #  * reader thread loops over subgroups and events (read_event,
+        #    selection, data unit) and fills a bounded queue; the next
+        #    subgroup is thus prepared while earlier events are written.
+        #  * thread pool runs compute_data_event.
+        #  * this (main) thread writes events in the same order they
+        #    were read, so that output order in each data unit, the
+        #    --nevt truncation, and README stats are identical to the
+        #    serial loop. Counters are only touched by this thread.
+        #
+        # Reader methods (prep_read_data_subgroup, read_event, ...)
+        # are only called from the reader thread, so source classes
+        # need not be thread safe.
+
+        args       = self.config_inputs['args']
+        n_thread   = args.nthread_pipeline
+        n_queue    = gpar.NEVT_PIPELINE_QUEUE
+        n_pending  = 4 * n_thread   # max events in compute pool
+        batch_read = args.batch_read
+
+        logging.info(f" Pipelined read with {n_thread} compute threads " \
+                     f"and queue size {n_queue}")
+        sys.stdout.flush()
+
+        event_queue  = queue.Queue(maxsize=n_queue)
+        stop_event   = threading.Event()
+        reader_error = []
+
+        def reader_task():
+            NEVT_READ  = 0
+            i_subgroup = 0
+            try:
+                while not stop_event.is_set():
+                    nevent_subgroup = self.prep_read_data_subgroup(i_subgroup)
+                    if nevent_subgroup < 0: break
+
+                    if batch_read:
+                        batch_dict = self.read_prep_event_batch(i_subgroup,
+                                                                nevent_subgroup)
+
+                    for evt in range(0, nevent_subgroup):
+                        NEVT_READ += 1
+                        if batch_read:
+                            data_event_dict, sel = \
+                                self.get_batch_event(batch_dict, evt)
+                        else:
+                            data_event_dict, sel = self.read_select_event(evt)
+                        event_queue.put((i_subgroup, evt, nevent_subgroup,
+                                         data_event_dict, sel))
+                        if stop_event.is_set(): break
+
+                        # same --nevt logic as serial loop: only break
+                        # on an event that gets written.
+                        accept = data_event_dict['index_unit'] is not None \
+                                 and sel is not False
+                        if accept and NEVT_READ >= args.nevt : break
+
+                    self.end_read_data_subgroup()
+                    if NEVT_READ >= args.nevt : break
+                    i_subgroup += 1
+
+            except BaseException as e:
+                reader_error.append(e)
+            finally:
+                event_queue.put(None)  # tell main thread we are done
+            # end reader_task
+
+        reader_thread = threading.Thread(target=reader_task, daemon=True)
+        reader_thread.start()
+
+        pending         = collections.deque()
+        i_subgroup_last = -1
+
+        def write_next():
+            future, evt, nevent_subgroup, data_event_dict = pending.popleft()
+            if future is not None:
+                future.result()  # re-raise any compute error here
+            self.write_data_event(data_event_dict, writer)
+            self.screen_update(evt, nevent_subgroup)
+
+        try:
+            with ThreadPoolExecutor(max_workers=n_thread) as pool:
+                while True:
+                    item = event_queue.get()
+                    if item is None: break
+                    i_subgroup, evt, nevent_subgroup, data_event_dict, sel = item
+
+                    if i_subgroup != i_subgroup_last:
+                        self.screen_update(-1,0)  # init clock for rate monitor
+                        i_subgroup_last = i_subgroup
+
+                    if not self.accept_data_event(data_event_dict, sel):
+                        continue
+
+                    # add computed variables; e.g., zCMB, MWEBV ...
+                    # (already done for batch_read)
+                    future = None
+                    if not batch_read:
+                        future = pool.submit(self.compute_data_event,
+                                             data_event_dict)
+                    pending.append((future, evt, nevent_subgroup,
+                                    data_event_dict))
+
+                    if len(pending) >= n_pending:
+                        write_next()
+
+                while pending:
+                    write_next()
+
+        except BaseException:
+            # unblock reader so that it can exit
+            stop_event.set()
+            while reader_thread.is_alive():
+                try:
+                    event_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            raise
+
+        reader_thread.join()
+
+        if len(reader_error) > 0:
+            raise reader_error[0]
+
+        return
+        # end read_data_pipeline
+
     def write_yaml_file(self):
 
         # write yaml file to be parsed by pipeline.
@@ -800,6 +1383,12 @@ class Program:
     def read_event(self):    # read one event; fill data_dict
         raise NotImplementedError()
 
+    def read_event_batch(self, i_subgroup):
+        # optional: read all events in subgroup as columns; see
+        # READ_SNANA_FOLDER.get_data_batch for batch_dict layout.
+        # Return None if reader does not support batch read.
+        return None
+
     @abstractmethod
     def iyear_data(self, MJD, RA, DEC, FIELD):
         raise NotImplementedError()
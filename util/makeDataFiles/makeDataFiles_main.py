@@ -12,6 +12,7 @@
    + write data files in human-readable TEXT format (1 file per event)
    + convert TEXT -> FITS format
    + tar up TEXT files
+   (or write FITS format directly with --write_fits_direct)
 
  For batch distribution, a separate submit-script should be able to
  distribute jobs that are split by
@@ -29,6 +30,14 @@
 
  Jan 2025: add --lsst-fastdb
 
+ Oct 2026: add --nthread_pipeline to overlap reading with compute/write
+ Oct 2026: add --batch_read for columnar read of each subgroup
+ Oct 2026: add --mwdust_dir; MWEBV from SFD98 maps if not from reader
+ Oct 2026: add --write_fits_direct to write FITS tables without
+           TEXT files and without snana.exe TEXT->FITS conversion
+ Oct 2026: add --parquet to write --outdir_csv as partitioned parquet
+ Oct 2026: add --profile to dump cProfile & tracemalloc stats
+
 """
 
 # ============================================
@@ -134,6 +143,30 @@ def get_args():
     msg = "merge/postprocess output files (after jobs finish)"
     parser.add_argument("--merge", help=msg, action="store_true")
 
+    msg = "number of compute threads for pipelined read/compute/write " \
+          "(default=0 -> serial)"
+    parser.add_argument("--nthread_pipeline", help=msg, type=int, default=0)
+
+    msg = f"dir with SFD98 maps to compute undefined MWEBV " \
+          f"(default={gpar.MWDUST_DIR})"
+    parser.add_argument("--mwdust_dir", help=msg, type=str,
+                        default=gpar.MWDUST_DIR)
+
+    msg = "read each subgroup as columns (if supported by reader)"
+    parser.add_argument("--batch_read", help=msg, action="store_true")
+
+    msg = "write FITS tables directly (no TEXT files or TEXT->FITS " \
+          "conversion); requires --outdir_snana"
+    parser.add_argument("--write_fits_direct", help=msg, action="store_true")
+
+    msg = "write --outdir_csv as partitioned parquet dataset " \
+          "(requires pyarrow)"
+    parser.add_argument("--parquet", help=msg, action="store_true")
+
+    msg = f"profile read/compute/write with cProfile & tracemalloc; " \
+          f"dump stats every {gpar.NEVT_PROFILE_UPDATE} events"
+    parser.add_argument("--profile", help=msg, action="store_true")
+
     msg = "Developer Refactor index (pos=refac, neg=legacy)"
     parser.add_argument("--refac", help=msg, type=int, default=0)
 
@@ -151,6 +184,12 @@ def get_args():
     if args.outdir_csv:
         args.outdir_csv = os.path.expandvars(args.outdir_csv)
 
+    if args.write_fits_direct and args.outdir_snana is None:
+        sys.exit(f"\n ERROR: --write_fits_direct requires --outdir_snana\n")
+
+    if args.parquet and args.outdir_csv is None:
+        sys.exit(f"\n ERROR: --parquet requires --outdir_csv\n")
+
     if len(sys.argv) == 1:
         parser.print_help()
         sys.exit()
@@ -305,7 +344,8 @@ if __name__ == "__main__":
     program.read_data_driver()
 
     # translate TEXT -> FITS; allow multiple output formats
-    if args.outdir_snana is not None:
+    # (FITS files already written for --write_fits_direct)
+    if args.outdir_snana is not None and not args.write_fits_direct:
         write_snana.convert2fits_snana(args, program.config_data)
 
     # final summary
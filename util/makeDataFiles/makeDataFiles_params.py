@@ -6,6 +6,11 @@
 #  Copyright July 2021 R. Kessler
 #
 #  Jun 24 2022 R.Kessler - add HOSTGAL_LOGMASS_ERR
+#  Oct 2026: add NEVT_PIPELINE_QUEUE for --nthread_pipeline
+#  Oct 2026: add MWDUST_DIR and SFD map params for python MWEBV
+#  Oct 2026: add FORMAT_PARQUET and params for csvWriter --parquet
+#  Oct 2026: add NDAY_SUNSET_TABLE_PAD & NGRID_SUNSET_PER_DAY for sunset table
+#  Oct 2026: add NEVT_PROFILE_UPDATE & params for --profile
 
 """Constant definitions for makeDatafile framework.
 Relevant configuration gets loaded here.
@@ -30,6 +35,7 @@ DOCANA_KEY_END = "DOCUMENTATION_END"
 FORMAT_TEXT = "TEXT"
 FORMAT_FITS = "FITS"
 FORMAT_CSV  = "CSV"
+FORMAT_PARQUET = "PARQUET"
 
 # =============================================================================
 # User, hosts, passwords
@@ -135,10 +141,103 @@ OPTIONS_TEXT2FITS_SNANA = \
 OPTION_TEXT2FITS_SPECTRA_SNANA =  \
         "OPT_REFORMAT_FITS 128"
 
+# -----------------------------------------------------------------------------
+# for --write_fits_direct: write FITS tables without TEXT files & snana.exe.
+# Column formats and global header follow sntools_dataformat_fits.c;
+# HEAD columns not listed below are 1E (or 40A for strings).
+
+FITS_CODE_IVERSION = 26       # SNFITSIO_CODE_IVERSION in sntools_dataformat_fits.c
+FITS_EOE_MARKER    = -777.0   # end-of-event PHOT row (SNFITSIO_EOE_MARKER)
+FITS_BLOCK_SIZE    = 2880     # FITS record size, bytes
+NROW_FITS_FLUSH    = 100000   # flush buffered table rows to disk after this many
+NBYTE_FITS_COPY    = 16*1024*1024  # buffer size to copy table body into .gz
+
+FITS_TFORM_DEFAULT = "1E"
+FITS_TFORM_STRING  = "40A"
+FITS_TFORM_PRIVATE = "1D"
+
+FITS_TFORM_HEAD = {
+    "SNID"     : "16A",  "NAME_IAUC" : "16A",  "NAME_TRANSIENT" : "20A",
+    "SUBSURVEY": "40A",  "FAKE"      : "1I",
+    "RA"       : "1D",   "DEC"       : "1D",
+    "NXPIX"    : "1I",   "NYPIX"     : "1I",   "SNTYPE"   : "1J",
+    "NOBS"     : "1J",   "PTROBS_MIN": "1J",   "PTROBS_MAX" : "1J",
+    "REDSHIFT_QUALITYFLAG" : "1I",  "MASK_REDSHIFT_SOURCE" : "1I",
+    "MASK_FLUXCOR_SNANA"   : "1I",  "SEARCH_TYPE"          : "1J",
+    "NDETECT"              : "1J",
+    "HOSTGAL_NMATCH"  : "1I",  "HOSTGAL_NMATCH2"  : "1I",
+    "HOSTGAL_OBJID"   : "1K",  "HOSTGAL_OBJID2"   : "1K",
+    "HOSTGAL_OBJID_UNIQUE" : "1K",  "HOSTGAL_FLAG" : "1I",
+    "HOSTGAL_RA"      : "1D",  "HOSTGAL_DEC"      : "1D",
+    "HOSTGAL2_OBJID"  : "1K",  "HOSTGAL2_FLAG"    : "1I",
+    "HOSTGAL2_RA"     : "1D",  "HOSTGAL2_DEC"     : "1D",
+    "SIM_TYPE_INDEX"  : "1I"
+}
+
+FITS_TFORM_PHOT = {
+    "MJD"    : "1D",  "BAND"     : "20A",  "FIELD"  : "20A",
+    "CCDNUM" : "1I",  "IMGNUM"   : "1J",   "PHOTFLAG" : "1J"
+}
+
+# values for end-of-event PHOT row
+FITS_EOE_VALUES = {
+    "MJD"        : FITS_EOE_MARKER,
+    "FLUXCAL"    : FITS_EOE_MARKER,
+    "FLUXCALERR" : FITS_EOE_MARKER,
+    "BAND"       : "-",
+    "FIELD"      : "XXXX"
+}
+
+FITS_SPEC_HEADER_COLUMNS = [ "SNID", "MJD", "Texpose", "INSTRUMENT",
+                             "NBIN_LAM", "PTRSPEC_MIN", "PTRSPEC_MAX" ]
+FITS_SPEC_HEADER_FORMS   = [ "16A",  "1D",  "1D",      "20A",
+                             "1I",       "1J",          "1J" ]
+FITS_SPEC_FLUX_COLUMNS   = [ "LAMMIN", "LAMMAX", "FLAM", "FLAMERR" ]
+FITS_SPEC_FLUX_FORMS     = [ "1E",     "1E",     "1E",   "1E" ]
+
+# big-endian numpy dtype for each FITS TFORM code (A is handled separately)
+FITS_TFORM_DTYPE = {
+    "L" : ">i1",  "B" : ">u1",  "I" : ">i2",  "J" : ">i4",
+    "K" : ">i8",  "E" : ">f4",  "D" : ">f8"
+}
+
+# -----------------------------------------------------------------------------
+# for --parquet with --outdir_csv: Hive-partitioned parquet datasets
+# {outdir}/{metadata,lightcurve}/data_unit={unit}/{unit}.parquet
+PARQUET_PARTITION_KEY = "data_unit"
+NROW_PARQUET_BATCH    = 100000   # lightcurve rows per record batch (row group)
+PARQUET_COMPRESSION   = "zstd"
+
+# -----------------------------------------------------------------------------
+# SFD98 dust maps for MWEBV of events without MWEBV from reader.
+# MWEBV = MWEBV_SCALE_SFD * E(B-V)[SFD98] and error = MWEBV_FRACERR_SFD*MWEBV
+# to match OPT_MWEBV 3 (Schlafly 2011) in snana.exe above.
+MWDUST_DIR          = "$SNDATA_ROOT/MWDUST"
+MWDUST_FILE_NGP     = "SFD_dust_4096_ngp.fits"
+MWDUST_FILE_SGP     = "SFD_dust_4096_sgp.fits"
+MWEBV_SCALE_SFD     = 0.86
+MWEBV_FRACERR_SFD   = 0.05
+
+# -----------------------------------------------------------------------------
+# number of days before/after requested MJD range to compute
+# sunset-MJD table (see makeDataFiles_util.get_sunset_table)
+NDAY_SUNSET_TABLE_PAD = 100
+NGRID_SUNSET_PER_DAY  = 24    # grid of sun altitude (1 hour) to find sunset
+
 # -----------------------------------------------------------------------------
 # for writing events, update screen after this many
 NEVT_SCREEN_UPDATE = 500
 
+# for --profile: dump cProfile & tracemalloc after this many events,
+# with this many rows, and this many traceback frames per allocation
+NEVT_PROFILE_UPDATE = 10000   # should be multiple of NEVT_SCREEN_UPDATE
+NROW_PROFILE_DUMP   = 20
+NFRAME_TRACEMALLOC  = 1
+
+# for --nthread_pipeline, max number of events buffered between the
+# reader thread and the compute/write stage.
+NEVT_PIPELINE_QUEUE = 2000
+
 # -----------------------------------------------------------------------------
 # define yaml keys to store statistics for README
 
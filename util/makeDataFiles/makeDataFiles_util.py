@@ -2,6 +2,13 @@
 #
 # Mar 30 2022: add extract_sim_readme_info(...)
 # Sep 16 2022: in extract_sim_readme_info, only store str type
+# Oct 2026: add select_subsample_batch and READ_SNANA_FOLDER.get_data_batch
+#           for columnar (batch) read of an entire HEAD/PHOT file.
+# Oct 2026: helio_to_cmb & cmb_to_helio accept numpy arrays;
+#           add get_mwebv_sfd to read memory-mapped SFD98 dust maps.
+# Oct 2026: get_sunset_mjd uses binary search (searchsorted) and accepts
+#           numpy arrays; without mjd_file, use cached per-site sunset
+#           table from get_sunset_table instead of astroplan per call.
 #
 import os, sys, glob, math, yaml, tarfile, time
 import logging, shutil, subprocess
@@ -23,6 +30,9 @@ except ImportError as e:
     pass
 from astropy.time import Time
 
+# per-site cache of sorted sunset-MJD tables made by get_sunset_table
+SUNSET_TABLE_CACHE = {}
+
 
 # ========================================
 def print_elapsed_time(t0, comment):
@@ -182,8 +192,7 @@ def select_subsample(args, var_dict):
         if MJD_DETECT_FIRST <  args.nite_detect_range[0]-1.: return False
         if MJD_DETECT_FIRST >= args.nite_detect_range[1]+1.: return False
 
-        # compute extact NITE = MJD at sunset. Use brute force (slow)
-        # calculation since it is rarely computed.
+        # compute extact NITE = MJD at sunset from cached sunset table.
         mjd_sunset_dict = {}
         NITE = get_sunset_mjd(MJD_DETECT_FIRST, 'CTIO', mjd_sunset_dict )
 
@@ -194,17 +203,62 @@ def select_subsample(args, var_dict):
     return True
     # end select_subsample
 
+def select_subsample_batch(args, var_dict):
+
+    # Created Oct 2026
+    # Array version of select_subsample: each var_dict value is a numpy
+    # array with one element per event. Returns bool array with
+    # True for events passing selection.
+
+    SNID             = var_dict[gpar.DATAKEY_SNID]
+    PEAKMJD          = var_dict[gpar.DATAKEY_PEAKMJD]
+    MJD_DETECT_FIRST = var_dict[gpar.DATAKEY_MJD_DETECT_FIRST]
+
+    nsplitran         = args.nsplitran
+    isplitran_select  = args.isplitran
+
+    nevt = len(SNID)
+    sel  = np.ones(nevt, dtype=bool)
+
+    if nsplitran > 1 and isplitran_select>=0 :
+        sel &= ( (SNID % nsplitran) + 1 == isplitran_select )
+
+    if args.peakmjd_range :
+        sel &= (PEAKMJD >= args.peakmjd_range[0])
+        sel &= (PEAKMJD <  args.peakmjd_range[1])
+
+    if args.nite_detect_range :
+        # coarse MJD cut for all events, then exact NITE cut
+        # only for events passing coarse cut
+        sel &= (MJD_DETECT_FIRST >= args.nite_detect_range[0]-1.)
+        sel &= (MJD_DETECT_FIRST <  args.nite_detect_range[1]+1.)
+        evt_list = np.flatnonzero(sel)
+        if len(evt_list) > 0 :
+            mjd_sunset_dict = {}
+            NITE = get_sunset_mjd(MJD_DETECT_FIRST[evt_list], 'CTIO',
+                                  mjd_sunset_dict )
+            sel[evt_list] &= (NITE >= args.nite_detect_range[0])
+            sel[evt_list] &= (NITE <  args.nite_detect_range[1])
+
+    return sel
+    # end select_subsample_batch
+
 def get_sunset_mjd(mjd, site_name, sunset_dict):
     '''
     Returns an MJD of sunset prior to input mjd as float - not a Time Object.
     If sunset_dict is passed with mjd_file, read it and store contents
     in same dictionary that gets passed back on future calls. Sunset_dict
     is much faster than brute-force astroplan calls.
+    Oct 2026: mjd may be a numpy array (returns array of NITE), and
+      NITE is found by binary search in sorted sunset list. Without
+      mjd_file, sunset list is a cached per-site table (get_sunset_table).
     '''
 
     keydict_mjd_file        = 'mjd_file'
     keydict_mjd_sunset_list = 'mjd_sunset_list'
 
+    mjd_array = np.asarray(mjd, dtype=np.float64)
+
     if keydict_mjd_file in sunset_dict :
         if keydict_mjd_sunset_list not in sunset_dict:
             mjd_file = os.path.expandvars(sunset_dict[keydict_mjd_file])
@@ -212,7 +266,7 @@ def get_sunset_mjd(mjd, site_name, sunset_dict):
             with open(mjd_file,"rt") as f:
                 for word in f:
                     mjd_sunset_list.append(float(word))
-            sunset_dict[keydict_mjd_sunset_list] = np.array(mjd_sunset_list)
+            sunset_dict[keydict_mjd_sunset_list] = np.sort(mjd_sunset_list)
             n_mjd   = len(mjd_sunset_list)
             mjd_min = mjd_sunset_list[0]
             mjd_max = mjd_sunset_list[-1]
@@ -220,39 +274,108 @@ def get_sunset_mjd(mjd, site_name, sunset_dict):
                   f" Found {n_mjd} {site_name} sunset-MJDs from {mjd_min} to {mjd_max}\n"            
             logging.info(msg)
             #sys.exit(f"\n xxx mjd_sunset_list = \n{mjd_sunset_list[0:100]}")
-        # - - - - - -
-        # use mjd-sunset list to find NITE
         mjd_sunset_list = sunset_dict[keydict_mjd_sunset_list]
-        idx  = (np.abs(mjd_sunset_list-mjd)).argmin()
-        NITE = mjd_sunset_list[idx]  # nearest sunset
-        if NITE > mjd:
-            NITE = mjd_sunset_list[idx-1]  # nearest sunset before mjd
+
+    elif ASTROPLAN_EXISTS and mjd_array.size > 0 :
+        mjd_sunset_list = get_sunset_table(site_name, np.min(mjd_array),
+                                           np.max(mjd_array))
+
+    else:
+        # for debug only ; should probably flag error?
+        return mjd
+
+    # - - - - - -
+    # use mjd-sunset list to find NITE = last sunset at or before mjd
+    idx  = np.searchsorted(mjd_sunset_list, mjd_array, side='right') - 1
+    NITE = mjd_sunset_list[np.maximum(idx, 0)]
             
-        DEBUG_NITE = False
-        if DEBUG_NITE:
-            site        = Observer.at_site(site_name)
-            detect_time = Time(mjd, format='mjd')
-            sun_set     = site.sun_set_time(detect_time, which='previous').mjd
-            NITE_ASTROPLAN = sun_set
-            if abs(NITE-NITE_ASTROPLAN) > 0.01 :
-                sys.exit(f"\n ERROR: NITE[GRID,ASTROPLAN] = " \
-                         f"[{NITE:.4f} , {NITE_ASTROPLAN:.4f}]" \
-                         f" for mjd={mjd:.4f}")      
-        #sys.exit(f"\n xxxx mjd={mjd} idx={idx} NITE={NITE}")
-                
-    elif ASTROPLAN_EXISTS:
+    DEBUG_NITE = False
+    if DEBUG_NITE:
         site        = Observer.at_site(site_name)
-        detect_time = Time(mjd, format='mjd')
+        detect_time = Time(mjd_array, format='mjd')
         sun_set     = site.sun_set_time(detect_time, which='previous').mjd
-        NITE        = sun_set
+        NITE_ASTROPLAN = sun_set
+        if np.max(np.abs(NITE-NITE_ASTROPLAN)) > 0.01 :
+            sys.exit(f"\n ERROR: NITE[GRID,ASTROPLAN] = " \
+                     f"[{NITE} , {NITE_ASTROPLAN}]" \
+                     f" for mjd={mjd_array}")      
 
-    else:
-        # for debug only ; should probably flag error?
-        NITE = mjd
-        
+    if NITE.ndim == 0 : NITE = float(NITE)
     return NITE
     # end get_sunset_mjd
 
+def get_sunset_table(site_name, mjd_min, mjd_max):
+
+    # Created Oct 2026
+    # Return sorted array of sunset MJDs at site_name that includes
+    # the last sunset before mjd_min and the first sunset after mjd_max.
+    # Table covers requested range padded by gpar.NDAY_SUNSET_TABLE_PAD
+    # days, and it is stored in SUNSET_TABLE_CACHE; if a later call
+    # needs a wider MJD range, only the missing days are computed.
+
+    cache = SUNSET_TABLE_CACHE.get(site_name)
+    if cache is not None:
+        table = cache['table']
+        if len(table) > 0 and table[0] <= mjd_min and table[-1] > mjd_max :
+            return table
+
+    t0      = time.time()
+    pad     = gpar.NDAY_SUNSET_TABLE_PAD
+    day_min = math.floor(mjd_min) - pad
+    day_max = math.ceil(mjd_max)  + pad
+
+    if cache is None:
+        table = compute_sunset_mjd_range(site_name, day_min, day_max)
+    else:
+        day_min = min(day_min, cache['day_min'])
+        day_max = max(day_max, cache['day_max'])
+        table_lo = compute_sunset_mjd_range(site_name, day_min, cache['day_min'])
+        table_hi = compute_sunset_mjd_range(site_name, cache['day_max'], day_max)
+        table    = np.concatenate([table_lo, cache['table'], table_hi])
+
+    SUNSET_TABLE_CACHE[site_name] = {
+        'day_min' : day_min,  'day_max' : day_max,  'table' : table
+    }
+    logging.info(f" Computed {site_name} sunset-MJD table " \
+                 f"for MJD {day_min} to {day_max} ({len(table)} sunsets, " \
+                 f"{time.time()-t0:.1f} sec)")
+    return table
+    # end get_sunset_table
+
+def compute_sunset_mjd_range(site_name, day_min, day_max):
+
+    # Created Oct 2026
+    # Return sunset MJDs at site_name between day_min and day_max.
+    # Sun altitude is computed with one vectorized astroplan call on
+    # a grid of gpar.NGRID_SUNSET_PER_DAY points per day. Each downward
+    # horizon crossing is linearly interpolated, then refined with one
+    # more altitude evaluation at the interpolated time.
+    # Only crossings inside [day_min, day_max] are returned, so adjacent
+    # ranges sharing a boundary day never give the same sunset twice.
+
+    dt    = 1.0 / gpar.NGRID_SUNSET_PER_DAY
+    ngrid = int(round((day_max - day_min)/dt)) + 1
+    if ngrid < 2 : return np.array([], dtype=np.float64)
+
+    site     = Observer.at_site(site_name)
+    mjd_grid = day_min + dt * np.arange(0, ngrid)
+    alt      = site.sun_altaz(Time(mjd_grid, format='mjd')).alt.deg
+
+    # sun goes from above to below horizon between grid points i and i+1
+    i_set    = np.flatnonzero( (alt[:-1] > 0.0) & (alt[1:] <= 0.0) )
+    if len(i_set) == 0 : return np.array([], dtype=np.float64)
+    t_lo, a_lo = mjd_grid[i_set],   alt[i_set]
+    t_hi, a_hi = mjd_grid[i_set+1], alt[i_set+1]
+
+    t_mid  = t_lo + a_lo/(a_lo-a_hi) * (t_hi-t_lo)
+    a_mid  = site.sun_altaz(Time(t_mid, format='mjd')).alt.deg
+    above  = (a_mid > 0.0)
+    t_lo   = np.where(above, t_mid, t_lo) ;  a_lo = np.where(above, a_mid, a_lo)
+    t_hi   = np.where(above, t_hi, t_mid) ;  a_hi = np.where(above, a_hi, a_mid)
+
+    return t_lo + a_lo/(a_lo-a_hi) * (t_hi-t_lo)
+    # end compute_sunset_mjd_range
+
 def init_readme_stats():
     readme_stats = {}
     for key in gpar.KEYLIST_README_STATS:
@@ -448,24 +571,30 @@ def mag_to_flux(m, me, zp):
     return f, fe
 
 def radec_to_xyz(ra, dec):
-    x = math.cos(np.deg2rad(dec)) * math.cos(np.deg2rad(ra))
-    y = math.cos(np.deg2rad(dec)) * math.sin(np.deg2rad(ra))
-    z = math.sin(np.deg2rad(dec))
+    # ra, dec can be scalars or numpy arrays; returns xyz with
+    # shape (3,) or (3,N)
+    ra_rad  = np.deg2rad(np.asarray(ra,  dtype=np.float64))
+    dec_rad = np.deg2rad(np.asarray(dec, dtype=np.float64))
+    cos_dec = np.cos(dec_rad)
+
+    x = cos_dec * np.cos(ra_rad)
+    y = cos_dec * np.sin(ra_rad)
+    z = np.sin(dec_rad)
 
     return np.array([x, y, z], dtype=np.float64)
 
+# J2000 CMB dipole coords from NED
+CMB_DZ  = 371000. / 299792458.
+CMB_RA  = 168.01190437
+CMB_DEC = -6.98296811
+CMB_XYZ = radec_to_xyz(CMB_RA, CMB_DEC)
+
 def cmb_dz(ra, dec):
     """See http://arxiv.org/pdf/astro-ph/9609034
      CMBcoordsRA = 167.98750000 # J2000 Lineweaver
      CMBcoordsDEC = -7.22000000
     """
 
-    # J2000 coords from NED
-    CMB_DZ  = 371000. / 299792458.
-    CMB_RA  = 168.01190437
-    CMB_DEC = -6.98296811
-    CMB_XYZ = radec_to_xyz(CMB_RA, CMB_DEC)
-
     coords_xyz = radec_to_xyz(ra, dec)
 
     dz = CMB_DZ * np.dot(CMB_XYZ, coords_xyz)
@@ -477,15 +606,15 @@ def helio_to_cmb(z, ra, dec):
 
     Parameters
     ----------
-    z : float
+    z : float or array
         Heliocentric redshift.
-    ra, dec: float
+    ra, dec: float or array
         RA and Declination in degrees (J2000).
     """
 
     dz = -cmb_dz(ra, dec)
-    one_plus_z_pec = math.sqrt((1. + dz) / (1. - dz))
-    one_plus_z_CMB = (1. + z) / one_plus_z_pec
+    one_plus_z_pec = np.sqrt((1. + dz) / (1. - dz))
+    one_plus_z_CMB = (1. + np.asarray(z, dtype=np.float64)) / one_plus_z_pec
 
     return one_plus_z_CMB - 1.
 
@@ -494,18 +623,150 @@ def cmb_to_helio(z, ra, dec):
 
     Parameters
     ----------
-    z : float
+    z : float or array
         CMB-frame redshift.
-    ra, dec: float
+    ra, dec: float or array
         RA and Declination in degrees (J2000).
     """
 
     dz = -cmb_dz(ra, dec)
-    one_plus_z_pec = math.sqrt((1. + dz) / (1. - dz))
-    one_plus_z_helio = (1. + z) * one_plus_z_pec
+    one_plus_z_pec = np.sqrt((1. + dz) / (1. - dz))
+    one_plus_z_helio = (1. + np.asarray(z, dtype=np.float64)) * one_plus_z_pec
 
     return one_plus_z_helio - 1.
 
+# J2000 equatorial -> galactic rotation matrix (same as slaEqgal)
+RMAT_EQ2GAL = np.array([
+    [ -0.054875539726, -0.873437108010, -0.483834985808 ],
+    [  0.494109453312, -0.444829589425,  0.746982251810 ],
+    [ -0.867666135858, -0.198076386122,  0.455983795705 ] ])
+
+def radec_to_gal(ra, dec):
+    # return galactic (l,b) in degrees for J2000 ra,dec (scalar or array)
+    xyz_gal = np.dot(RMAT_EQ2GAL, radec_to_xyz(ra, dec))
+    gall    = np.rad2deg(np.arctan2(xyz_gal[1], xyz_gal[0])) % 360.0
+    galb    = np.rad2deg(np.arcsin(np.clip(xyz_gal[2], -1.0, 1.0)))
+    return gall, galb
+
+# memory-mapped SFD maps; key = mwdust_dir, value = None if maps not found
+MWDUST_MAP_CACHE = {}
+
+def open_mwdust_maps(mwdust_dir):
+
+    # Created Oct 2026
+    # Return list of [NGP,SGP] map dictionaries for SFD98 dust maps
+    # in mwdust_dir, or None if maps do not exist. Map images are
+    # memory mapped so that only pixels near events are read.
+    # Maps are opened once and cached for the job.
+
+    if mwdust_dir in MWDUST_MAP_CACHE :
+        return MWDUST_MAP_CACHE[mwdust_dir]
+
+    mwdust_dir_expand = os.path.expandvars(mwdust_dir)
+    map_list = []
+    for map_file, nsgp in zip([gpar.MWDUST_FILE_NGP, gpar.MWDUST_FILE_SGP],
+                              [ +1, -1 ] ):
+        map_path = f"{mwdust_dir_expand}/{map_file}"
+        if not os.path.exists(map_path):
+            logging.warning(f" Cannot find {map_path} -> " \
+                            f"cannot compute undefined MWEBV")
+            map_list = None
+            break
+
+        hdul   = fits.open(map_path, memmap=True)
+        header = hdul[0].header
+        map_dict = {
+            'file'   : map_path,
+            'data'   : hdul[0].data,        # memory mapped image
+            'nsgp'   : header.get('LAM_NSGP', nsgp),
+            'scale'  : header['LAM_SCAL'],
+            'crpix1' : header['CRPIX1'],
+            'crpix2' : header['CRPIX2'],
+            'crval1' : header.get('CRVAL1', 0.0),
+            'crval2' : header.get('CRVAL2', 0.0),
+        }
+        map_list.append(map_dict)
+        logging.info(f" Open dust map {map_path}")
+
+    MWDUST_MAP_CACHE[mwdust_dir] = map_list
+    return map_list
+    # end open_mwdust_maps
+
+def get_ebv_sfd(ra, dec, map_list):
+
+    # Created Oct 2026
+    # Return SFD98 E(B-V) array for ra,dec arrays using Lambert
+    # projection and 2x2 linear interpolation as in lambert_getval
+    # in src/MWgaldust.c.
+
+    gall, galb = radec_to_gal(np.atleast_1d(ra), np.atleast_1d(dec))
+    ebv        = np.zeros(len(gall), dtype=np.float64)
+
+    is_sgp = (galb < 0.0)
+    for map_dict, sel in zip(map_list, [ ~is_sgp, is_sgp ]):
+        if not np.any(sel): continue
+        data  = map_dict['data']
+        nsgp  = map_dict['nsgp']
+        scale = map_dict['scale']
+        ny, nx = data.shape
+
+        l_rad = np.deg2rad(gall[sel])
+        b_rad = np.deg2rad(galb[sel])
+        rho   = np.sqrt(1.0 - nsgp * np.sin(b_rad))
+        xr = rho*np.cos(l_rad)*scale + \
+             map_dict['crpix1'] - map_dict['crval1'] - 1.0
+        yr = -nsgp*rho*np.sin(l_rad)*scale + \
+             map_dict['crpix2'] - map_dict['crval2'] - 1.0
+
+        # pixel index and weights with same edge treatment as C code
+        xpix = xr.astype(np.int64)
+        ypix = yr.astype(np.int64)
+        dx   = xpix - xr + 1.0
+        dy   = ypix - yr + 1.0
+        dx[xpix < 0] = 1.0  ;  xpix[xpix < 0] = 0
+        dy[ypix < 0] = 1.0  ;  ypix[ypix < 0] = 0
+        dx[xpix >= nx-1] = 0.0  ;  xpix[xpix >= nx-1] = nx-2
+        dy[ypix >= ny-1] = 0.0  ;  ypix[ypix >= ny-1] = ny-2
+
+        ebv[sel] = dx       * dy       * data[ypix,   xpix  ] + \
+                   (1.0-dx) * dy       * data[ypix,   xpix+1] + \
+                   dx       * (1.0-dy) * data[ypix+1, xpix  ] + \
+                   (1.0-dx) * (1.0-dy) * data[ypix+1, xpix+1]
+
+    return ebv
+    # end get_ebv_sfd
+
+def get_mwebv_sfd(ra, dec, mwdust_dir):
+
+    # Created Oct 2026
+    # Return MWEBV, MWEBV_ERR arrays for input ra,dec arrays, or
+    # None,None if SFD98 maps are not in mwdust_dir.
+    # Scale and error follow OPT_MWEBV 3 used for TEXT->FITS.
+
+    map_list = open_mwdust_maps(mwdust_dir)
+    if map_list is None:
+        return None, None
+
+    ebv       = get_ebv_sfd(ra, dec, map_list)
+    mwebv     = gpar.MWEBV_SCALE_SFD   * ebv
+    mwebv_err = gpar.MWEBV_FRACERR_SFD * mwebv
+    return mwebv, mwebv_err
+    # end get_mwebv_sfd
+
+def set_column_values(col, is_set, values):
+
+    # Created Oct 2026
+    # Return copy of column "col" with elements is_set replaced by
+    # values. Returned object array keeps the numpy scalar type of
+    # all other elements, so that text output matches reading one
+    # row at a time.
+
+    col_obj    = np.empty(len(col), dtype=object)
+    col_obj[:] = list(col)
+    col_obj[is_set] = values
+    return col_obj
+    # end set_column_values
+
 
 # ========================================
 #
@@ -609,6 +870,35 @@ def store_snana_hostgal(datakey_list, evt, table_dict, head_store):
 
     # end store_snana_hostgal
 
+def store_snana_hostgal_batch(datakey_list, table_dict, head_store):
+
+    # Column version of store_snana_hostgal: store entire hostgal
+    # columns in head_store. Negative redshifts are replaced with
+    # VAL_NULL using an object array so that all other elements
+    # keep the same numpy type as reading one row at a time.
+
+    table_head = table_dict['table_head']
+    head_names = table_dict['head_names']
+
+    for key in datakey_list:
+        if gpar.HOSTKEY_BASE not in key:
+            continue
+
+        is_z = gpar.HOSTKEY_SPECZ in key or gpar.HOSTKEY_PHOTOZ in key
+        key2 = key_hostgal_nbr(key,2)
+        key3 = key_hostgal_nbr(key,3)
+        key_list = [ key, key2, key3]
+        for k in key_list:
+            if k in head_names :
+                col = table_head[k]
+                if is_z :
+                    is_null = (col < 0.0)
+                    if np.any(is_null):
+                        col = set_column_values(col, is_null, gpar.VAL_NULL)
+                head_store[k] = col
+
+    # end store_snana_hostgal_batch
+
 def key_hostgal_nbr(key,n):
     # if key = HOSTGAL_XXX and n=2, return HOSTGAL2_XXX
 
@@ -690,6 +980,9 @@ class READ_SNANA_FOLDER:
          Return data_dict for input args(cuts) and event/row 'evt'.
          This is the standard data_dict that is written to output.
 
+       batch_dict = get_data_batch(args):
+         Return columnar batch_dict for all events in file (Oct 2026)
+
        end_read(): close HEAD and PHOT fits file
 
     """
@@ -1000,6 +1293,157 @@ class READ_SNANA_FOLDER:
 
         # end get_data_dict
 
+    def get_data_batch(self, args):
+
+        # Created Oct 2026
+        # Columnar version of get_data_dict for all events in the
+        # current HEAD/PHOT file. Returns batch_dict with
+        #   'nevt'         : number of events
+        #   'head_raw'     : dict of header columns, one element per event
+        #   'head_calc'    : idem for calculated header values
+        #   'head_private' : idem for PRIVATE variables
+        #   'head_sim'     : idem for sim truth
+        #   'phot_raw'     : dict of flat PHOT columns for all events;
+        #                    None for columns not in PHOT table
+        #   'ptr_obs'      : CSR-style offsets; PHOT rows for event evt
+        #                    are ptr_obs[evt]:ptr_obs[evt+1]
+        #   'select'       : bool array from user sub-sample selection
+        # Column elements are the same numpy scalars that get_data_dict
+        # returns so that output files are identical.
+
+        msgerr     = []
+
+        table_dict = self.snana_folder_dict['table_dict']
+
+        table_head = table_dict['table_head']
+        table_phot = table_dict['table_phot']
+        head_names = table_dict['head_names']
+        nevt       = len(table_head)
+
+        head_raw     = {}
+        head_calc    = {}
+        head_sim     = {}
+
+        # SNID: strip blanks from byte strings as in get_data_dict
+        SNID = table_head['SNID']
+        if SNID.dtype.kind == 'S':
+            SNID = np.char.replace(np.char.decode(SNID,'utf-8'), ' ', '')
+        head_raw[gpar.DATAKEY_SNID]    = SNID
+        head_raw[gpar.DATAKEY_SNTYPE]  = table_head['SNTYPE']
+        head_raw[gpar.DATAKEY_RA]      = table_head['RA']
+        key_dec = 'DEC' if 'DEC' in head_names else 'DECL'
+        head_raw[gpar.DATAKEY_DEC]     = table_head[key_dec]
+
+        head_calc[gpar.DATAKEY_PEAKMJD]   = table_head['PEAKMJD']
+
+        KEY0 = gpar.DATAKEY_MJD_DETECT_FIRST
+        KEY1 = gpar.DATAKEY_MJD_DETECT_SECOND
+        KEY2 = gpar.DATAKEY_MJD_DETECT_LAST
+        if KEY0 in head_names:
+            head_calc[KEY0] =  table_head[KEY0]
+            head_calc[KEY1] =  table_head[KEY1]
+            head_calc[KEY2] =  table_head[KEY2]
+            mjd_detect_first = table_head[KEY0]
+        else:
+            nite_range = args.nite_detect_range
+            if nite_range is not None:
+                msgerr.append(f"Cannot implement nite_detect_range={nite_range}")
+                msgerr.append(f"because {KEY0} is not in data header")
+                log_assert(False,msgerr)
+            mjd_detect_first = np.full(nevt, -9)
+
+        # - - - - - - -
+        # user sub-sample selection
+        var_dict = {
+            gpar.DATAKEY_SNID       : SNID.astype(np.int64),
+            gpar.DATAKEY_RA         : head_raw[gpar.DATAKEY_RA],
+            gpar.DATAKEY_DEC        : head_raw[gpar.DATAKEY_DEC],
+            gpar.DATAKEY_PEAKMJD    : head_calc[gpar.DATAKEY_PEAKMJD],
+            gpar.DATAKEY_MJD_DETECT_FIRST : mjd_detect_first
+        }
+        sel = select_subsample_batch(args, var_dict)
+
+        # - - - - - - -
+        head_raw[gpar.DATAKEY_zHEL]      = table_head['REDSHIFT_HELIO']
+        head_raw[gpar.DATAKEY_zHEL_ERR]  = table_head['REDSHIFT_HELIO_ERR']
+
+        head_calc[gpar.DATAKEY_zCMB]       = table_head['REDSHIFT_FINAL']
+        head_calc[gpar.DATAKEY_zCMB_ERR]   = table_head['REDSHIFT_FINAL_ERR']
+
+        head_calc[gpar.DATAKEY_MWEBV]      = table_head['MWEBV']
+        head_calc[gpar.DATAKEY_MWEBV_ERR]  = table_head['MWEBV_ERR']
+
+        store_snana_hostgal_batch(gpar.DATAKEY_LIST_RAW,  table_dict, head_raw)
+        store_snana_hostgal_batch(gpar.DATAKEY_LIST_CALC, table_dict, head_calc)
+
+        head_private = {}
+        for key in gpar.DATAKEY_LIST_PRIVATE:
+            head_private[key] = table_head[key]
+
+        KEY = gpar.SIMKEY_TYPE_INDEX
+        if KEY in head_names:   head_sim[KEY] = table_head[KEY]
+
+        # - - - - - - - - - - -
+        # PHOT pointers; PTROBS starts at 1, so subtract 1.
+        # Flat PHOT columns are gathered with one index array so that
+        # event evt has rows ptr_obs[evt]:ptr_obs[evt+1].
+        ROWMIN  = np.asarray(table_head['PTROBS_MIN'], dtype=np.int64) - 1
+        ROWMAX  = np.asarray(table_head['PTROBS_MAX'], dtype=np.int64) - 1
+        NOBS    = ROWMAX - ROWMIN + 1
+
+        ptr_obs       = np.zeros(nevt+1, dtype=np.int64)
+        ptr_obs[1:]   = np.cumsum(NOBS)
+        NOBS_TOT      = ptr_obs[-1]
+        irow_phot     = np.repeat(ROWMIN - ptr_obs[:-1], NOBS) + \
+                        np.arange(NOBS_TOT)
+
+        table_column_names = table_phot.columns.names
+        LEGACY_FLT = 'FLT' in table_column_names
+
+        phot_raw = {}
+        for varname in gpar.VARNAMES_OBS_LIST:
+            phot_raw[varname] = None
+            varname_table = varname
+            if LEGACY_FLT:
+                if varname == 'BAND' : varname_table = 'FLT'
+            if varname_table in table_column_names :
+                phot_raw[varname] = table_phot[varname_table][irow_phot]
+
+        # - - - - -
+        # field from first observation; unselected events keep
+        # default -9 because get_data_dict doesn't read their PHOT.
+        field = np.full(nevt, -9, dtype=object)
+        field_phot = phot_raw[gpar.DATAKEY_FIELD]
+        if field_phot is None :
+            field[sel] = None
+        else:
+            field_map  = {}
+            for evt in np.flatnonzero(sel):
+                f = field_phot[ptr_obs[evt]]
+                if f not in field_map:
+                    field_map[f] = f
+                    if args.survey == 'LSST' :
+                        field_map[f] = \
+                            field_plasticc_hack(f, table_dict['head_file'])
+                field[evt] = field_map[f]
+        head_raw[gpar.DATAKEY_FIELD] = field
+
+        # - - - - -
+        batch_dict = {
+            'nevt'         : nevt,
+            'head_raw'     : head_raw,
+            'head_calc'    : head_calc,
+            'head_private' : head_private,
+            'phot_raw'     : phot_raw,
+            'ptr_obs'      : ptr_obs,
+            'head_sim'     : head_sim,
+            'select'       : sel
+        }
+
+        return batch_dict
+
+        # end get_data_batch
+
     def end_read(self):
         self.snana_folder_dict['hdu_head'].close()
         self.snana_folder_dict['hdu_phot'].close()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+#
+# Created Oct 2026
+# Local mock of the LSST TOM and FASTDB query services for testing
+# read_data_lsst_tom.py and read_data_lsst_fastdb.py offline.
+# Fake objects & sources are stored in an in-memory sqlite data base,
+# and a http server accepts the same login and /db/runsqlquery/ requests
+# as the TOM. Optional latency per query emulates a remote server.
+#
+# Usage:
+#   mock_lsst_db.py --port 8080 --nobj 1000 --latency 0.05
+#
+#   makeDataFiles.sh --lsst_tom_db user:pw@http://localhost:8080 ...
+#   FASTDB_MOCK_URL=http://localhost:8080  makeDataFiles.sh --lsst_fastdb ...
+#
+
+import argparse, io, json, logging, re, sqlite3, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+MOCK_CSRFTOKEN = "mock-csrftoken"
+MOCK_DIAOBJECTID_START = 1000000   # first diaObjectId
+MOCK_MJD_START = 61000.0   # after LSST Y1 start (MJD 60750) in iyear_LSST
+MOCK_BAND_LIST = [ 'u', 'g', 'r', 'i', 'z', 'Y' ]
+MOCK_ZPHOT_QUANTILES = [ 0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100 ]
+
+# =======================================================
+def get_tom_object_columns():
+    # return list of elasticc_diaobject columns read by read_data_lsst_tom
+    col_list = [ 'ra', 'decl', 'z_final', 'z_final_err', 'mwebv', 'mwebv_err' ]
+    for host in [ '', 2 ]:
+        for kw in [ 'ra', 'dec', 'zphot', 'zphot_err', 'zspec', 'zspec_err',
+                    'ellipticity', 'snsep', 'sqradius' ]:
+            col_list.append(f"hostgal{host}_{kw}")
+        for band in MOCK_BAND_LIST:
+            col_list.append(f"hostgal{host}_mag_{band}")
+            col_list.append(f"hostgal{host}_magerr_{band}")
+        for q in MOCK_ZPHOT_QUANTILES:
+            col_list.append(f"hostgal{host}_zphot_q{q:03d}")
+    return col_list
+
+def create_mock_tables(conn, nobj, nobs, seed=1):
+
+    # create and fill TOM (elasticc_*) and FASTDB (dia_*) tables with
+    # nobj objects and nobs sources per object.
+    # Every 3rd source is a detection (in diasource); all sources are
+    # in diaforcedsource with the same id.
+
+    rng     = np.random.default_rng(seed)
+    col_obj = get_tom_object_columns()
+
+    cols = ', '.join([ f'"{c}" REAL' for c in col_obj ])
+    conn.execute(f'CREATE TABLE elasticc_diaobject ' \
+                 f'("diaObjectId" INTEGER PRIMARY KEY, {cols})')
+    for table, key_id in [ ('elasticc_diasource',       'diaSourceId'),
+                           ('elasticc_diaforcedsource', 'diaForcedSourceId') ]:
+        conn.execute(f'CREATE TABLE {table} ("{key_id}" INTEGER PRIMARY KEY, ' \
+                     f'"diaObject_id" INTEGER, "midPointTai" REAL, ' \
+                     f'"psFlux" REAL, "psFluxErr" REAL, "filterName" TEXT)')
+        conn.execute(f'CREATE INDEX idx_{table} ON {table} ("diaObject_id")')
+
+    conn.execute('CREATE TABLE dia_object (dia_object INTEGER PRIMARY KEY, ' \
+                 'ra REAL, decl REAL, season INTEGER, nobs INTEGER)')
+    conn.execute('CREATE TABLE dia_forced_source (dia_object INTEGER, ' \
+                 'mid_point_tai REAL, filter_name TEXT, ps_flux REAL, ' \
+                 'ps_flux_err REAL, valid_flag INTEGER)')
+    conn.execute('CREATE INDEX idx_dia_forced_source ON dia_forced_source (dia_object)')
+
+    # - - - - objects
+    objid_list = MOCK_DIAOBJECTID_START + np.arange(nobj)
+    values_obj = rng.uniform(0.01, 1.0, size=(nobj, len(col_obj)))
+    qmarks     = ','.join(['?'] * (len(col_obj)+1))
+    conn.executemany(f'INSERT INTO elasticc_diaobject VALUES ({qmarks})',
+                     [ (int(i),) + tuple(v) for i, v in zip(objid_list, values_obj) ])
+    conn.executemany('INSERT INTO dia_object VALUES (?,?,?,?,?)',
+                     [ (int(i), float(v[0])*360, float(v[1])*90-45, 1, nobs)
+                       for i, v in zip(objid_list, values_obj) ])
+
+    # - - - - sources
+    row_src = [] ; row_forced = [] ; row_fastdb = []
+    for iobj, objid in enumerate(objid_list):
+        mjd   = MOCK_MJD_START + np.sort(rng.uniform(0, 200, size=nobs))
+        flux  = rng.normal(1000.0, 300.0, size=nobs)
+        for o in range(0, nobs):
+            src_id = int(objid) * 1000 + o
+            band   = MOCK_BAND_LIST[o % len(MOCK_BAND_LIST)]
+            row    = (src_id, int(objid), float(mjd[o]), float(flux[o]), 30.0,
+                      f"LSST_{band}")
+            row_forced.append(row)
+            if o % 3 == 0 : row_src.append(row)
+            row_fastdb.append( (int(objid), float(mjd[o]), band,
+                                float(flux[o]), 30.0, 1) )
+
+    conn.executemany('INSERT INTO elasticc_diasource VALUES (?,?,?,?,?,?)', row_src)
+    conn.executemany('INSERT INTO elasticc_diaforcedsource VALUES (?,?,?,?,?,?)',
+                     row_forced)
+    conn.executemany('INSERT INTO dia_forced_source VALUES (?,?,?,?,?,?)', row_fastdb)
+    conn.create_function("mod", 2, lambda a, b: a % b)
+    conn.commit()
+    return
+    # end create_mock_tables
+
+def translate_query(query, subdict):
+
+    # translate postgres-style query with %(name)s substitutions into
+    # sqlite query with named parameters. List substitutions used with
+    # "= ANY(...)" or "IN ..." are expanded into (:name_0, :name_1, ...).
+
+    params = {}
+    def expand_list(match):
+        name   = match.group(1)
+        values = subdict[name]
+        keys   = [ f"{name}_{i}" for i in range(len(values)) ]
+        for key, value in zip(keys, values): params[key] = value
+        return ' IN (' + ','.join([ f":{key}" for key in keys ]) + ')'
+
+    query = re.sub(r"\s*=\s*ANY\(%\((\w+)\)s\)", expand_list, query)
+    query = re.sub(r"\s+IN\s+%\((\w+)\)s",       expand_list, query,
+                   flags=re.IGNORECASE)
+    for name in re.findall(r"%\((\w+)\)s", query):
+        params[name] = subdict[name]
+    query = re.sub(r"%\((\w+)\)s", r":\1", query)
+    return query, params
+
+# =======================================================
+class MockRequestHandler(BaseHTTPRequestHandler):
+
+    # server attributes: conn, lock, latency
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+    def send_body(self, text, content_type="text/html"):
+        body = text.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", f"csrftoken={MOCK_CSRFTOKEN}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # login page (sets csrftoken cookie)
+        self.send_body("mock login page")
+
+    def do_POST(self):
+        nbyte = int(self.headers.get("Content-Length", 0))
+        data  = self.rfile.read(nbyte)
+
+        if self.path.startswith("/accounts/login"):
+            self.send_body("mock login ok")
+            return
+
+        if not self.path.startswith("/db/runsqlquery"):
+            self.send_error(404)
+            return
+
+        time.sleep(self.server.latency)
+        request = json.loads(data)
+        try:
+            query, params = translate_query(request['query'],
+                                            request.get('subdict', {}))
+            with self.server.lock:
+                cursor = self.server.conn.execute(query, params)
+                names  = [ d[0] for d in cursor.description ]
+                rows   = [ dict(zip(names, row)) for row in cursor.fetchall() ]
+            reply = { 'status': 'ok', 'rows': rows, 'columns': names }
+        except Exception as e:
+            reply = { 'status': 'error', 'error': str(e) }
+        self.send_body(json.dumps(reply), "application/json")
+
+    # end MockRequestHandler
+
+def start_mock_server(port=0, nobj=1000, nobs=30, latency=0.0):
+
+    # create mock tables and start server in background thread.
+    # Returns server; url is http://localhost:{server.server_port}
+
+    server = ThreadingHTTPServer(("localhost", port), MockRequestHandler)
+    server.conn    = sqlite3.connect(":memory:", check_same_thread=False)
+    server.lock    = threading.Lock()
+    server.latency = latency
+    create_mock_tables(server.conn, nobj, nobs)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logging.info(f" Started mock LSST data base server at " \
+                 f"http://localhost:{server.server_port} with {nobj} objects")
+    return server
+
+# =======================================================
+class MockFastDB:
+
+    # client with the query methods of fastdb_api.FASTDB that are used
+    # by read_data_lsst_fastdb, but sending queries to mock server.
+
+    def __init__(self, url):
+        import requests
+        self.url = url.rstrip('/')
+        self.rqs = requests.session()
+
+    def send_query(self, query, subdict):
+        res  = self.rqs.post(f"{self.url}/db/runsqlquery/",
+                             json={ 'query': query, 'subdict': subdict })
+        data = json.loads(res.text)
+        if data['status'] != 'ok':
+            raise RuntimeError(f"Error response from mock server: {data['error']}")
+        return data
+
+    def submit_short_query(self, query, subdict={}):
+        return self.send_query(query, subdict)['rows']
+
+    def synchronous_long_query(self, query, subdict={}, checkeach=300,
+                               maxwait=40000):
+        # return csv text (with header, even for no rows) as for
+        # the real long query
+        import pandas as pd
+        data = self.send_query(query, subdict)
+        return pd.DataFrame(data['rows'], columns=data['columns']).to_csv(index=False)
+
+    # end MockFastDB
+
+# =======================================================
+def get_args():
+    parser = argparse.ArgumentParser()
+
+    msg = "port for mock server (default=8080)"
+    parser.add_argument("--port", help=msg, type=int, default=8080)
+
+    msg = "number of fake objects (default=1000)"
+    parser.add_argument("--nobj", help=msg, type=int, default=1000)
+
+    msg = "number of sources per object (default=30)"
+    parser.add_argument("--nobs", help=msg, type=int, default=30)
+
+    msg = "latency (seconds) added to each query (default=0)"
+    parser.add_argument("--latency", help=msg, type=float, default=0.0)
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = get_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    server = start_mock_server(args.port, args.nobj, args.nobs, args.latency)
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+# end:
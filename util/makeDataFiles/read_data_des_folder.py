@@ -1,4 +1,11 @@
 # Read DES(SMP) data from directory.
+#
+# Oct 2026: index SMP masterlist by cid (dictionary) instead of
+#   query per event, and extract csv files from each SMP tarball with
+#   one sequential pass into a local cache (instead of random-access
+#   extractfile that re-decompresses gzip from start of tar).
+#   Cache is in $DES_SMP_CACHE if defined (kept for next jobs);
+#   else in a temporary folder that is removed at end.
 
 import glob
 import logging
@@ -6,6 +13,8 @@ import os
 import shutil
 import sys
 import tarfile
+import tempfile
+import time
 
 import yaml
 import numpy as np
@@ -22,8 +31,15 @@ from makeDataFiles_base import Program
 # '/project2/rkessler/SURVEYS/DES/ROOT/smp_cori'
 PATH_DES_SMP = os.getenv("DES_SMP")  
 
+# optional persistent cache for csv files extracted from SMP tarballs
+PATH_DES_SMP_CACHE = os.getenv("DES_SMP_CACHE")
+
 SMP_MASTERLIST_FILE ='masterlist.csv'
 
+# stamp in each cache folder with size and mtime of its tarball;
+# cache is re-extracted if tarball changes.
+SMP_CACHE_STAMP_FILE = 'TARBALL.STAMP'
+
 # Select private DES variables to keep
 PRIVATE_VAR_DICT = {
     'DES_numepochs_ml_Y1' : 'Ndetect in Y1 passing autoscan',
@@ -57,8 +73,13 @@ class data_des_folder(Program):
         SNANA_READER = self.config_data['SNANA_READER']
         SNANA_READER.init_private_dict(PRIVATE_VAR_DICT)
 
-        # .xyz initialize SMP; read master list ....
-        
+        self.init_smp()
+
+        # end init_read_data
+
+    def init_smp(self):
+
+        # initialize SMP: read master list and prepare tarball cache.
         # e.g., check $DES_SMP; else abort.
         #HARD CODE THE SMP location
         #self.PATH_SMP = PATH_SMP
@@ -71,51 +92,122 @@ class data_des_folder(Program):
         
         logging.info("Prepare DES SMP, setting up masterlist and tarballs")
         self.file_cache = {}
-        self.file_cache['tarballs'] = {}
+        self.file_cache['tarballs'] = {}   # tar_id -> cache folder
 
         self.masterlistpath = os.path.join(PATH_DES_SMP, SMP_MASTERLIST_FILE)
         self.smp_master_list = pd.read_csv(self.masterlistpath)
+
+        # index masterlist by cid; keep first row for duplicate cid
+        smp_unique = self.smp_master_list.drop_duplicates('cid', keep='first')
+        self.smp_master_dict = smp_unique.set_index('cid').to_dict('index')
     
         self.n_smp_files = np.max(self.smp_master_list.tar_id)
         logging.info(f"Masterlist shows {self.n_smp_files} files")
 
-        # end init_read_data
-
-    def _get_phot_table(self, snid):
-
-        if not str(snid) in self.file_cache.keys():
-            phot_info = self.smp_master_list.query(f"cid=={snid}").iloc[0]
+        if PATH_DES_SMP_CACHE is not None:
+            self.smp_cache_dir = os.path.expandvars(PATH_DES_SMP_CACHE)
+            os.makedirs(self.smp_cache_dir, exist_ok=True)
+            self.smp_cache_remove = False
+        else:
+            self.smp_cache_dir = tempfile.mkdtemp(prefix="DES_SMP_CACHE_")
+            self.smp_cache_remove = True
+        logging.info(f"Extract SMP tarballs into {self.smp_cache_dir}")
 
-            self.file_cache[str(snid)] = dict(phot_info)
-            tarball = self._get_tarball(phot_info.tar_id)
+        # end init_smp
 
-            lc_table_basename = os.path.join(
-                os.path.dirname(phot_info.tar_path),
-                f"csvfiles/phot_{snid}.csv"
-            )
-            lctab = pd.read_csv(tarball.extractfile(lc_table_basename))
-            self.file_cache[str(snid)]['lctab'] = lctab
+    def _get_phot_table(self, snid):
 
-            return lctab
+        phot_info = self.smp_master_dict[snid]
+        cache_dir = self._get_tarball(phot_info['tar_id'])
 
-        return self.file_cache[str(snid)]['lctab']
+        lc_table_basename = os.path.join(
+            os.path.dirname(phot_info['tar_path']),
+            f"csvfiles/phot_{snid}.csv"
+        )
+        lctab = pd.read_csv(os.path.join(cache_dir, lc_table_basename))
+        return lctab
 
 
     def _get_tarball(self, tar_id):
-        
-        if not str(tar_id) in self.file_cache['tarballs'].keys():
-            phot_table_path = os.path.join(
-                PATH_DES_SMP, f"phot_{tar_id:02d}.tar.gz"
-            )
-            if tarfile.is_tarfile(phot_table_path):
-                tarball_file = tarfile.open(phot_table_path, "r:gz")
-            else:
-                raise IOError(f"File {phot_table_path} not found")
 
-            self.file_cache['tarballs'][str(tar_id)] = tarball_file
+        # return cache folder with csv files from tarball tar_id;
+        # on first call, extract with one sequential pass through the
+        # tarball unless a previous job already filled the cache from
+        # the same tarball (checked with stamp of tarball size & mtime).
         
-        return self.file_cache['tarballs'][str(tar_id)]
-
+        if tar_id in self.file_cache['tarballs']:
+            return self.file_cache['tarballs'][tar_id]
+
+        tar_name  = f"phot_{tar_id:02d}"
+        cache_dir = os.path.join(self.smp_cache_dir, tar_name)
+        phot_table_path = os.path.join(PATH_DES_SMP, f"{tar_name}.tar.gz")
+        if not tarfile.is_tarfile(phot_table_path):
+            raise IOError(f"File {phot_table_path} not found")
+
+        st    = os.stat(phot_table_path)
+        stamp = f"{st.st_size} {st.st_mtime_ns}"
+
+        if os.path.isdir(cache_dir) and \
+           self._read_cache_stamp(cache_dir) != stamp :
+            # tarball changed since cache was made: move stale cache
+            # aside (atomic for other jobs) and remove it.
+            logging.info(f"  Remove stale SMP cache {cache_dir}")
+            stale_dir = tempfile.mkdtemp(prefix=f"STALE_{tar_name}_",
+                                         dir=self.smp_cache_dir)
+            try:
+                os.rename(cache_dir, f"{stale_dir}/{tar_name}")
+            except OSError:
+                pass   # another job already moved it
+            shutil.rmtree(stale_dir, ignore_errors=True)
+
+        if not os.path.isdir(cache_dir):
+            # extract into temp folder, then rename so that other jobs
+            # sharing $DES_SMP_CACHE never see a partial cache folder;
+            # temp folder is removed if extraction fails.
+            t0      = time.time()
+            tmp_dir = tempfile.mkdtemp(prefix=f"TMP_{tar_name}_",
+                                       dir=self.smp_cache_dir)
+            nfile   = 0
+            try:
+                with tarfile.open(phot_table_path, "r|gz") as tarball:
+                    for member in tarball:
+                        name = member.name
+                        if not member.isfile() or not name.endswith('.csv'):
+                            continue
+                        if os.path.isabs(name) or '..' in name.split('/'):
+                            continue
+                        out_file = os.path.join(tmp_dir, name)
+                        os.makedirs(os.path.dirname(out_file), exist_ok=True)
+                        with tarball.extractfile(member) as f_in, \
+                             open(out_file, "wb") as f_out:
+                            shutil.copyfileobj(f_in, f_out)
+                        nfile += 1
+
+                stamp_file = os.path.join(tmp_dir, SMP_CACHE_STAMP_FILE)
+                with open(stamp_file, "wt") as f:
+                    f.write(f"{stamp}\n")
+
+                try:
+                    os.rename(tmp_dir, cache_dir)
+                except OSError:
+                    pass   # another job made cache first
+            finally:
+                if os.path.isdir(tmp_dir):
+                    shutil.rmtree(tmp_dir)
+
+            msg = f"extract {nfile} csv files from {tar_name}.tar.gz"
+            util.print_elapsed_time(t0, msg)
+
+        self.file_cache['tarballs'][tar_id] = cache_dir
+        return cache_dir
+
+    def _read_cache_stamp(self, cache_dir):
+        # return tarball stamp stored in cache_dir, or None if missing
+        stamp_file = os.path.join(cache_dir, SMP_CACHE_STAMP_FILE)
+        if not os.path.isfile(stamp_file):
+            return None
+        with open(stamp_file, "rt") as f:
+            return f.read().strip()
 
     def prep_read_data_subgroup(self, i_subgroup):
 
@@ -133,9 +225,9 @@ class data_des_folder(Program):
     def end_read_data(self):
         """Teardown method for closing open files and clearing cache."""
 
-        # close open tarballs
-        for tar_id, afile in self.file_cache['tarballs'].items():
-            afile.close()
+        # remove temporary cache of extracted tarballs
+        if self.smp_cache_remove:
+            shutil.rmtree(self.smp_cache_dir, ignore_errors=True)
 
         return
 
@@ -147,7 +239,7 @@ class data_des_folder(Program):
         data_dict    = SNANA_READER.get_data_dict(args, evt)
         snid         = int(data_dict['head_raw']['SNID'])
 
-        if snid not in self.smp_master_list.cid.values:
+        if snid not in self.smp_master_dict:
             data_dict['select'] = False
             logging.debug(f"Skipping SNID={snid}, not in SMP masterlist")
             return data_dict
@@ -1,9 +1,17 @@
 # Created Jan 2025 by R.Kessler
 # Read from F.A.S.T data base (for LSST-DESC) 
+#
+# Oct 2026: each subgroup is a keyset page of MXOBJ_PER_SOURCE_QUERY
+#   objects (dia_object > last dia_object of previous page) instead of
+#   one query for all objects. Objects & sources of the next subgroup
+#   are prefetched in a background thread while the current subgroup
+#   is processed. For offline tests, set env FASTDB_MOCK_URL to the
+#   url of mock_lsst_db.py server.
 
 import os, sys, glob, yaml, shutil, time, logging, math, io, copy
 import numpy  as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 import makeDataFiles_util  as    util
 import makeDataFiles_params as gpar
 
@@ -93,8 +101,19 @@ class data_lsst_fastdb(Program):
         logging.info(f" One-time init for " \
                      f" CPU-isplit = {args.isplitran:3d} of {args.nsplitran:3d}")
         
-        logging.info(" Connect to FASTDB\n")
-        self.data_access = FASTDB()
+        mock_url = os.environ.get("FASTDB_MOCK_URL")
+        if mock_url:
+            from mock_lsst_db import MockFastDB
+            logging.info(f" Connect to mock FASTDB at {mock_url}\n")
+            self.data_access = MockFastDB(mock_url)
+        else:
+            logging.info(" Connect to FASTDB\n")
+            self.data_access = FASTDB()
+
+        # single background thread reads objects & sources for next subgroup
+        self.nobj_read      = 0
+        self.prefetch_pool  = ThreadPoolExecutor(max_workers=1)
+        self.prefetch       = None
     
         return
         # end init_read_data
@@ -106,47 +125,74 @@ class data_lsst_fastdb(Program):
         # will parse it later for writing.
         # Objects and sources are stored separately.
         
-        data_access = self.data_access
         args        = self.config_inputs['args'] 
-        
 
-        # on i_subgroup 0, query for ALL objects.
+        # on i_subgroup 0, read first page of objects;
+        # later pages were already submitted by previous subgroup.
         if i_subgroup == 0:
-            query = self.construct_query_object()            
-            self.read_fastdb_objects(query)  # load self.df_dia_objects_all
-            self.get_subgroup_lists()        # break snid_list into subgroup lists
+            self.prefetch = self.submit_subgroup(None)
+
+        # when there is no next page, return -1 as flag that we are done.
+        if self.prefetch is None :       return -1
 
-        # when i_subgroup reaches n_subgroup, return -1 as flag that we are done.
-        if i_subgroup >= self.n_subgroup :       return -1
+        logging.info(f"# ----------------------------------------------- ")
+        logging.info(f" Read objects & sources for subgroup {i_subgroup:3d}")
+        t0 = time.time()
+        df_dia_object, df_dia_source, src_index = self.prefetch.result()
+        util.print_elapsed_time(t0, "wait for prefetched subgroup")
+
+        nobj_subgroup  = len(df_dia_object)
+        if nobj_subgroup == 0 :          return -1
 
-        snid_list      = self.snid_subgroup_list[i_subgroup]
+        snid_list      = list(map(int, df_dia_object[FASTDB_KEYNAME_SNID]))
         snid_first     = snid_list[0]
         snid_last      = snid_list[-1]
-        nobj_subgroup  = len(snid_list)
-        
-        logging.info(f"# ----------------------------------------------- ")
-        logging.info(f" Read sources for subgroup {i_subgroup:3d} of {self.n_subgroup} ")
+        self.nobj_read += nobj_subgroup
         logging.info(f" First/Last snid for this subgroup: {snid_first} / {snid_last} ")
 
-        # extract object table subset for this subgroup
-        df_all   = self.df_dia_object_all
-        key_snid = FASTDB_KEYNAME_SNID
-        self.df_dia_object = df_all[df_all[key_snid].isin(snid_list)]
-        
-        # - - - - - - - -
-        # select sources for objects in this subgroup
-        query = f"select * FROM {TABLENAME_DIA_SOURCE}  WHERE dia_object IN %(objs)s order by " \
-            f"{FASTDB_KEYNAME_SNID}, {FASTDB_KEYNAME_MJD} "
-        self.read_fastdb_sources(query, snid_list)
+        self.df_dia_object = df_dia_object
+        self.df_dia_source = df_dia_source
+        self.src_index     = src_index
+
+        # prefetch next page (keyset after snid_last) while this
+        # subgroup is processed
+        self.prefetch = None
+        if nobj_subgroup == MXOBJ_PER_SOURCE_QUERY and self.nobj_read < args.nevt:
+            self.prefetch = self.submit_subgroup(snid_last)
 
-        #sys.exit(f"\n xxx bye ")
-        # - - - - -
-            
         logging.info('')
         return nobj_subgroup
 
         # end prep_read_data_subgroup
 
+    def submit_subgroup(self, snid_after):
+        # submit background read of objects & sources for next page
+        args  = self.config_inputs['args'] 
+        nobj  = min(MXOBJ_PER_SOURCE_QUERY, args.nevt - self.nobj_read)
+        return self.prefetch_pool.submit(self.read_fastdb_subgroup,
+                                         snid_after, nobj)
+
+    def read_fastdb_subgroup(self, snid_after, nobj):
+
+        # read up to nobj objects with snid > snid_after (None -> first),
+        # then read sources for these objects.
+        # Returns object table, source table, and map of snid to
+        # source-table rows.
+
+        query = self.construct_query_object(snid_after, nobj)
+        df_dia_object = self.read_fastdb_objects(query)
+
+        df_dia_source = None
+        src_index     = {}
+        if len(df_dia_object) > 0:
+            snid_list = list(map(int, df_dia_object[FASTDB_KEYNAME_SNID]))
+            query = f"select * FROM {TABLENAME_DIA_SOURCE}  WHERE dia_object IN %(objs)s order by " \
+                f"{FASTDB_KEYNAME_SNID}, {FASTDB_KEYNAME_MJD} "
+            df_dia_source = self.read_fastdb_sources(query, snid_list)
+            if len(df_dia_source) > 0:
+                src_index = df_dia_source.groupby(FASTDB_KEYNAME_SNID).indices
+
+        return df_dia_object, df_dia_source, src_index
 
     def read_fastdb_objects(self, query):
 
@@ -161,24 +207,21 @@ class data_lsst_fastdb(Program):
             csv_obj_tmp = data_access.synchronous_long_query(query,
                                                              checkeach=5,   # check every 5 sec
                                                              maxwait=QMAXWAIT_OBJECT ) # abort after this time
-            df_dia_object_all  = pd.read_csv(io.StringIO(csv_obj_tmp), sep=',')
+            df_dia_object  = pd.read_csv(io.StringIO(csv_obj_tmp), sep=',')
         else:
             # return dictionary; then convert to data frame
             dict_obj_tmp      = data_access.submit_short_query(query)
-            df_dia_object_all = pd.DataFrame(dict_obj_tmp)
+            df_dia_object = pd.DataFrame(dict_obj_tmp)
 
         # - - - - 
-        nobj  = len(df_dia_object_all)            
+        nobj  = len(df_dia_object)            
         msg   = f"Query dia_object for {nobj:,d} objects"
         util.print_elapsed_time(t0, msg)
     
-        logging.info(f"  dia_object columns: {df_dia_object_all.columns}")
+        logging.info(f"  dia_object columns: {df_dia_object.columns}")
         logging.info('')
 
-        self.nobj_all          = len(df_dia_object_all)
-        self.df_dia_object_all = df_dia_object_all
-        
-        return
+        return df_dia_object
 
     def read_fastdb_sources(self, query, snid_list):
 
@@ -205,39 +248,8 @@ class data_lsst_fastdb(Program):
         util.print_elapsed_time(t0, msg)
         logging.info(f"  dia_source columns: {df_dia_source.columns}")
 
-        self.df_dia_source = df_dia_source 
-        
-        return
+        return df_dia_source
     
-    def get_subgroup_lists(self):
-
-        # extract full snid and convert to integers
-        snid_list  = list(self.df_dia_object_all[FASTDB_KEYNAME_SNID])
-        snid_list  = list(map(int,snid_list))
-
-        # print 1st/last snid as diagnostic
-        snid_first = snid_list[0]
-        snid_last  = snid_list[-1]
-        logging.info(f"  First/Last SNID = {snid_first} / {snid_last} ")
-
-        nobj = len(snid_list)
-        snid_subgroup_list = []  # init list of lists
-        n_per_group        = MXOBJ_PER_SOURCE_QUERY
-        
-        for i in range(0, nobj, n_per_group):
-            subgroup_list = snid_list[i:i + n_per_group]
-            snid_subgroup_list.append(subgroup_list)
-
-        n_subgroup         = len(snid_subgroup_list)
-        logging.info(f"  Divide {nobj} objects into {n_subgroup} subgroups " \
-                     f"({n_per_group} objects per subgroup)")
-        
-        self.n_subgroup         = n_subgroup
-        self.snid_list          = snid_list
-        self.snid_subgroup_list = snid_subgroup_list
-        
-        return
-            
     def read_event(self, evt ):
 
         # read event for event number "evt" in this subgroup.
@@ -253,9 +265,11 @@ class data_lsst_fastdb(Program):
         #pdb.set_trace()
         
         dia_object_evt    = df_dia_object.iloc[evt]
-        
-        SNID = str(dia_object_evt[FASTDB_KEYNAME_SNID])
-        nobs     = dia_object_evt['nobs']
+
+        # read int columns directly; row above is upcast to float
+        # if all columns are numeric.
+        SNID = str(df_dia_object[FASTDB_KEYNAME_SNID].iloc[evt])
+        nobs     = int(df_dia_object['nobs'].iloc[evt])
         
         if DEBUG_DUMP:
             logging.debug(f"Read {args.read_class} event {evt} : SNID = {SNID}")
@@ -270,7 +284,7 @@ class data_lsst_fastdb(Program):
         # load light curve info 
         snana_phot_raw          = self.init_phot_dict(nobs)
         snana_phot_raw['NOBS']  = nobs
-        df_lightcurve    = df_dia_source[df_dia_source[FASTDB_KEYNAME_SNID] == int(SNID)]
+        df_lightcurve    = df_dia_source.iloc[self.src_index.get(int(SNID), [])]
         
         keylist_snana_phot_store = []
         for key_snana in DATAKEY_PHOT_LIST:
@@ -325,7 +339,10 @@ class data_lsst_fastdb(Program):
     
     # end read_event
 
-    def construct_query_object(self):
+    def construct_query_object(self, snid_after, nobj):
+
+        # query up to nobj objects with snid > snid_after;
+        # snid_after = None for first page.
         args        = self.config_inputs['args']
         season      = args.season
         nsplit      = args.nsplitran
@@ -344,10 +361,11 @@ class data_lsst_fastdb(Program):
         
         
         q_list   = [ q_season, q_nobs, q_mod ]
-        q_join   = " and ".join(q_list)
+        if snid_after is not None:
+            q_list.append(f"{FASTDB_KEYNAME_SNID}>{snid_after}")
 
-        if args.nevt:
-            q_join  += f" order by dia_object limit {args.nevt}"    
+        q_join   = " and ".join(q_list)
+        q_join  += f" order by {FASTDB_KEYNAME_SNID} limit {nobj}"    
         
         query = f"select * from {TABLENAME_DIA_OBJECT} where {q_join} "
         
@@ -503,7 +521,7 @@ class data_lsst_fastdb(Program):
         pass
     def end_read_data(self):
         # global end for reading data                           
-        pass
+        self.prefetch_pool.shutdown(wait=True, cancel_futures=True)
 
     def exclude_varlist_obs(self):
         # return list of PHOT columns to excude from output text files
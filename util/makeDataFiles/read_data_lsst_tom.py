@@ -1,8 +1,15 @@
+# Oct 2026: page through elasticc_diaobject with keyset pagination on
+#   diaObjectId (instead of LIMIT/OFFSET), read sources & forced sources
+#   for an entire page with one query each, and prefetch the next page
+#   in a background thread while the current page is processed.
+#   Test offline with mock_lsst_db.py.
+
 import os, sys, glob, yaml, shutil, pickle, re
 import requests
 import json
 import logging  # , coloredlogs
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import makeDataFiles_util  as    util
 from   makeDataFiles_base    import Program
 from   makeDataFiles_params  import *
@@ -11,6 +18,8 @@ ZP_ALERT = 31.4
 PHOTFLAG_DETECT = 4096
 PHOTFLAG_FIRST_DETECT = 2048
 
+NOBJ_PER_PAGE = 100   # number of diaObjects (and their sources) per query
+
 # FILTERMAP_PKL2SNANA = {
 #     # CSV ->     SNANA
 #     'p48g'     : 'ZTF-g' ,
@@ -54,9 +63,15 @@ class data_lsst_tom_db(Program):
         self.config_inputs['nevt'] = int( rows[0]['count'] )
         sys.stderr.write( f"Found {self.config_inputs['nevt']} events.\n" )
         
-        self.cache_size = 100
-        self.diaobjectcache = []
-        self.diaobjectoffset = 0
+        # page of objects & sources for current events; pages are read
+        # by a single background thread so that the next page is
+        # fetched while the current page is processed.
+        self.page_size      = NOBJ_PER_PAGE
+        self.page           = None
+        self.page_offset    = 0
+        self.page_after_id  = { 0: None }  # page offset -> last diaObjectId before page
+        self.prefetch_pool  = ThreadPoolExecutor(max_workers=1)
+        self.prefetch       = None         # (offset, future) for next page
 
         # end read_data_driver
 
@@ -86,7 +101,95 @@ class data_lsst_tom_db(Program):
         pass
     def end_read_data(self):
         # global end for reading data
-        pass
+        self.prefetch_pool.shutdown(wait=True, cancel_futures=True)
+
+    def get_page(self, evt):
+
+        # return page of objects & sources containing event evt;
+        # for sequential events, page was already prefetched.
+
+        offset = self.page_size * int( evt / self.page_size )
+        if self.page is not None and offset == self.page_offset:
+            return self.page
+
+        if self.prefetch is not None and self.prefetch[0] == offset:
+            future = self.prefetch[1]
+        else:
+            after_id = self.get_page_after_id(offset)
+            future   = self.prefetch_pool.submit(self.fetch_page, after_id)
+
+        self.page        = future.result()
+        self.page_offset = offset
+
+        # prefetch next page (keyset = last diaObjectId of this page)
+        self.prefetch = None
+        nevt          = min( self.config_inputs['nevt'],
+                             self.config_inputs['args'].nevt )
+        next_offset   = offset + self.page_size
+        objects       = self.page['objects']
+        if len(objects) == self.page_size and next_offset < nevt:
+            after_id = objects[-1]['diaObjectId']
+            self.page_after_id[next_offset] = after_id
+            future   = self.prefetch_pool.submit(self.fetch_page, after_id)
+            self.prefetch = ( next_offset, future )
+
+        return self.page
+
+    def get_page_after_id(self, offset):
+
+        # return keyset (last diaObjectId before page) for page at offset.
+        # Only non-sequential reads need a query here.
+        if offset in self.page_after_id:
+            return self.page_after_id[offset]
+
+        q = ( 'SELECT "diaObjectId" FROM elasticc_diaobject '
+              'ORDER BY "diaObjectId" '
+              'LIMIT 1 OFFSET %(offset)s' )
+        future   = self.prefetch_pool.submit(self.send_query, q,
+                                             { 'offset': offset-1 } )
+        after_id = future.result()[0]['diaObjectId']
+        self.page_after_id[offset] = after_id
+        return after_id
+
+    def fetch_page(self, after_id):
+
+        # read next page of objects after diaObjectId = after_id
+        # (None -> first page), and all sources for these objects.
+
+        q = 'SELECT * FROM elasticc_diaobject '
+        subs = { 'limit': self.page_size }
+        if after_id is not None:
+            q += 'WHERE "diaObjectId" > %(after_id)s '
+            subs['after_id'] = after_id
+        q += 'ORDER BY "diaObjectId" LIMIT %(limit)s'
+        objects = self.send_query( q, subs )
+
+        objid_list = [ row['diaObjectId'] for row in objects ]
+        page = {
+            'objects'       : objects,
+            'sources'       : self.fetch_page_sources(
+                'elasticc_diasource', 'diaSourceId', objid_list),
+            'forcedsources' : self.fetch_page_sources(
+                'elasticc_diaforcedsource', 'diaForcedSourceId', objid_list)
+        }
+        return page
+
+    def fetch_page_sources(self, table, key_id, objid_list):
+
+        # return dictionary of source rows (sorted by midPointTai)
+        # for each object in objid_list
+        source_dict = { objid: [] for objid in objid_list }
+        if len(objid_list) == 0 : return source_dict
+
+        q = ( f'SELECT "diaObject_id","{key_id}","midPointTai","psFlux",'
+              f'"psFluxErr","filterName" '
+              f'FROM {table} '
+              f'WHERE "diaObject_id" = ANY(%(objs)s) '
+              f'ORDER BY "diaObject_id","midPointTai"' )
+        rows = self.send_query( q, { 'objs': objid_list } )
+        for row in rows:
+            source_dict[row['diaObject_id']].append(row)
+        return source_dict
 
     def	exclude_varlist_obs(self):
         # return list of PHOT columns to excude from output text files
@@ -96,19 +199,8 @@ class data_lsst_tom_db(Program):
 
         varlist_obs = self.config_data['varlist_obs']
 
-        if ( evt < self.diaobjectoffset ) or ( evt >= self.diaobjectoffset + len(self.diaobjectcache) ):
-            # Have to read a new bactch
-            offset = self.cache_size * int( evt / self.cache_size )
-            q = ( 'SELECT * FROM elasticc_diaobject '
-                  'ORDER BY "diaObjectId" '
-                  'LIMIT %(limit)s OFFSET %(offset)s' )
-            subs = { 'limit': self.cache_size,
-                     'offset': offset }
-            rows = self.send_query( q, subs )
-            self.diaobjectoffset = offset
-            self.diaobjectcache = rows
-
-        diaobject = self.diaobjectcache[ evt - self.diaobjectoffset ]
+        page      = self.get_page(evt)
+        diaobject = page['objects'][ evt - self.page_offset ]
 
         SNID = diaobject['diaObjectId']
         zHEL = diaobject['z_final']
@@ -177,11 +269,7 @@ class data_lsst_tom_db(Program):
         # Even though all the sources also show up in ForcedSources, we have to
         #  query both tables to figure out how to set PHOTFLAG
 
-        rows = self.send_query( 'SELECT "diaSourceId","midPointTai","psFlux","psFluxErr","filterName" '
-                                'FROM elasticc_diasource '
-                                'WHERE "diaObject_id"=%(snid)s '
-                                'ORDER BY "midPointTai"',
-                                { 'snid': SNID } )
+        rows = page['sources'][SNID]
         sources = { row['diaSourceId']: row  for row in rows }
 
         for key in sources:
@@ -193,10 +281,7 @@ class data_lsst_tom_db(Program):
 
         sources[ list(sources.keys())[0] ]['PHOTFLAG'] = PHOTFLAG_DETECT | PHOTFLAG_FIRST_DETECT
         
-        rows = self.send_query( 'SELECT "diaForcedSourceId","midPointTai","psFlux","psFluxErr","filterName" '
-                                'FROM elasticc_diaforcedsource '
-                                'WHERE "diaObject_id"=%(snid)s '
-                                'ORDER BY "midPointTai" ', { 'snid': SNID } )
+        rows = page['forcedsources'][SNID]
         forcedsources = { row['diaForcedSourceId']: row  for row in rows }
 
         # I know from how I (rknop) write the alerts that if
@@ -214,14 +299,14 @@ class data_lsst_tom_db(Program):
         phot_raw = self.init_phot_dict( len(keys) )
         phot_raw['NOBS'] = len(keys)
         phot_raw['MJD'] = np.array( [ sources[key]['midPointTai'] for key in keys ], dtype=np.float64 )
-        phot_raw['ZPFLUX'] = np.array( [ ZP_ALERT ] * len(keys), dtype=np.float )
+        phot_raw['ZPFLUX'] = np.array( [ ZP_ALERT ] * len(keys), dtype=np.float64 )
         phot_raw['FIELD'] = [ 'WFD' ] * len(keys)
         phot_raw['BAND'] = [ sources[key]['filterName'][-1] for key in keys ]
         # Convert to SNANA units
         fluxscale = np.power(10.0,(0.4*(SNANA_ZP - ZP_ALERT)))
-        phot_raw['FLUXCAL'] = np.array( [ sources[key]['psFlux']*fluxscale for key in keys ], dtype=np.float )
-        phot_raw['FLUXCALERR'] = np.array( [ sources[key]['psFluxErr']*fluxscale for key in keys ], dtype=np.float )
-        phot_raw['PHOTFLAG'] = np.array( [ sources[key]['PHOTFLAG'] for key in keys ], dtype=np.int )
+        phot_raw['FLUXCAL'] = np.array( [ sources[key]['psFlux']*fluxscale for key in keys ], dtype=np.float64 )
+        phot_raw['FLUXCALERR'] = np.array( [ sources[key]['psFluxErr']*fluxscale for key in keys ], dtype=np.float64 )
+        phot_raw['PHOTFLAG'] = np.array( [ sources[key]['PHOTFLAG'] for key in keys ], dtype=np.int64 )
 
         # sys.stderr.write( f'Returning head_raw with {len(head_raw)} entries, '
         #                   f'head_calc with {len(head_calc)} entries, and'
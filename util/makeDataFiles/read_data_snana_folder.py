@@ -2,6 +2,7 @@
 # Nov 30 2021: fix bug to account for PTROBS starting at 1 instead of 0.
 # Dec 20 2021: fix dumb bug to read last HEAD & PHOT file.
 # Feb 03 2022: integrate refac code; remove legacy (snana-reader util)
+# Oct 2026: add read_event_batch for --batch_read
 #
 import glob
 import logging  # , coloredlogs
@@ -65,6 +66,13 @@ class data_snana_folder(Program):
         return data_dict
         # end read_event
 
+    def read_event_batch(self, i_subgroup):
+        args          = self.config_inputs['args']  # command line args
+        SNANA_READER = self.config_data['SNANA_READER']
+        batch_dict = SNANA_READER.get_data_batch(args)
+        return batch_dict
+        # end read_event_batch
+
     def set_dump_flag(self, isn, data_event_dict):
         d_raw = data_event_dict['head_raw']
         zhel  = d_raw['REDSHIFT_HELIO']
@@ -10,6 +10,17 @@
 #  - provide separate table of flux correction vs. MWEBV and band
 #  + flush csv files
 #  - sort each file by SNID
+#
+# Oct 2026: add --parquet option to buffer events into arrow record
+#   batches and write Hive-partitioned parquet datasets,
+#     {outdir}/metadata/data_unit={unit}/{unit}.parquet
+#     {outdir}/lightcurve/data_unit={unit}/{unit}.parquet
+#   with dictionary-encoded band and float32 fluxes.
+#   merge_csv_driver merges SPLIT partitions into one partition.
+#   For csv text files, each split job (--isplitran with --nsplitran > 1)
+#   writes {unit}_metadata.csv, {unit}_lightcurveNN.csv and {unit}.README,
+#   and merge_csv_driver catenates them into metadata.csv and one
+#   lightcurveNN.csv per merged unit.
 
 import datetime, glob, yaml
 import logging
@@ -19,11 +30,29 @@ import numpy as np
 import makeDataFiles_params as gpar
 import makeDataFiles_util as util
 
+PYARROW_EXISTS = False
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_EXISTS = True
+except ImportError:
+    pass
+
+# numpy dtype to fill each parquet column type (string types not listed)
+PARQUET_NUMPY_DTYPE = {
+    'int8'    : np.int8,
+    'int32'   : np.int32,
+    'float32' : np.float32,
+    'float64' : np.float64
+}
+
 # ==============================================
 
 class csvWriter:
     METADATA_FILENAME      = "metadata.csv"
     LIGHTCURVE_FILE_PREFIX = "lightcurve"
+    METADATA_DATASET       = "metadata"     # parquet dataset folders
+    LIGHTCURVE_DATASET     = "lightcurve"
 
     def __init__( self, args, config_data):
 
@@ -33,76 +62,174 @@ class csvWriter:
 
         if args.merge :  return
 
+        self.parquet = args.parquet
+        if self.parquet and not PYARROW_EXISTS:
+            msgerr = []
+            msgerr.append(f"--parquet requires pyarrow, but pyarrow " \
+                          f"cannot be imported.")
+            msgerr.append(f"Install pyarrow or remove --parquet.")
+            util.log_assert(False,msgerr)
+
         # - - - - - - - - - - - - - - - -
-        # create output folder
+        # create output folder; for parquet or split job, keep existing
+        # folder so that split jobs can write their own files in the
+        # same folder. Text files of split job start with unit name.
         outdir = args.outdir_csv
-        util.create_output_folder(outdir)
+        self.text_prefix = ''
+        if self.parquet:
+            os.makedirs(outdir, exist_ok=True)
+        elif self.is_split_job():
+            os.makedirs(outdir, exist_ok=True)
+            unit_name = config_data['data_unit_name_list'][0]
+            self.text_prefix = f"{unit_name}_"
+            for f in glob.glob(f"{outdir}/{self.text_prefix}*.csv") :
+                os.remove(f)
+        else:
+            util.create_output_folder(outdir)
 
         # store file pointer for each possible light curve csv file,        
         n_unit = len(config_data['data_unit_name_list'])
         fp_lc_list = [ None ] * n_unit
         self.fp_lc_list = fp_lc_list
 
-        # store map between SNANA varname and output csv name
+        # store map between SNANA varname and output csv name;
+        # list is [csv name, csv format, comment, parquet type]
         self.mapvar_meta = {
             gpar.DATAKEY_SNID            : ['snid',  '9', 
-                                            'SN identifier'] ,
+                                            'SN identifier', 'string'] ,
             gpar.DATAKEY_NOBS            : ['nobs',  '3',
-                                            'Nobs in lightcurve file' ] ,
+                                            'Nobs in lightcurve file',
+                                            'int32' ] ,
             gpar.DATAKEY_SNTYPE          : ['type',  '2d',
-                                            'spectroscopic type (integer)'] ,
+                                            'spectroscopic type (integer)',
+                                            'int32' ] ,
             gpar.DATAKEY_RA              : ['ra',    '.6f',
-                                            'Right Ascension (degrees)' ] ,
+                                            'Right Ascension (degrees)',
+                                            'float64' ] ,
             gpar.DATAKEY_DEC             : ['dec',   '.6f',
-                                            'Declination (degrees)' ] ,
+                                            'Declination (degrees)',
+                                            'float64' ] ,
             gpar.DATAKEY_MWEBV           : ['mwebv', '.3f',
-                                            'Galactic E(B-V)' ] ,
+                                            'Galactic E(B-V)', 'float32' ] ,
             gpar.HOSTKEY_SPECZ           : ['hostgal_zspec',      '.3f',
-                                            'host spec-redshift' ] ,
+                                            'host spec-redshift',
+                                            'float32' ] ,
             gpar.HOSTKEY_SPECZ_ERR       : ['hostgal_zspec_err',  '.3f',
-                                            'error on host spec-z' ] ,
+                                            'error on host spec-z',
+                                            'float32' ] ,
             gpar.HOSTKEY_PHOTOZ          : ['hostgal_zphot',      '.3f',
-                                            'host photo-z' ] ,
+                                            'host photo-z', 'float32' ] ,
             gpar.HOSTKEY_PHOTOZ_ERR      : ['hostgal_zphot_err',  '.3f',
-                                            'error on host photo-z' ] ,
+                                            'error on host photo-z',
+                                            'float32' ] ,
             gpar.HOSTKEY_SNSEP           : ['hostgal_snsep',      '.3f',
-                                            'host-SN sep, arcsec' ] 
+                                            'host-SN sep, arcsec',
+                                            'float32' ] 
         }
 
         self.mapvar_lc = {
             gpar.DATAKEY_SNID         : [ 'snid',         '9',
-                                          'SN identifier' ],
+                                          'SN identifier', 'string' ],
             gpar.DATAKEY_MJD          : [ 'mjd'  ,        '.4f',
-                                          'Modified Julien Date (days)' ],
+                                          'Modified Julien Date (days)',
+                                          'float64' ],
             gpar.DATAKEY_BAND         : [ 'band' ,        '1',
-                                          'single-char passband; e.g., r' ],
+                                          'single-char passband; e.g., r',
+                                          'dictionary' ],
             gpar.DATAKEY_PHOTFLAG     : [ 'detect',       '1',
-                                          '0=not detcted, 1=detected' ],
+                                          '0=not detcted, 1=detected',
+                                          'int8' ],
             gpar.DATAKEY_FLUXCAL      : [ 'fluxcal' ,     '11.4e',
-                                          'calibrated flux with ZP=27.5' ],
+                                          'calibrated flux with ZP=27.5',
+                                          'float32' ],
             gpar.DATAKEY_FLUXCALERR   : [ 'fluxcal_err' , '10.4e',
-                                          'uncertainty on fluxcal' ]
+                                          'uncertainty on fluxcal',
+                                          'float32' ]
         }
 
-        # there is only one metadata file, so create it now during init
-        # and save pointer so we don't have to close and reopen this file
-        meta_file = f"{outdir}/{self.METADATA_FILENAME}"
-        logging.info(f" Open meta file: {meta_file}")
-        self.fp_meta = open(meta_file,"wt")
+        if self.parquet:
+            self.init_parquet(n_unit)
+        else:
+            # there is only one metadata file, so create it now during init
+            # and save pointer so we don't have to close and reopen this file
+            meta_file = f"{outdir}/{self.text_prefix}{self.METADATA_FILENAME}"
+            logging.info(f" Open meta file: {meta_file}")
+            self.fp_meta = open(meta_file,"wt")
 
-        # write header
-        self.write_csv_header( self.fp_meta, self.mapvar_meta)
+            # write header
+            self.write_csv_header( self.fp_meta, self.mapvar_meta)
 
         # init a few counters
         self.nevt_all_write   = 0
         self.nevt_type_write  = 0
         self.nobs_write       = 0
-        self.readme_file = f"{outdir}/DATA.README"
+        self.readme_file = self.get_readme_file()
 
         return
 
     # end __init__
 
+    def init_parquet(self, n_unit):
+
+        # Created Oct 2026
+        # prepare arrow schema for metadata and lightcurve tables, and
+        # per-unit column buffers that are flushed as record batches.
+
+        self.schema_meta = self.get_parquet_schema(self.mapvar_meta)
+        self.schema_lc   = self.get_parquet_schema(self.mapvar_lc)
+
+        # for each data unit: column buffers, row counts, and parquet writers
+        self.parquet_unit_list = [ None ] * n_unit
+
+        # remove partitions written by a previous job for the data units
+        # of this job; other partitions belong to other split jobs.
+        for unit_name in self.config_data['data_unit_name_list'] :
+            for dataset in [ self.METADATA_DATASET, self.LIGHTCURVE_DATASET ]:
+                part_dir = os.path.dirname(self.get_parquet_file(dataset,
+                                                                 unit_name))
+                if os.path.exists(part_dir) :
+                    shutil.rmtree(part_dir)
+        return
+        # end init_parquet
+
+    def is_split_job(self):
+        # True if this job writes one SPLIT unit of several split jobs
+        args = self.args
+        return args.nsplitran > 1 and args.isplitran > 0
+
+    def get_parquet_schema(self, mapvar):
+        field_list = []
+        for var_snana, var_csv in mapvar.items():
+            name, type_name = var_csv[0], var_csv[3]
+            if type_name == 'dictionary':
+                arrow_type = pa.dictionary(pa.int32(), pa.string())
+            else:
+                arrow_type = pa.type_for_alias(type_name)
+            field_list.append(pa.field(name, arrow_type))
+        return pa.schema(field_list)
+        # end get_parquet_schema
+
+    def init_parquet_unit(self, index_unit):
+
+        # init buffers for this data unit; parquet writers are opened
+        # at first flush so that empty data units leave no files.
+        unit = {
+            'meta'   : { var_csv[0]: [] for var_csv in self.mapvar_meta.values() },
+            'lc'     : { var_csv[0]: [] for var_csv in self.mapvar_lc.values() },
+            'nrow_meta'   : 0,
+            'nrow_lc'     : 0,
+            'writer_meta' : None,
+            'writer_lc'   : None
+        }
+        self.parquet_unit_list[index_unit] = unit
+        return unit
+        # end init_parquet_unit
+
+    def get_parquet_file(self, dataset, unit_name):
+        outdir = self.args.outdir_csv
+        key    = gpar.PARQUET_PARTITION_KEY
+        return f"{outdir}/{dataset}/{key}={unit_name}/{unit_name}.parquet"
+
     def append_readme_vardef_csv(self):
 
         # append variable definitions to readme file
@@ -155,6 +282,10 @@ class csvWriter:
         # Inputs:
         #  data_event_dict: event dictionary
 
+        if self.parquet:
+            self.append_event_parquet(data_event_dict)
+            return
+
         outdir          = self.args.outdir_csv
 
         data_unit_name_list   = self.config_data['data_unit_name_list']
@@ -164,7 +295,7 @@ class csvWriter:
         
         if self.fp_lc_list[index_unit] is None:
             prefix = self.LIGHTCURVE_FILE_PREFIX
-            lc_file = f"{outdir}/{prefix}{index_unit:02d}.csv" 
+            lc_file = f"{outdir}/{self.text_prefix}{prefix}{index_unit:02d}.csv" 
             logging.info(f" Open lc_file: {lc_file}") 
             fp = open(lc_file,"wt")
             self.fp_lc_list[index_unit] = fp
@@ -183,24 +314,33 @@ class csvWriter:
     # end write_event_csv
 
 # ====================================================
-    def append_metadata_csv(self, fp, data_event_dict):
+    def get_metadata_value(self, var_snana, data_event_dict):
 
+        # return value of SNANA header var_snana from event dictionary
         head_raw  = data_event_dict['head_raw']
         head_calc = data_event_dict['head_calc']
         phot_raw  = data_event_dict['phot_raw']  # for NOBS
         msgerr = []
+
+        if var_snana in head_raw :
+            value = head_raw[var_snana]
+        elif var_snana in head_calc :
+            value = head_calc[var_snana]                
+        elif var_snana in phot_raw :
+            value = phot_raw[var_snana]
+        else:
+            msgerr.append(f" Cannot find SNANA header var {var_snana}")
+            util.log_assert(False,msgerr)
+
+        return value
+        # end get_metadata_value
+
+    def append_metadata_csv(self, fp, data_event_dict):
+
         line = ""
 
         for var_snana, var_csv  in self.mapvar_meta.items() :
-            if var_snana in head_raw :
-                value = head_raw[var_snana]
-            elif var_snana in head_calc :
-                value = head_calc[var_snana]                
-            elif var_snana in phot_raw :
-                value = phot_raw[var_snana]
-            else:
-                msgerr.append(f" Cannot find SNANA header var {var_snana}")
-                util.log_assert(False,msgerr)
+            value = self.get_metadata_value(var_snana, data_event_dict)
 
             fmt = var_csv[1]
             if value == -9.0 : 
@@ -252,23 +392,166 @@ class csvWriter:
         return
         # end append_lightcurve_csv
 
+# ====================================================
+    def append_event_parquet(self, data_event_dict):
+
+        # Created Oct 2026
+        # append event to column buffers of its data unit;
+        # flush to parquet after gpar.NROW_PARQUET_BATCH lightcurve rows.
+
+        index_unit = data_event_dict['index_unit']
+        unit = self.parquet_unit_list[index_unit]
+        if unit is None:
+            unit = self.init_parquet_unit(index_unit)
+
+        phot_raw = data_event_dict['phot_raw']
+        nobs     = phot_raw[gpar.DATAKEY_NOBS]
+        snid     = str(data_event_dict['head_raw'][gpar.DATAKEY_SNID])
+        photflag_detect = self.args.photflag_detect
+
+        cols = unit['meta']
+        for var_snana, var_csv  in self.mapvar_meta.items() :
+            value = self.get_metadata_value(var_snana, data_event_dict)
+            if var_snana == gpar.DATAKEY_SNID: value = snid
+            cols[var_csv[0]].append(value)
+
+        cols = unit['lc']
+        for var_snana, var_csv  in self.mapvar_lc.items() :
+            if var_snana == gpar.DATAKEY_SNID:
+                values = [ snid ] * nobs
+            else:
+                values = phot_raw[var_snana][0:nobs]
+
+            # replace photflag with detect = 0 or 1 flag
+            if var_snana == gpar.DATAKEY_PHOTFLAG:
+                photflag = np.asarray(values, dtype=np.int64)
+                values   = (photflag & photflag_detect) // photflag_detect
+
+            cols[var_csv[0]].extend(values)
+
+        unit['nrow_meta'] += 1
+        unit['nrow_lc']   += nobs
+        self.nevt_all_write += 1
+        self.nobs_write     += nobs
+
+        if unit['nrow_lc'] >= gpar.NROW_PARQUET_BATCH:
+            self.flush_parquet(index_unit)
+
+        return
+        # end append_event_parquet
+
+    def flush_parquet(self, index_unit):
+
+        # write buffered columns of this data unit as one record batch
+        # per table; open parquet writers on first call.
+
+        unit      = self.parquet_unit_list[index_unit]
+        unit_name = self.config_data['data_unit_name_list'][index_unit]
+        if unit['nrow_meta'] == 0 : return
+
+        table_list = [
+            (self.METADATA_DATASET,   'meta', self.mapvar_meta, self.schema_meta),
+            (self.LIGHTCURVE_DATASET, 'lc',   self.mapvar_lc,   self.schema_lc) ]
+
+        for dataset, table, mapvar, schema in table_list:
+            cols = unit[table]
+            array_list = []
+            for var_snana, var_csv in mapvar.items():
+                name, type_name = var_csv[0], var_csv[3]
+                values = cols[name]
+                if type_name == 'dictionary':
+                    array = pa.array(values, type=pa.string()).dictionary_encode()
+                elif type_name == 'string':
+                    array = pa.array(values, type=pa.string())
+                else:
+                    dtype = PARQUET_NUMPY_DTYPE[type_name]
+                    array = pa.array(np.asarray(values, dtype=dtype))
+                array_list.append(array)
+                cols[name] = []
+
+            batch = pa.RecordBatch.from_arrays(array_list, schema=schema)
+
+            key_writer = f"writer_{table}"
+            if unit[key_writer] is None:
+                parquet_file = self.get_parquet_file(dataset, unit_name)
+                os.makedirs(os.path.dirname(parquet_file), exist_ok=True)
+                logging.info(f" Open parquet file: {parquet_file}")
+                unit[key_writer] = \
+                    pq.ParquetWriter(parquet_file, schema,
+                                     compression=gpar.PARQUET_COMPRESSION)
+            unit[key_writer].write_batch(batch)
+
+        unit['nrow_meta'] = 0
+        unit['nrow_lc']   = 0
+        return
+        # end flush_parquet
+
+    def end_write_parquet(self, index_unit):
+
+        # flush and close parquet files for this data unit,
+        # and write README with stats for this data unit.
+
+        unit = self.parquet_unit_list[index_unit]
+        if unit is None: return
+
+        self.flush_parquet(index_unit)
+        for key_writer in [ 'writer_meta', 'writer_lc' ]:
+            if unit[key_writer] is not None:
+                unit[key_writer].close()
+        self.parquet_unit_list[index_unit] = None
+
+        outdir      = self.args.outdir_csv
+        unit_name   = self.config_data['data_unit_name_list'][index_unit]
+        readme_dict = {
+            'readme_file'  : f"{outdir}/{unit_name}.README",
+            'readme_stats' : self.config_data['readme_stats_list'][index_unit],
+            'data_format'  : gpar.FORMAT_PARQUET,
+            'docana_flag'  : True
+        }
+        util.write_readme(self.args, readme_dict)
+
+        # DATA.README (needed to restore args in merge process) sums
+        # all data units written so far by this job.
+        readme_dict['readme_file']  = self.readme_file
+        readme_dict['readme_stats'] = self.config_data['readme_stats_sum']
+        util.write_readme(self.args, readme_dict)
+        self.append_readme_vardef_csv()
+
+        nevt = self.nevt_all_write
+        nobs = self.nobs_write        
+        logging.info(f"\n parquet-write summary after {unit_name}:")
+        logging.info(f"\t Finished writing {nevt} events to parquet files.")
+        logging.info(f"\t Total number of observations: {nobs}")
+        return
+        # end end_write_parquet
+
     def end_write(self, index_unit):
 
+        if self.parquet:
+            self.end_write_parquet(index_unit)
+            return
+
         # close file pointer for this data unit
         self.fp_lc_list[index_unit].close()
-        
-        # continue only for 1st data unit
-        if index_unit != 1 :
-            return
 
         # - - - - - - 
-        readme_stats_sum = self.config_data['readme_stats_sum']
+        # Oct 2026: write README after each data unit (was only for
+        # index_unit=1, so that single-unit jobs had no README).
+        # Split job also writes {unit}.README with stats for merge.
+        outdir      = self.args.outdir_csv
         readme_dict = {
-            'readme_file'  : self.readme_file,
-            'readme_stats' : readme_stats_sum,
             'data_format'  : gpar.FORMAT_CSV,
             'docana_flag'  : True
         }
+        if self.is_split_job():
+            unit_name = self.config_data['data_unit_name_list'][index_unit]
+            readme_dict['readme_file']  = f"{outdir}/{unit_name}.README"
+            readme_dict['readme_stats'] = \
+                self.config_data['readme_stats_list'][index_unit]
+            util.write_readme(self.args, readme_dict)
+
+        readme_dict['readme_file']  = self.readme_file
+        readme_dict['readme_stats'] = self.config_data['readme_stats_sum']
         util.write_readme(self.args, readme_dict)
 
         # append csv variable definitions
@@ -286,8 +569,216 @@ class csvWriter:
 
 # =======================================================
     def merge_csv_driver(self):
-        outdir = self.args.outdir_csv
-            
-        print(f" xxx hello from merge. outdir = {outdir}")
+
+        # Oct 2026: merge parquet partitions from SPLIT jobs; e.g.,
+        #   data_unit=LSST_WFD_SPLIT* -> data_unit=LSST_WFD
+        # Data units for all seasons need no link-folder (as for SNANA
+        # format) since reading {outdir}/metadata reads all partitions.
+        # Without parquet dataset, merge csv text files of SPLIT jobs.
+
+        outdir   = self.args.outdir_csv
+        meta_dir = f"{outdir}/{self.METADATA_DATASET}"
+        key      = gpar.PARQUET_PARTITION_KEY
+
+        if not os.path.isdir(meta_dir):
+            self.merge_csv_text_units()
+            self.merge_data_readme()
+            return
+
+        if not PYARROW_EXISTS:
+            msgerr = [ f"Cannot merge parquet partitions in {outdir}",
+                       f"because pyarrow cannot be imported." ]
+            util.log_assert(False,msgerr)
+
+        logging.info(f"\n Merge parquet partitions in {outdir}")
+
+        # get all prefixes by scooping up all SPLIT001 partitions
+        search_string = f"{key}=*_{gpar.PREFIX_SPLIT}001"
+        split_dir_list = sorted(glob.glob1(meta_dir, search_string))
+        for split_dir in split_dir_list:
+            # if split_dir = data_unit=LSST_WFD_SPLIT001, merge_unit=LSST_WFD
+            split_unit = split_dir.split('=',1)[1]
+            merge_unit = split_unit.split(f"_{gpar.PREFIX_SPLIT}")[0]
+            search_string = f"{key}={merge_unit}_{gpar.PREFIX_SPLIT}*"
+            unit_list = [ d.split('=',1)[1] for d in
+                          sorted(glob.glob1(meta_dir, search_string)) ]
+            self.merge_parquet_units(unit_list, merge_unit)
+
+        self.merge_data_readme()
         return
     # end merge_csv_driver
+
+    def merge_data_readme(self):
+
+        # each SPLIT job wrote DATA.README with its own stats;
+        # re-write with stats summed over all unit READMEs.
+        # If there are no unit READMEs (nothing merged), keep DATA.README.
+        outdir       = self.args.outdir_csv
+        readme_list  = [ f for f in sorted(glob.glob(f"{outdir}/*.README"))
+                         if f != self.get_readme_file() ]
+        if len(readme_list) == 0 : return
+
+        statsum_dict = {}
+        for key in gpar.KEYLIST_README_STATS:   statsum_dict[key] = 0
+        for README_file in readme_list:
+            README_yaml  = util.read_yaml(README_file)
+            for key in gpar.KEYLIST_README_STATS:
+                statsum_dict[key] += README_yaml[gpar.DOCANA_KEY][key]
+
+        README_file = self.get_readme_file()
+        README_yaml = util.read_yaml(README_file)
+        for key in gpar.KEYLIST_README_STATS:
+            README_yaml[gpar.DOCANA_KEY][key] = statsum_dict[key]
+        util.write_yaml(README_file,README_yaml)
+
+        return
+    # end merge_data_readme
+
+    def merge_csv_text_units(self):
+
+        # Created Oct 2026
+        # merge csv text files from SPLIT jobs; e.g.,
+        #   LSST_WFD_SPLIT*_metadata.csv     -> metadata.csv
+        #   LSST_WFD_SPLIT*_lightcurve00.csv -> lightcurve00.csv
+        # with one csv header per merged file. Metadata for all merged
+        # units goes into one file (as for a single job), and each
+        # merged unit gets its own lightcurve file.
+
+        outdir      = self.args.outdir_csv
+        suffix_meta = f"_{self.METADATA_FILENAME}"
+        prefix_lc   = self.LIGHTCURVE_FILE_PREFIX
+
+        # get all prefixes by scooping up all SPLIT001 metadata files
+        search_string  = f"*_{gpar.PREFIX_SPLIT}001{suffix_meta}"
+        split_file_list = sorted(glob.glob1(outdir, search_string))
+        if len(split_file_list) == 0 :
+            logging.info(f" Nothing to merge for csv text files in {outdir}")
+            return
+
+        logging.info(f"\n Merge csv text files in {outdir}")
+
+        meta_file  = f"{outdir}/{self.METADATA_FILENAME}"
+        fp_meta    = open(meta_file,"wt")
+        need_header_meta = True
+        for imerge, split_file in enumerate(split_file_list):
+            # if split_file = LSST_WFD_SPLIT001_metadata.csv, 
+            # merge_unit = LSST_WFD
+            merge_unit    = split_file.split(f"_{gpar.PREFIX_SPLIT}")[0]
+            search_string = f"{merge_unit}_{gpar.PREFIX_SPLIT}*{suffix_meta}"
+            unit_list = [ f[:-len(suffix_meta)] for f in
+                          sorted(glob.glob1(outdir, search_string)) ]
+            logging.info(f"\t Create merged unit {merge_unit} from " \
+                         f"{len(unit_list)} units")
+
+            file_list = [ f"{outdir}/{unit}{suffix_meta}" for unit in unit_list ]
+            need_header_meta = \
+                self.catenate_csv_files(file_list, fp_meta, need_header_meta)
+
+            lc_file   = f"{outdir}/{prefix_lc}{imerge:02d}.csv"
+            file_list = []
+            for unit in unit_list:
+                file_list += sorted(glob.glob(f"{outdir}/{unit}_{prefix_lc}*.csv"))
+            with open(lc_file,"wt") as fp_lc:
+                self.catenate_csv_files(file_list, fp_lc, True)
+
+            self.merge_unit_readme(unit_list, merge_unit)
+
+            # remove original text files
+            for unit in unit_list:
+                for f in glob.glob(f"{outdir}/{unit}_*.csv") :
+                    os.remove(f)
+
+        fp_meta.close()
+        return
+        # end merge_csv_text_units
+
+    def catenate_csv_files(self, file_list, fp_out, need_header):
+        # append each csv file in file_list to fp_out; keep csv header
+        # only if need_header is True and no header was written yet.
+        # Returns updated need_header.
+        for csv_file in file_list:
+            with open(csv_file,"rt") as fp_in:
+                header = fp_in.readline()
+                if need_header :
+                    fp_out.write(header)
+                    need_header = False
+                shutil.copyfileobj(fp_in, fp_out)
+        return need_header
+        # end catenate_csv_files
+
+    def get_readme_file(self):
+        return f"{self.args.outdir_csv}/DATA.README"
+
+    def merge_parquet_units(self, unit_list, merge_unit):
+
+        # combine parquet partitions for each unit in unit_list into
+        # a single partition merge_unit; stream one unit at a time
+        # so that memory is limited to the largest unit.
+        # Sum stats from each unit README into merged README
+        # (merge_unit_readme), and remove original partitions & READMEs.
+
+        outdir = self.args.outdir_csv
+        msgerr = []
+        logging.info(f"\t Create merged partition {merge_unit} from " \
+                     f"{len(unit_list)} units")
+
+        dataset_list = [ self.METADATA_DATASET, self.LIGHTCURVE_DATASET ]
+        for dataset in dataset_list:
+            merge_file = self.get_parquet_file(dataset, merge_unit)
+            merge_dir  = os.path.dirname(merge_file)
+            if os.path.exists(merge_dir):
+                msgerr.append(f"{merge_dir} already exists ?!?!?!")
+                msgerr.append(f"Something is wacky.")
+                util.log_assert(False,msgerr)
+
+            os.makedirs(merge_dir)
+            writer = None
+            for unit in unit_list:
+                unit_file = self.get_parquet_file(dataset, unit)
+                if not os.path.exists(unit_file): continue
+                table = pq.read_table(unit_file)
+                if writer is None:
+                    writer = pq.ParquetWriter(merge_file, table.schema,
+                                    compression=gpar.PARQUET_COMPRESSION)
+                writer.write_table(table, row_group_size=gpar.NROW_PARQUET_BATCH)
+            if writer is not None:
+                writer.close()
+
+        self.merge_unit_readme(unit_list, merge_unit)
+
+        # remove original partitions
+        key = gpar.PARQUET_PARTITION_KEY
+        for unit in unit_list:
+            for dataset in dataset_list:
+                unit_dir = f"{outdir}/{dataset}/{key}={unit}"
+                if os.path.exists(unit_dir): shutil.rmtree(unit_dir)
+
+        return
+        # end merge_parquet_units
+
+    def merge_unit_readme(self, unit_list, merge_unit):
+
+        # Sum stats from each unit README into merged README,
+        # and remove unit READMEs.
+        outdir = self.args.outdir_csv
+
+        # increment sum stats from readme
+        statsum_dict = {}
+        for key in gpar.KEYLIST_README_STATS:   statsum_dict[key] = 0
+
+        for unit in unit_list:
+            README_file  = f"{outdir}/{unit}.README"
+            README_yaml  = util.read_yaml(README_file)
+            for key in gpar.KEYLIST_README_STATS:
+                statsum_dict[key] += README_yaml[gpar.DOCANA_KEY][key]
+
+        README_file = f"{outdir}/{merge_unit}.README"
+        for key in gpar.KEYLIST_README_STATS:
+            README_yaml[gpar.DOCANA_KEY][key] = statsum_dict[key]
+        util.write_yaml(README_file,README_yaml)
+
+        for unit in unit_list:
+            os.remove(f"{outdir}/{unit}.README")
+
+        return
+        # end merge_unit_readme
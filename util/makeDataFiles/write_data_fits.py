@@ -0,0 +1,582 @@
+#
+# Created Oct 2026
+# Write SNANA FITS data files (HEAD, PHOT and optional SPEC) directly,
+# without the intermediate TEXT file per event and without the
+# snana.exe TEXT->FITS re-parse (VERSION_REFORMAT_FITS).
+#
+# Each data unit gets one set of FITS files with the same layout as
+# sntools_dataformat_fits.c:
+#   + HEAD table: one row per event; PTROBS_MIN/MAX point (1-based) to
+#     the first/last obs in the PHOT table.
+#   + PHOT table: NOBS rows per event followed by end-of-event row
+#     with MJD = FLUXCAL = FLUXCALERR = -777.
+#   + SPEC file with SPECTRO_HEADER (PTRSPEC_MIN/MAX) and SPECTRO_FLUX.
+#
+# Table rows are buffered in memory and flushed in blocks of
+# NROW_FITS_FLUSH rows to an uncompressed body file. At the end of
+# each data unit, the FITS headers (NAXIS2 now known) and bodies are
+# streamed into [VERSION]_[HEAD,PHOT,SPEC].FITS.gz.
+#
+# Note that unlike snana.exe, undefined PEAKMJD is not re-estimated
+# here; MWEBV is already computed in compute_data_event.
+#
+
+import os, sys, gzip, shutil, logging, datetime
+import numpy as np
+
+from astropy.io import fits
+
+import makeDataFiles_params as gpar
+import makeDataFiles_util   as util
+import write_data_snana
+
+# ==============================================
+
+class fitsTable:
+
+    # one FITS binary table whose rows are buffered and flushed
+    # in blocks to a temporary body file.
+
+    def __init__(self, extname, col_names, col_forms, body_file, row_mode):
+
+        # Inputs:
+        #   extname   : table name (e.g., Header, Photometry)
+        #   col_names : list of column names
+        #   col_forms : list of FITS TFORM per column (e.g., 1E, 20A)
+        #   body_file : temp file for table data (big-endian rows)
+        #   row_mode  : True  -> append_row() with one value per column
+        #               False -> append_block() with arrays per column
+
+        self.extname   = extname
+        self.col_names = col_names
+        self.col_forms = col_forms
+        self.body_file = body_file
+        self.row_mode  = row_mode
+        self.nrow      = 0      # total rows (flushed + buffered)
+        self.nrow_buf  = 0      # buffered rows not yet flushed
+
+        dtype_list = [ (name, tform_to_dtype(form))
+                       for name, form in zip(col_names, col_forms) ]
+        self.dtype   = np.dtype(dtype_list)
+        self.fp_body = open(body_file, "wb")
+        self.reset_buffer()
+        return
+
+    def reset_buffer(self):
+        self.buf      = { name : [] for name in self.col_names }
+        self.nrow_buf = 0
+
+    def append_row(self, row_dict):
+        # append one row; row_dict[name] = value
+        for name in self.col_names:
+            self.buf[name].append(row_dict[name])
+        self.nrow     += 1
+        self.nrow_buf += 1
+        if self.nrow_buf >= gpar.NROW_FITS_FLUSH :  self.flush()
+        # end append_row
+
+    def append_block(self, col_dict, nrow):
+        # append nrow rows; col_dict[name] = array of length nrow
+        for name in self.col_names:
+            self.buf[name].append(col_dict[name])
+        self.nrow     += nrow
+        self.nrow_buf += nrow
+        if self.nrow_buf >= gpar.NROW_FITS_FLUSH :  self.flush()
+        # end append_block
+
+    def flush(self):
+
+        # convert buffered rows into one big-endian record array
+        # and write it to body file with a single call.
+        if self.nrow_buf == 0 : return
+
+        rec = np.zeros(self.nrow_buf, dtype=self.dtype)
+        for name in self.col_names:
+            if self.row_mode :
+                rec[name] = self.buf[name]
+            else:
+                rec[name] = np.concatenate(self.buf[name])
+
+        self.fp_body.write(rec.tobytes())
+        self.reset_buffer()
+        return
+        # end flush
+
+    def get_header(self):
+        cols = [ fits.Column(name=name, format=form)
+                 for name, form in zip(self.col_names, self.col_forms) ]
+        hdu = fits.BinTableHDU.from_columns(cols, nrows=0, name=self.extname)
+        hdu.header['NAXIS2'] = self.nrow
+        return hdu.header
+
+    def write_to(self, f):
+
+        # write table header + body + padding to open file f,
+        # then remove temp body file.
+        self.flush()
+        self.fp_body.close()
+
+        f.write(self.get_header().tostring().encode("ascii"))
+        with open(self.body_file, "rb") as b:
+            shutil.copyfileobj(b, f, gpar.NBYTE_FITS_COPY)
+
+        nbyte = self.nrow * self.dtype.itemsize
+        npad  = -nbyte % gpar.FITS_BLOCK_SIZE
+        f.write(b'\0' * npad)
+
+        os.remove(self.body_file)
+        return
+        # end write_to
+
+    # end fitsTable
+
+# ==============================================
+def tform_to_dtype(tform):
+    # translate single-element FITS TFORM to big-endian numpy dtype
+    code = tform[-1]
+    if code == 'A' :
+        return f"S{tform[:-1]}"
+    return gpar.FITS_TFORM_DTYPE[code]
+    # end tform_to_dtype
+
+def write_fits_file_gz(fits_file_gz, primary_header, table_list):
+
+    # write gzipped FITS file with primary header (no data) followed
+    # by each table in table_list.
+    with gzip.open(fits_file_gz, "wb", compresslevel=6) as f:
+        f.write(primary_header.tostring().encode("ascii"))
+        for table in table_list:
+            table.write_to(f)
+    return
+    # end write_fits_file_gz
+
+def set_header_key(header, key, val, comment):
+    # keys longer than 8 char need the HIERARCH convention,
+    # as written by cfitsio fits_update_key.
+    if len(key) > 8 : key = f"HIERARCH {key}"
+    header[key] = (val, comment)
+    # end set_header_key
+
+# ==============================================
+
+class fitsWriter:
+
+    # header keys that are not HEAD table columns: SURVEY and FILTERS
+    # go into the global header; FIELD is per obs in PHOT table.
+    HEADKEY_SKIP_LIST = [ gpar.DATAKEY_SURVEY, gpar.DATAKEY_FILTERS,
+                          gpar.DATAKEY_FIELD ]
+
+    # head dictionaries written to HEAD table, in write order
+    HEAD_SOURCE_LIST = [ 'head_raw', 'head_calc', 'head_private', 'head_sim' ]
+
+    # map makeDataFiles keys to SNANA FITS column names
+    HEADKEY_RENAME = {
+        gpar.DATAKEY_zCMB     : 'REDSHIFT_FINAL',
+        gpar.DATAKEY_zCMB_ERR : 'REDSHIFT_FINAL_ERR'
+    }
+
+    def __init__(self, args, config_data):
+
+        # store info passed from base
+        self.args        = args
+        self.config_data = config_data
+
+        n_unit = len(config_data['data_unit_name_list'])
+
+        # per data unit: dictionary of fitsTable for HEAD, PHOT, SPEC
+        self.table_list = [ None ] * n_unit
+
+        # HEAD and PHOT columns are defined by first event
+        self.head_col_list = None     # [ (key,colname,form) ]
+        self.head_key_set  = None     # keys allowed in head dictionaries
+        self.head_private_set = None  # private keys (PRIVATE header keys)
+        self.phot_col_list = None     # [ (varname,form,val_undef) ]
+
+        self.nevt_write  = 0
+        self.nobs_write  = 0
+        self.nspec_write = 0
+        self.time_0      = datetime.datetime.now()
+        return
+
+    # end __init__
+
+    def output_fits_names(self, data_unit_name):
+        # return folder and file prefix for this data unit.
+        # Same naming as snana.exe with VERSION_REFORMAT_FITS:
+        #   [outdir]/[VERSION]/[VERSION]_HEAD.FITS.gz
+        config_data = self.config_data
+        folder = write_data_snana.output_data_folder_name(config_data,
+                                                          data_unit_name,
+                                                          False)
+        data_dir = f"{self.args.outdir_snana}/{folder}"
+        return folder, data_dir
+
+    # ========================================================
+    def init_head_columns(self, data_event_dict):
+
+        # define HEAD columns from the declared key lists (DATAKEY_LIST_RAW,
+        # _CALC, _PRIVATE and _SIM, with HOSTGAL2/3 neighbors as read by
+        # store_snana_hostgal), plus any other key in the first event.
+        # Each column is (key, fits_colname, tform). Events without a
+        # key get VAL_NULL; write_event_fits aborts if an event has a
+        # key that is neither declared nor in the first event.
+
+        key_list = []
+        for key in gpar.DATAKEY_LIST_RAW + gpar.DATAKEY_LIST_CALC + \
+                   gpar.DATAKEY_LIST_PRIVATE + gpar.DATAKEY_LIST_SIM :
+            key_list.append(key)
+            if key.startswith(f"{gpar.HOSTKEY_BASE}_") and \
+               key not in [ gpar.HOSTKEY_NMATCH, gpar.HOSTKEY_NMATCH2 ] :
+                key_list += [ util.key_hostgal_nbr(key,n) for n in [2,3] ]
+
+        # value from first event (if any) defines type of undeclared key;
+        # if a key is in more than one head dictionary, use the last one
+        # (as snana.exe does for TEXT files written in same order).
+        val_dict = {}
+        for src in self.HEAD_SOURCE_LIST :
+            head = data_event_dict.get(src) or {}
+            val_dict.update(head)
+        key_list += list(val_dict.keys())
+
+        private_set = set(gpar.DATAKEY_LIST_PRIVATE) | \
+                      set(data_event_dict.get('head_private') or {})
+
+        head_col_dict = {}
+        for key in dict.fromkeys(key_list) :
+            if key in self.HEADKEY_SKIP_LIST : continue
+            colname = self.HEADKEY_RENAME.get(key, key)
+            val     = val_dict.get(key)
+            if key in private_set :
+                form = gpar.FITS_TFORM_PRIVATE
+            elif colname in gpar.FITS_TFORM_HEAD :
+                form = gpar.FITS_TFORM_HEAD[colname]
+            elif isinstance(val, str) :
+                form = gpar.FITS_TFORM_STRING
+            else:
+                form = gpar.FITS_TFORM_DEFAULT
+            head_col_dict[colname] = (key, colname, form)
+
+        head_col_list = list(head_col_dict.values())
+        self.head_key_set     = set(key_list) | set(self.HEADKEY_SKIP_LIST)
+        self.head_private_set = private_set
+
+        # NOBS and PTROBS pointers come from the writer
+        for colname in [ gpar.DATAKEY_NOBS, 'PTROBS_MIN', 'PTROBS_MAX' ] :
+            form = gpar.FITS_TFORM_HEAD[colname]
+            head_col_list.append( (None, colname, form) )
+
+        self.head_col_list = head_col_list
+
+        # - - - - PHOT columns - - - - -
+        config_data   = self.config_data
+        phot_col_list = []
+        for varname, val_undef in zip(config_data['varlist_obs'],
+                                      config_data['vallist_undef']) :
+            form = gpar.FITS_TFORM_PHOT.get(varname, gpar.FITS_TFORM_DEFAULT)
+            phot_col_list.append( (varname, form, val_undef) )
+        self.phot_col_list = phot_col_list
+
+        return
+        # end init_head_columns
+
+    def open_data_unit(self, index_unit, data_unit_name):
+
+        # create fresh output folder and HEAD/PHOT tables for data unit
+        folder, data_dir = self.output_fits_names(data_unit_name)
+        if os.path.exists(data_dir):
+            shutil.rmtree(data_dir)   # remove output from previous job
+        util.create_output_folder(data_dir)
+
+        logging.info(f" Open FITS tables for {folder}")
+
+        prefix     = f"{data_dir}/{folder}"
+        head_names = [ c[1] for c in self.head_col_list ]
+        head_forms = [ c[2] for c in self.head_col_list ]
+        phot_names = [ c[0] for c in self.phot_col_list ]
+        phot_forms = [ c[1] for c in self.phot_col_list ]
+
+        self.table_list[index_unit] = {
+            'HEAD' : fitsTable('Header', head_names, head_forms,
+                               f"{prefix}_HEAD.body", True),
+            'PHOT' : fitsTable('Photometry', phot_names, phot_forms,
+                               f"{prefix}_PHOT.body", False),
+            'SPEC' : None,   # created if there are spectra
+            'SPECFLUX' : None
+        }
+        return
+        # end open_data_unit
+
+    def open_spec_tables(self, tables, data_unit_name):
+        folder, data_dir = self.output_fits_names(data_unit_name)
+        prefix = f"{data_dir}/{folder}"
+        tables['SPEC'] = fitsTable('SPECTRO_HEADER',
+                                   gpar.FITS_SPEC_HEADER_COLUMNS,
+                                   gpar.FITS_SPEC_HEADER_FORMS,
+                                   f"{prefix}_SPEC.body", True)
+        tables['SPECFLUX'] = fitsTable('SPECTRO_FLUX',
+                                       gpar.FITS_SPEC_FLUX_COLUMNS,
+                                       gpar.FITS_SPEC_FLUX_FORMS,
+                                       f"{prefix}_SPECFLUX.body", False)
+        return
+
+    # ========================================================
+    def write_event_fits(self, data_event_dict):
+
+        # append one event to HEAD, PHOT (and SPEC) tables of its data unit
+
+        index_unit     = data_event_dict['index_unit']
+        data_unit_name = data_event_dict['data_unit_name']
+
+        if self.head_col_list is None :
+            self.init_head_columns(data_event_dict)
+
+        if self.table_list[index_unit] is None :
+            self.open_data_unit(index_unit, data_unit_name)
+
+        tables    = self.table_list[index_unit]
+        head_raw  = data_event_dict['head_raw']
+        phot_raw  = data_event_dict['phot_raw']
+        NOBS      = phot_raw[gpar.DATAKEY_NOBS]
+
+        # - - - PHOT - - - -
+        # pointers are 1-based rows of PHOT table
+        PTROBS_MIN = tables['PHOT'].nrow + 1
+        PTROBS_MAX = PTROBS_MIN - 1 + NOBS
+        self.append_phot(tables['PHOT'], head_raw, phot_raw)
+
+        # - - - HEAD - - - -
+        self.check_head_keys(data_event_dict)
+        head_list = [ data_event_dict[src] for src in self.HEAD_SOURCE_LIST
+                      if data_event_dict.get(src) ]
+        row = {}
+        for key, colname, form in self.head_col_list:
+            if key is None : continue
+            val = gpar.VAL_NULL
+            for head in head_list:
+                if key in head : val = head[key]   # last dictionary wins
+            if val is None :  val = gpar.VAL_NULL
+            if 'A' in form :  val = str(val)
+            row[colname] = val
+
+        row[gpar.DATAKEY_NOBS] = NOBS
+        row['PTROBS_MIN']      = PTROBS_MIN
+        row['PTROBS_MAX']      = PTROBS_MAX
+        tables['HEAD'].append_row(row)
+
+        # - - - SPEC - - - -
+        spec_raw = data_event_dict.get('spec_raw',{})
+        if len(spec_raw) > 0 :
+            if tables['SPEC'] is None :
+                self.open_spec_tables(tables, data_unit_name)
+            self.append_spec(tables, head_raw, spec_raw)
+
+        self.nevt_write += 1
+        self.nobs_write += NOBS
+        return
+        # end write_event_fits
+
+    def check_head_keys(self, data_event_dict):
+
+        # abort if event has HEAD key that is not declared in the
+        # DATAKEY lists and not in the first event (no HEAD column);
+        # missing keys are written as VAL_NULL.
+        for src in self.HEAD_SOURCE_LIST :
+            head = data_event_dict.get(src)
+            if not head : continue
+            key_new = head.keys() - self.head_key_set
+            if len(key_new) == 0 : continue
+            snid   = data_event_dict['head_raw'].get(gpar.DATAKEY_SNID)
+            msgerr = []
+            msgerr.append(f"{src} key(s) {sorted(key_new)} for SNID={snid}")
+            msgerr.append(f"are not declared in DATAKEY lists and not " \
+                          f"in first event.")
+            util.log_assert(False,msgerr)
+        return
+        # end check_head_keys
+
+    def append_phot(self, table, head_raw, phot_raw):
+
+        # append NOBS rows + end-of-event row for one event
+        NOBS    = phot_raw[gpar.DATAKEY_NOBS]
+        EOE     = gpar.FITS_EOE_MARKER
+        col_dict = {}
+
+        for varname, form, val_undef in self.phot_col_list :
+            vals = phot_raw[varname]
+            if not isinstance(vals, np.ndarray) or vals.dtype == object :
+                vals = [ val_undef if v is None else v for v in vals ]
+
+            if varname == gpar.DATAKEY_BAND :
+                write_data_snana.check_band_list(head_raw, vals)
+
+            # end-of-event value
+            if varname in gpar.FITS_EOE_VALUES :
+                val_eoe = gpar.FITS_EOE_VALUES[varname]
+            elif 'A' in form :
+                val_eoe = ''
+            else:
+                val_eoe = 0
+
+            col = np.empty(NOBS+1, dtype=table.dtype[varname])
+            col[:NOBS] = vals
+            col[NOBS]  = val_eoe
+            col_dict[varname] = col
+
+        table.append_block(col_dict, NOBS+1)
+        return
+        # end append_phot
+
+    def append_spec(self, tables, head_raw, spec_raw):
+
+        SNID = str(head_raw[gpar.DATAKEY_SNID])
+        table_head = tables['SPEC']
+        table_flux = tables['SPECFLUX']
+
+        for mjd, spec_data in spec_raw.items():
+            wave_list = np.asarray(spec_data['wave'])
+            nblam     = len(wave_list)
+            wave_min_list, wave_max_list = \
+                write_data_snana.get_spec_lam_bins(wave_list)
+
+            PTRSPEC_MIN = table_flux.nrow + 1
+            PTRSPEC_MAX = PTRSPEC_MIN - 1 + nblam
+
+            row = {
+                'SNID'        : SNID,
+                'MJD'         : mjd,
+                'Texpose'     : gpar.VAL_NULL,
+                'INSTRUMENT'  : '',
+                'NBIN_LAM'    : nblam,
+                'PTRSPEC_MIN' : PTRSPEC_MIN,
+                'PTRSPEC_MAX' : PTRSPEC_MAX
+            }
+            table_head.append_row(row)
+
+            col_dict = {
+                'LAMMIN'  : wave_min_list,
+                'LAMMAX'  : wave_max_list,
+                'FLAM'    : np.asarray(spec_data['flux']),
+                'FLAMERR' : np.asarray(spec_data['fluxerr'])
+            }
+            table_flux.append_block(col_dict, nblam)
+            self.nspec_write += 1
+
+        return
+        # end append_spec
+
+    # ========================================================
+    def get_primary_header(self, folder, tables, is_head):
+
+        # global header keys read by SNANA FITS reader
+        args        = self.args
+        config_data = self.config_data
+        survey      = args.survey
+
+        datatype = 'DATA'
+        if gpar.VARNAME_TRUEMAG in config_data['varlist_obs'] :
+            datatype = 'SIM_MAGOBS'
+
+        header = fits.PrimaryHDU().header
+        set_header_key(header, 'CODE_IVERSION', gpar.FITS_CODE_IVERSION,
+                       'Internal SNFTSIO code version')
+        set_header_key(header, 'SURVEY', survey, 'Survey')
+        set_header_key(header, 'SUBSURVEY_FLAG', 0, 'SUBSURVEY_FLAG')
+        set_header_key(header, 'MWEBV_APPLYFLAG', 0,
+                       '1 -> Apply MWEBV cor to FLUXCAL')
+        set_header_key(header, 'ATMOS_FLAG', 0,
+                       '1 -> dRA,dDEC,dMAG per obs (for DCR)')
+        set_header_key(header, 'PHOTFLAG_DETECT', args.photflag_detect,
+                       'PHOTFLAG mask for detection')
+        set_header_key(header, 'FILTERS', gpar.SURVEY_INFO['FILTERS'][survey],
+                       'List of Filters')
+        set_header_key(header, 'VERSION', folder, 'Photometry Version')
+        set_header_key(header, 'PHOTFILE', f"{folder}_PHOT.FITS",
+                       'Photometry FITS file')
+        if tables['SPEC'] is not None :
+            set_header_key(header, 'SPECFILE', f"{folder}_SPEC.FITS",
+                           'Spectra FITS file')
+
+        if is_head :
+            # private variables and zphot quantiles
+            private_list = [ c[1] for c in self.head_col_list
+                             if c[0] in self.head_private_set ]
+            set_header_key(header, 'NPRIVATE', len(private_list),
+                           'Number of private variables')
+            for ivar, name in enumerate(private_list, start=1):
+                set_header_key(header, f"PRIVATE{ivar}", name,
+                               'name of private variable')
+
+            prefix_q = f"{gpar.HOSTKEY_PREFIX_ZPHOT_Q}"
+            pct_list = [ int(c[1][len(prefix_q):])
+                         for c in self.head_col_list
+                         if c[1].startswith(prefix_q) and
+                            c[1][len(prefix_q):].isdigit() ]
+            if len(pct_list) > 0 :
+                set_header_key(header, 'NZPHOT_Q', len(pct_list),
+                               'number of zphot quantiles')
+                for iq, pct in enumerate(pct_list):
+                    set_header_key(header, f"PERCENTILE_ZPHOT_Q{iq:02d}", pct,
+                                   'zphot percentile')
+
+        set_header_key(header, 'DATATYPE', datatype, 'data type')
+        return header
+        # end get_primary_header
+
+    def end_write(self, index_unit):
+
+        # write FITS files and aux files (LIST, README, IGNORE)
+        # for this data unit.
+
+        tables = self.table_list[index_unit]
+        if tables is None : return
+
+        args              = self.args
+        name_list         = self.config_data['data_unit_name_list']
+        readme_stats_list = self.config_data['readme_stats_list']
+        name              = name_list[index_unit]
+        folder, data_dir  = self.output_fits_names(name)
+        prefix            = f"{data_dir}/{folder}"
+
+        nevt = tables['HEAD'].nrow
+        logging.info(f" Write FITS files for {folder}  (NEVT={nevt})")
+
+        file_list = [
+            ('HEAD', [tables['HEAD']] ),
+            ('PHOT', [tables['PHOT']] )
+        ]
+        if tables['SPEC'] is not None :
+            file_list.append( ('SPEC', [tables['SPEC'], tables['SPECFLUX']]) )
+
+        for ftype, table_list in file_list :
+            fits_file_gz = f"{prefix}_{ftype}.FITS.gz"
+            header = self.get_primary_header(folder, tables, ftype=='HEAD')
+            write_fits_file_gz(fits_file_gz, header, table_list)
+
+        # - - - - aux files - - - -
+        with open(f"{prefix}.LIST","wt") as f:
+            f.write(f"{folder}_HEAD.FITS\n")
+
+        with open(f"{prefix}.IGNORE","wt") as f:
+            f.write(f"         CID      MJD     FILTER\n")
+            f.write(f"\nTotal number of IGNORE epochs:     0\n")
+
+        readme_dict = {
+            'readme_file'  : f"{prefix}.README",
+            'readme_stats' : readme_stats_list[index_unit],
+            'data_format'  : gpar.FORMAT_FITS,
+            'docana_flag'  : True
+        }
+        util.write_readme(args, readme_dict)
+
+        self.table_list[index_unit] = None
+
+        time_dif = (datetime.datetime.now() - self.time_0).total_seconds()
+        logging.info(f"\t fits-write summary: {self.nevt_write} events, "
+                     f"{self.nobs_write} obs, {self.nspec_write} spectra "
+                     f"({time_dif:.0f} sec)")
+        return
+        # end end_write
+
+    # end fitsWriter
+
+# end:
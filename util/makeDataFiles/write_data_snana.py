@@ -3,8 +3,12 @@
 #
 # Jun 24 2022 RK - avoid writing HOSTGAL2_MAG[ERR] of there is no 2nd host.
 # Jan 16 2025 RK - write directly to gzip file and skip unix gzip
+# Oct 2026: move LAMMIN/LAMMAX calc into get_spec_lam_bins (shared with
+#           direct FITS writer in write_data_fits.py)
+# Oct 2026: format OBS block per event instead of per value (write_phot_snana)
 
 import os, sys, gzip, glob, yaml, shutil, subprocess, logging, math, datetime
+import itertools
 import numpy as np
 
 import makeDataFiles_params as gpar
@@ -184,14 +188,15 @@ def write_phot_snana(f, head_raw, phot_raw, config_data):
 
     # write photometry (phot_raw) in SNANA format to text file
     # poitner f.
+    # Oct 2026: format entire OBS block from column lists with one
+    #   printf-style format string (one line template per obs), and
+    #   write with one call. Undefined (None) values are replaced with
+    #   a mask per column, and bands are checked once per unique band.
     nvar_obs      = config_data['nvar_obs']
     varlist_obs   = config_data['varlist_obs']
     varlist_fmt   = config_data['varlist_fmt']
     vallist_undef = config_data['vallist_undef']
     varstring_obs = ' '.join(varlist_obs)
-    msgerr   = []
-    SNID     = head_raw[gpar.DATAKEY_SNID]
-    FILTERS  = head_raw[gpar.DATAKEY_FILTERS]
     NOBS     = phot_raw[gpar.DATAKEY_NOBS]
 
     f.write(f"\n# -------------------------------------- \n" \
@@ -199,30 +204,21 @@ def write_phot_snana(f, head_raw, phot_raw, config_data):
     f.write(f"NOBS: {NOBS}\nNVAR: {nvar_obs} \n"
             f"VARLIST: {varstring_obs}\n")
 
-    for obs in range(0,NOBS):
-        LINE = "OBS:"
-        for varname,fmt,val_undef in \
-            zip(varlist_obs,varlist_fmt,vallist_undef):
-            val = phot_raw[varname][obs]
-            if val == None:  val = val_undef
-
-            # xxxxxxxx mark delete Jan 16 2024 xxxxxxx
-            #if val == 12345.333 :  # gpar.VAL_ABORT :  # problem for DES??
-            #    msgerr.append(f"Missing required PHOT column {varname}")
-            #    msgerr.append(f"Check SNID = {SNID}")
-            #    util.log_assert(False,msgerr)
-            # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
-            
-            if varname == 'BAND' :
-                band = val[-1]
-                if band not in FILTERS:
-                    msgerr.append(f"Unknown band {band} is not in "\
-                                  f"{FILTERS} for SNID={SNID}")
-                    msgerr.append(f"Check SURVEY_INFO[FILTERS] ")
-                    util.log_assert(False,msgerr)
+    if NOBS > 0 :
+        col_list = [ get_phot_column(phot_raw[varname], NOBS, val_undef)
+                     for varname, val_undef in zip(varlist_obs,vallist_undef) ]
 
-            LINE += f" {val:{fmt}}"
-        f.write(f"{LINE}\n")
+        if gpar.DATAKEY_BAND in varlist_obs :
+            k = varlist_obs.index(gpar.DATAKEY_BAND)
+            check_band_list(head_raw, col_list[k])
+
+        # e.g., "OBS: %10.4f %-2s %-8s ... \n" repeated NOBS times, filled
+        # by values in row order: obs0-var0, obs0-var1, ..., obs1-var0 ...
+        line_fmt   = "OBS:" + \
+                     ''.join([ f" {printf_fmt(fmt)}" for fmt in varlist_fmt ])
+        block_fmt  = f"{line_fmt}\n" * NOBS
+        row_values = tuple(itertools.chain.from_iterable(zip(*col_list)))
+        f.write(block_fmt % row_values)
 
     # - - - - -
     f.write(f"END:\n")
@@ -230,6 +226,46 @@ def write_phot_snana(f, head_raw, phot_raw, config_data):
 
     # end write_phot_snana
 
+def get_phot_column(vals, NOBS, val_undef):
+
+    # return list of NOBS values for one PHOT column, with undefined
+    # (None) values replaced by val_undef.
+    if isinstance(vals, np.ndarray) and vals.dtype != object :
+        return vals[:NOBS].tolist()   # numeric/string array: no None
+
+    col  = np.array(vals[:NOBS], dtype=object)
+    mask = np.equal(col, None)
+    if mask.any():
+        col[mask] = val_undef
+    return col.tolist()
+
+    # end get_phot_column
+
+def printf_fmt(fmt):
+    # translate python format spec (e.g., 10.4f, 2s) to printf style;
+    # strings are left-justified to match f"{val:2s}"
+    if fmt.endswith('s'):
+        return f"%-{fmt}"
+    return f"%{fmt}"
+    # end printf_fmt
+
+def check_band_list(head_raw, band_list):
+
+    # abort if last char of any band is not in FILTERS;
+    # check each unique band only once.
+    FILTERS  = head_raw[gpar.DATAKEY_FILTERS]
+    bad_list = sorted([ str(b) for b in set(band_list)
+                        if str(b)[-1] not in FILTERS ])
+    if len(bad_list) > 0 :
+        SNID   = head_raw[gpar.DATAKEY_SNID]
+        msgerr = []
+        msgerr.append(f"Unknown band(s) {bad_list} are not in "\
+                      f"{FILTERS} for SNID={SNID}")
+        msgerr.append(f"Check SURVEY_INFO[FILTERS] ")
+        util.log_assert(False,msgerr)
+    return
+    # end check_band_list
+
 
 def write_spec_snana(f, head_raw, spec_raw):
     SNID     = head_raw[gpar.DATAKEY_SNID]
@@ -253,12 +289,7 @@ def write_spec_snana(f, head_raw, spec_raw):
         ID    += 1
         nblam  = len(wave_list)
 
-        wave_diff_list  = np.diff(wave_list)
-        diff_last       = wave_diff_list[nblam-2]
-        wave_diff_list  = np.append(wave_diff_list,diff_last)
-
-        wave_min_list   = wave_list - wave_diff_list/2.0
-        wave_max_list   = wave_list + wave_diff_list/2.0
+        wave_min_list, wave_max_list = get_spec_lam_bins(wave_list)
 
         f.write(f"SPECTRUM_ID:    {ID} \n")
         f.write(f"SPECTRUM_MJD:   {mjd:.3f} \n")
@@ -275,6 +306,21 @@ def write_spec_snana(f, head_raw, spec_raw):
 
     # end write_spec_snana
 
+def get_spec_lam_bins(wave_list):
+
+    # return LAMMIN and LAMMAX lists for each wavelength bin center
+    # in wave_list; last bin uses same width as previous bin.
+    nblam           = len(wave_list)
+    wave_diff_list  = np.diff(wave_list)
+    diff_last       = wave_diff_list[nblam-2]
+    wave_diff_list  = np.append(wave_diff_list,diff_last)
+
+    wave_min_list   = wave_list - wave_diff_list/2.0
+    wave_max_list   = wave_list + wave_diff_list/2.0
+    return wave_min_list, wave_max_list
+
+    # end get_spec_lam_bins
+
 def output_data_folder_name(config_data, data_unit_name, ISTEXT):
 
     prefix              = config_data['data_folder_prefix']
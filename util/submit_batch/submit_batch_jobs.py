@@ -22,6 +22,7 @@
 # May 22 2023: add train_BAYESN class
 # Jan 17 2023: new option --cpu_sum
 # May 07 2024: add heatmaps to purge list.
+# Oct 2026: new option --timeline OUTDIR1 [OUTDIR2 ...]
 #
 # - - - - - - - - - -
 
@@ -92,6 +93,11 @@ def get_args():
     msg = f"Diagnostic: Sum all CPU under current dir"
     parser.add_argument("--cpu_sum", help=msg, action="store_true")
 
+    msg = f"Diagnostic: convert {TIMELINE_FILE} under OUTDIR(s) to " \
+          f"{TIMELINE_TRACE_FILE} and {TIMELINE_SUMMARY_FILE}"
+    parser.add_argument("--timeline", nargs='+', help=msg, type=str,
+                        default=None )
+
     # - - -
     msg = "increase output verbosity (default=True)"
     parser.add_argument("-v", "--verbose", help=msg, action="store_true")
@@ -468,6 +474,10 @@ if __name__ == "__main__":
         print_cpu_sum()
         sys.exit(' Done with summing CPU times.')
 
+    if args.timeline :
+        util.write_timeline_trace(args.timeline)
+        sys.exit(' Done with timeline trace.')
+
     # check input file: does it have a path?
     check_input_file_name(args)
 
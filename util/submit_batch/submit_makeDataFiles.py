@@ -576,6 +576,8 @@ class MakeDataFiles(Program):
 
         # init outputs of function
         n_state_change     = 0
+        # Oct 2026: one directory read for all state checks below
+        snapshot = util.get_dir_snapshot(script_dir)
         row_list_merge_new = []
         row_list_merge     = MERGE_INFO_CONTENTS[TABLE_MERGE]
 
@@ -619,7 +621,8 @@ class MakeDataFiles(Program):
 
                 # get list of LOG, DONE, and YAML files
                 log_list, done_list, yaml_list = \
-                    util.get_file_lists_wildcard(script_dir,search_wildcard)
+                    util.get_file_lists_wildcard(script_dir,search_wildcard,
+                                                 snapshot=snapshot)
 
                 # careful to sum only the files that are NOT None
                 NLOG   = sum(x is not None for x in log_list)
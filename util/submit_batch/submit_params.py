@@ -104,6 +104,38 @@ SUFFIX_COV    = "COV"
 MERGE_LOG_FILE         = "MERGE.LOG"
 MERGE_wfit_LOG_FILE    = "MERGE_wfit.LOG"  # only for BBC's wfit afterburner
 SUBMIT_INFO_FILE  = "SUBMIT.INFO"
+
+# file suffixes indexed by get_dir_snapshot for merge_update_state (Oct 2026)
+SUFFIX_SNAPSHOT_LIST = ( '.LOG', '.DONE', '.YAML' )
+
+# opt-in memoization of split jobs (Oct 2026); CONFIG key JOB_CACHE_DIR.
+KEY_JOB_CACHE_DIR        = "JOB_CACHE_DIR"
+JOB_CACHE_DONE_FILE      = "JOB_CACHE.DONE"
+JOB_CACHE_NBYTE_CONTENT  = 50*1024*1024  # larger files keyed on size+mtime
+
+# cache of parsed split-job YAML files (Oct 2026)
+JOB_YAML_CACHE_FILE = "JOB_YAML_CACHE.pkl"
+NTHREAD_YAML_READ   = min(16, os.cpu_count() or 1)  # see extract_yaml_list
+
+# sim data movement (Oct 2026): FITS gzip + manifest run in a background
+# thread after merge lock is released; busy-file marks movement in progress.
+SUFFIX_MANIFEST          = "MANIFEST"
+PREFIX_MOVE_BUSY         = ".MOVE_BUSY"
+PREFIX_MOVE_FAIL         = ".MOVE_FAIL"  # error message from failed thread
+TMAX_WAIT_MOVE_BUSY      = 3600   # seconds
+
+# per-CPU sidecar with start/end time and CPU times (Oct 2026);
+# read by merge process for proc-time & efficiency summary in MERGE.LOG
+SUFFIX_PROCTIME = "PROCTIME"
+
+# timeline of state transitions (Oct 2026) and its converted outputs
+TIMELINE_FILE              = "TIMELINE.LOG"
+TIMELINE_TRACE_FILE        = "TIMELINE_TRACE.json"   # Chrome/Perfetto trace
+TIMELINE_SUMMARY_FILE      = "TIMELINE_SUMMARY.csv"
+TIMELINE_EVENT_SUBMIT      = "SUBMIT"
+TIMELINE_EVENT_STATE       = "STATE"
+TIMELINE_EVENT_MERGE_BEGIN = "MERGE_BEGIN"
+TIMELINE_EVENT_MERGE_END   = "MERGE_END"
 TABLE_SPLIT       = "SPLIT"  # yaml table in MERGE.LOG
 TABLE_MERGE       = "MERGE"  # yaml table in MERGE.LOG
 TABLE_EXTRA       = "EXTRA"  # do global overwrite on this name
@@ -151,6 +183,30 @@ TMAX_EXE_WAIT_ABORT = 600  # max wait for binary exe to exist (in case of make)
 
 KEY_END_YAML = "#END_YAML"
 
+# native merge of split TEXT tables (Oct 2026)
+BUFSIZE_MERGE_TABLE    = 8*1024*1024  # read/write buffer size (bytes)
+NQUEUE_MERGE_TABLE     = 8            # max chunks waiting for gzip thread
+GZIP_LEVEL_MERGE_TABLE = 6            # compress level for gzip twin
+COLUMNAR_FORMAT_PARQUET = "PARQUET"
+COLUMNAR_FORMAT_FEATHER = "FEATHER"
+COLUMNAR_FORMAT_LIST    = [ COLUMNAR_FORMAT_PARQUET, COLUMNAR_FORMAT_FEATHER ]
+
+# compression service (Oct 2026): gzip level per artifact class.
+# Levels can be changed with CONFIG key GZIP_LEVEL; e.g.,
+#   GZIP_LEVEL:  { FITS: 4, LOG: 1 }
+GZIP_CLASS_TABLE  = "TABLE"   # FITRES, M0DIF, DUMP ... text tables
+GZIP_CLASS_FITS   = "FITS"    # sim data files
+GZIP_CLASS_TAR    = "TAR"     # tar files from compress_files/compress_subdir
+GZIP_CLASS_LOG    = "LOG"     # log files
+GZIP_LEVEL_DICT   = { GZIP_CLASS_TABLE: 6, GZIP_CLASS_FITS: 6,
+                      GZIP_CLASS_TAR:   6, GZIP_CLASS_LOG:  1 }
+NTHREAD_GZIP_POOL = min(8, os.cpu_count() or 1)  # threads in gzip pool
+KEY_GZIP_LEVEL    = "GZIP_LEVEL"
+
+# native FITRES catenation (same conventions as SALT2mu cat_only)
+NULLVAL_CAT_FITRES   = "-9.0"                         # fill missing column
+VARNAMES_BBC_RECYCLE = [ 'CUTMASK', 'MU', 'MUMODEL' ]   # chop BBC-appended vars
+
 # either of these keys allowed in CONFIG
 CONFIG_KEYLIST_DONE_FILE = [ 'DONE_STAMP', 'DONE_STAMP_FILE' ]
 DEFAULT_DONE_FILE = "ALL.DONE"  # default if DONE_STAMP not in CONFIG
@@ -248,6 +304,9 @@ CONFIG:
   # default ALL.DONE is created under OUTDIR; here can specify
   # an optional/additionl done file anywhere
   DONE_STAMP_FILE: $MYPATH/PIPE_STAGE4.DONE
+
+  # optional gzip level (1-9) per class: TABLE, FITS, TAR, LOG
+  GZIP_LEVEL:  {{ FITS: 4, LOG: 1 }}
 """
 
 
@@ -275,6 +334,8 @@ HELP_CONFIG_SIM =  f"""
   NGEN_UNIT:   0.5   # 0.5 x NGENTOT_LC computed from
   RANGE(z,PKMJD) \n\t\t\t and SOLID_ANGLE
     (if no NGEN_UNIT, use NGENTOT_LC from sim-input or from GENOPT)
+  RATECALC_CACHE_DIR: $SCRATCH/SIMNORM_CACHE  # reuse NGEN_UNIT rate calc
+                      # if sim-input, INCLUDE and GENOPT are unchanged
   GENPREFIX:    DES  # out_file name prefix (please keep it short)
                      # and default log dir is SIMLOGS_[GENPREFIX]
   LOGDIR:   MY_LOGS  # override default SIMLOGS_[GENPREFIX]
@@ -427,6 +488,14 @@ HELP_CONFIG_LCFIT = f"""
   APPEND_TABLE_TEXTFILE:  APPEND1.FITRES APPEND2.FITRES APPEND3.FITRES
   #  (accepts comma-sep or space sep list of files)
 
+  # optional columnar twin of each merged FITRES table (requires pyarrow),
+  # e.g., FITOPT000.FITRES.parquet next to FITOPT000.FITRES.gz
+  MERGE_TABLE_COLUMNAR: PARQUET     # or FEATHER
+
+  # optional cache of finished split jobs; re-submits reuse (copy) the
+  # output of jobs with unchanged code, arguments, input files and data.
+  JOB_CACHE_DIR: $SCRATCH/JOB_CACHE
+
   # debug options to force failure in table-merge:
   FORCE_MERGE_TABLE_MISSING(HBOOK):  force missing HBOOK merge
   - DES_TEST1_FITOPT001
@@ -606,6 +675,14 @@ HELP_CONFIG_BBC = f"""
   # --ignore_fitopt or --ignore_muopt.  However, "FITOPTxMUOPT: 0&0" is
   # equivalent to setting both with "--ignore_fitopt --ignore_muopt"
 
+  # optional cache of finished BBC jobs; re-submits reuse (copy) the
+  # output of jobs with unchanged code, arguments and input files.
+  JOB_CACHE_DIR: $SCRATCH/JOB_CACHE
+
+  # optional cache of catenated INPUT_FITOPT*.FITRES.gz files; re-submits
+  # with unchanged input FITRES files reuse (hard link) the cached files.
+  CAT_FITRES_CACHE_DIR: $SCRATCH/BBC_CAT_CACHE
+
   # process independent random sum-samples; useful to compare RMS vs. errors.
   # Be careful that every VERSION+FITOPT+MUOPT is divided into NSPLITRAN jobs.
   NSPLITRAN: <nsplitran>
@@ -682,6 +759,12 @@ HELP_CONFIG_COVMAT = f"""
   - /REBIN_2x4/  --nbin_x1 2 --nbin_c 4
   - /REBIN_4x8/  --nbin_x1 4 --nbin_c 8
 
+  # Optional batch mode: each CPU runs one {PROGRAM_NAME_COVMAT} process 
+  # that imports python modules once and processes a queue of covmat tasks;
+  # all COVMATOPTs for a BBC subdir are in the same queue so that each 
+  # M0DIF/FITRES file is parsed once. Default is one process per task.
+  COVMAT_BATCH_MODE: True
+
   # To test with fewer jobs, this optional key selects strings to match the
   # version-subdir names. In this example, 11 version-subdirs are selected;
   # 0003 and 0030-0039.
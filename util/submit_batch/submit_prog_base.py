@@ -40,6 +40,16 @@
 # Feb 16 2025: fix kill-job logic to work properly when first iteration BBC job fails,
 #              so that both iterations are stopped and produce STOP in ALL.DONE file.
 #
+# Oct 2026: append timestamped submit/merge/state events to TIMELINE.LOG;
+#           see --timeline option to convert to Chrome trace + CSV summary.
+# Oct 2026: optional CONFIG key JOB_CACHE_DIR to reuse output of unchanged
+#           split jobs (see set_job_cache); used by LCFIT and BBC.
+# Oct 2026: optional CONFIG key GZIP_LEVEL sets gzip level per artifact class
+#           for the parallel gzip service (util.gzip_files).
+# Oct 2026: each CPU*.CMD writes start/end/CPU times to CPU*.PROCTIME sidecar;
+#           get_proctime_info reads these instead of scanning CPU*.LOG files,
+#           and reports pending, run-time, load-balance and CPU efficiency.
+#
 # ============================================
 
 #import argparse
@@ -73,6 +83,9 @@ class Program:
         CONFIG = config_yaml['CONFIG']
         if 'JOBNAME' in CONFIG :
             config_prep['program'] = CONFIG['JOBNAME']
+
+        # optional gzip level per artifact class (Oct 2026)
+        util.set_gzip_level(CONFIG.get(KEY_GZIP_LEVEL,None))
             
         config_prep['snana_version'] = util.get_snana_version()
         
@@ -541,6 +554,7 @@ class Program:
             COMMAND_FILE  = f"{script_dir}/{command_file}"
             done_file     = f"{prefix}.DONE"
             DONE_FILE     = f"{script_dir}/{done_file}"
+            PROCTIME_FILE = f"{script_dir}/{prefix}.{SUFFIX_PROCTIME}"
 
             logging.info(f"\t Create {command_file}")
 
@@ -575,6 +589,8 @@ class Program:
 
                 # print actual start time for this batch job
                 f.write(f"echo TIME_START:  {ECHO_TIME}\n")
+                f.write(f"echo \"TIME_START: {ECHO_TIME}\" > " \
+                        f"{PROCTIME_FILE}\n")
 
                 # set ENV for global/uniform start time that propagates
                 # into all sim-output READMEs. 
@@ -620,9 +636,16 @@ class Program:
                 else:
                     n_core_with_jobs += 1
 
+                # end time and CPU times (user,sys for shell & children)
+                # for proc-time summary
+                f.write(f"\necho \"TIME_END:   {ECHO_TIME}\" >> " \
+                        f"{PROCTIME_FILE}\n")
+                f.write(f"echo -n 'CPU_TIMES:  ' >> {PROCTIME_FILE}\n")
+                f.write(f"times >> {PROCTIME_FILE}\n")
+
                 # create CPU*DONE file to make clear that all tasks
                 # for this core have run
-                f.write(f"\ntouch {DONE_FILE}\n") 
+                f.write(f"touch {DONE_FILE}\n") 
 
             # - - - - - 
             # write extra batch file for batch mode
@@ -1132,6 +1155,7 @@ class Program:
         # submit all the jobs; either batch or ssh
         submit_mode    = self.config_prep['submit_mode']
         script_dir     = self.config_prep['script_dir']
+        output_dir     = self.config_prep['output_dir']
         cddir          = f"cd {script_dir}"
         
         if check_abort :
@@ -1149,8 +1173,10 @@ class Program:
             nslurm_submit    = 0
             slurm_pid_list = [] ; slurm_job_name_list = []
             nbatch  = len(batch_file_list)
+            n_core            = self.config_prep['n_core']
+            batch_single_node = self.config_prep['batch_single_node']
 
-            for batch_file in batch_file_list :
+            for ibatch, batch_file in enumerate(batch_file_list) :
                 batch_command_list = batch_command.split()
                 batch_command_list.append(batch_file)
                 logging.info(f"\t Launch {batch_file} ... ")
@@ -1158,6 +1184,15 @@ class Program:
                 ret = subprocess.run( batch_command_list, 
                                       cwd=script_dir,
                                       capture_output=True, text=True )
+                # one launch event per CPU so that queue time is 
+                # measured from the launch of the CPU running each job
+                if batch_single_node :
+                    icpu_list = list(range(0,n_core))
+                else:
+                    icpu_list = [ ibatch ]
+                util.append_timeline(output_dir, 
+                    [ (TIMELINE_EVENT_SUBMIT, 'BATCH', f"CPU{icpu:04d}", 
+                       batch_file) for icpu in icpu_list ] )
 
                 # update slurm pid list every 10 submits in case some
                 # tasks finish before all jobs are launched.
@@ -1200,6 +1235,8 @@ class Program:
                 ret = subprocess.Popen(["ssh", "-x", node, cmd_source ],
                                        stdout = subprocess.PIPE,
                                        stderr = subprocess.PIPE)
+                util.append_timeline(output_dir, [ (TIMELINE_EVENT_SUBMIT,
+                                     'SSH', f"CPU{inode:04d}", node) ] )
 
         # check to launch background merge process (Dec 2021)
         if args.merge_background :
@@ -1492,6 +1529,15 @@ class Program:
         # set busy lock file to prevent a simultaneous  merge task
         self.set_merge_busy_lock(+1,t_merge_start)
 
+        # Oct 2026: record merge process and state transitions in timeline
+        cpu_name = f"CPU{cpunum:04d}" if cpunum is not None else "CPU"
+        use_timeline = not check_abort
+        if use_timeline:
+            util.append_timeline(output_dir, [ (TIMELINE_EVENT_MERGE_BEGIN,
+                                 'MERGE', cpu_name, '-') ] )
+            # log_assert closes this merge with FAIL state on abort
+            self.config_prep['timeline_merge_cpu'] = cpu_name
+
         # read status from MERGE file. There is one comment line above
         # each table to provide a human-readable header. The remaining
         # comments after the tables are probably merge-abort messages; 
@@ -1510,6 +1556,8 @@ class Program:
         # make boolean list of which MERGED processes have already finished;
         # below will check which processes are newly DONE.
         done_list_start = self.get_merge_done_list(3,MERGE_INFO_CONTENTS)
+        if use_timeline:
+            state_start = util.get_timeline_states(MERGE_INFO_CONTENTS)
 
         # check for changes in state for SPLIT and MERGE tables.
         # function returns updated set of SPLIT and MERGE table rows.
@@ -1517,6 +1565,17 @@ class Program:
         row_list_dict, n_change = \
             self.merge_update_state(MERGE_INFO_CONTENTS)
 
+        if use_timeline:
+            table_names = row_list_dict.get('table_names',
+                                            [TABLE_SPLIT, TABLE_MERGE])
+            rows_end    = { TABLE_SPLIT : row_list_dict['row_split_list'],
+                            TABLE_MERGE : row_list_dict['row_merge_list'] }
+            if len(table_names) > 2 :
+                rows_end[table_names[2]] = row_list_dict['row_extra_list']
+            state_end   = util.get_timeline_states(rows_end)
+            util.append_timeline(output_dir, 
+                util.get_timeline_transitions(state_start, state_end) )
+
         row_split_list = row_list_dict['row_split_list'] # optional
         row_merge_list = row_list_dict['row_merge_list'] # required
         row_extra_list = row_list_dict['row_extra_list'] # optional
@@ -1608,6 +1667,9 @@ class Program:
         if verbose_flag:
             logging.info(f"# {fnam}: finished {n_wrapup} wrapup tasks ")
 
+        # store parsed job-YAML cache for next merge process
+        util.save_yaml_cache()
+
         # Feb 2024: check kill_on_fail here in addition to check in CPU*.CMD
         if n_fail > 0 and submit_info_yaml['KILL_ON_FAIL'] :
             args.kill = True   # set flag as if -k were comman-line arg
@@ -1615,6 +1677,7 @@ class Program:
 
         # Only last merge process does cleanup tasks and DONE stamps
         if MERGE_LAST and n_done == n_job_merge :
+            util.remove_yaml_cache(output_dir)
             nfail_tot = self.failure_summary()
 
             if not check_abort :
@@ -1637,6 +1700,11 @@ class Program:
             logging.info(f"\n# {fnam}: finished with {STRING_STATUS}. " \
                          f"Bye Bye" )
 
+        if use_timeline:
+            util.append_timeline(output_dir, [ (TIMELINE_EVENT_MERGE_END,
+                                 'MERGE', cpu_name, SUBMIT_STATE_DONE) ] )
+            self.config_prep['timeline_merge_cpu'] = None
+
         # remove busy lock file
         self.set_merge_busy_lock(-1,t_merge_start)
     
@@ -2096,43 +2164,62 @@ class Program:
         msg_time.append(f"WALL_TIME:      {t_wall:.3f}  # {unit}  ")
 
         # - - - - - - - - 
-        # Read TIME_START value from each CPU*LOG file, and measure
-        # min & max time pending in batch queue. First or 2nd line of 
-        # CPU*LOG should be of the form
-        #         TIME_START: YYYY-MM-DD HH:MM:SS
-        # Ideally this key would be read as YAML file, but unfortunately
-        # the batch systems write non-YAML output at the top of the 
-        # CPU*LOG files. The TIME_START argument has to be read as a
-        # string and converted to a datetime object ... hence the ugly code.
-        cpu_wildcard  = "CPU*.LOG"
-        cpu_log_list  = sorted(glob.glob1(script_dir,cpu_wildcard))
+        # Oct 2026: read start/end times from small CPU*.PROCTIME sidecar 
+        # files written by each CPU*.CMD script. Pending time is
+        # TIME_START - submit time; run time is TIME_END - TIME_START, 
+        # or now - TIME_START if the CPU is still running (e.g., the
+        # CPU running this last merge process).
+        # For jobs submitted before sidecars existed, fall back to
+        # scanning CPU*.LOG files for TIME_START.
+        proctime_wildcard = f"CPU*.{SUFFIX_PROCTIME}"
+        proctime_list = sorted(glob.glob1(script_dir,proctime_wildcard))
         t_pend_list   = []
-        for cpu_log_file in cpu_log_list :            
-            LOG_FILE = f"{script_dir}/{cpu_log_file}"
-            found_time = False
-            #print(f" xxx -------------------------------------- ")
-            #print(f" xxx examine {cpu_log_file}")
-            with open(LOG_FILE,'r') as f :
-                for line in f :
-                    word_list = (line.rstrip("\n")).split()
-                    if len(word_list) == 0 : continue 
-                    key       = word_list[0]
-                    if key == "TIME_START:" :
-                        found_time       = True
-                        t_str            = f"{word_list[1]} {word_list[2]}"
-                        time_start_cpu   = \
-                            datetime.datetime.strptime(t_str, '%Y-%m-%d %H:%M:%S')  
-                        t_sec = (time_start_cpu - time_submit).total_seconds()
-                        t_sec         += 1.0  # avoid violating causality
-                        t_pend         = t_sec/t_unit
-                        t_pend_list.append(t_pend)
-                    if found_time : break
+        t_run_list    = []
+        t_run_end     = 0.0  # sum of run time for CPUs with TIME_END
+        cpu_sec_sum   = 0.0  # child-process CPU for CPUs with TIME_END
+        for proctime_file in proctime_list :
+            proctime = util.read_proctime_file(f"{script_dir}/{proctime_file}")
+            time_start_cpu = proctime['TIME_START']
+            time_end_cpu   = proctime['TIME_END']
+            if time_start_cpu is None : continue
+            t_sec = (time_start_cpu - time_submit).total_seconds()
+            t_sec += 1.0  # avoid violating causality
+            t_pend_list.append(t_sec/t_unit)
+
+            if time_end_cpu is None :
+                time_end_cpu = time_now
+            t_run = (time_end_cpu - time_start_cpu).total_seconds()/t_unit
+            t_run_list.append(t_run)
+            if proctime['CPU_SEC'] is not None :
+                t_run_end   += t_run
+                cpu_sec_sum += proctime['CPU_SEC']
+
+        if len(proctime_list) == 0 :
+            t_pend_list = self.get_time_pending_from_cpu_logs(time_submit,t_unit)
 
         if len(t_pend_list) > 0 :
             t_pend_min = min(t_pend_list)
             t_pend_max = max(t_pend_list)
+            t_pend_avg = sum(t_pend_list)/len(t_pend_list)
             msg_time.append(f"TMIN_PENDING:   {t_pend_min:.02f} ")
             msg_time.append(f"TMAX_PENDING:   {t_pend_max:.02f} ")
+            msg_time.append(f"TAVG_PENDING:   {t_pend_avg:.02f} ")
+
+        if len(t_run_list) > 0 :
+            t_run_max = max(t_run_list)
+            t_run_sum = sum(t_run_list)
+            msg_time.append(f"TMAX_RUN:       {t_run_max:.03f}  " \
+                            f"# max run time per core")
+            msg_time.append(f"TSUM_RUN:       {t_run_sum:.03f}  " \
+                            f"# sum of run time over cores")
+            if t_run_max > 0.0 :
+                eff_balance = t_run_sum / (len(t_run_list) * t_run_max)
+                msg_time.append(f"EFFIC_BALANCE:  {eff_balance:.3f}   " \
+                                f"# TSUM_RUN/(N_CORE*TMAX_RUN)")
+            if t_run_end > 0.0 :
+                eff_cpu_run = (cpu_sec_sum/t_unit) / t_run_end
+                msg_time.append(f"EFFIC_CPU_RUN:  {eff_cpu_run:.3f}   " \
+                                f"# CPU/T_run for finished cores")
 
         # - - - - - - - - 
         # if there is a CPU column, compute total CPU and avg CPU/core/T_wal
@@ -2157,6 +2244,46 @@ class Program:
 
         # end get_proctime_info
 
+    def get_time_pending_from_cpu_logs(self, time_submit, t_unit):
+
+        # Read TIME_START value from each CPU*LOG file, and return
+        # list of time pending in batch queue. First or 2nd line of 
+        # CPU*LOG should be of the form
+        #         TIME_START: YYYY-MM-DD HH:MM:SS
+        # Ideally this key would be read as YAML file, but unfortunately
+        # the batch systems write non-YAML output at the top of the 
+        # CPU*LOG files. The TIME_START argument has to be read as a
+        # string and converted to a datetime object ... hence the ugly code.
+        # Oct 2026: moved from get_proctime_info; only used for jobs
+        #           without CPU*.PROCTIME sidecar files.
+
+        submit_info_yaml  = self.config_prep['submit_info_yaml']
+        script_dir        = submit_info_yaml['SCRIPT_DIR'] 
+        cpu_wildcard  = "CPU*.LOG"
+        cpu_log_list  = sorted(glob.glob1(script_dir,cpu_wildcard))
+        t_pend_list   = []
+        for cpu_log_file in cpu_log_list :            
+            LOG_FILE = f"{script_dir}/{cpu_log_file}"
+            found_time = False
+            with open(LOG_FILE,'r') as f :
+                for line in f :
+                    word_list = (line.rstrip("\n")).split()
+                    if len(word_list) == 0 : continue 
+                    key       = word_list[0]
+                    if key == "TIME_START:" :
+                        found_time       = True
+                        t_str            = f"{word_list[1]} {word_list[2]}"
+                        time_start_cpu   = \
+                            datetime.datetime.strptime(t_str, '%Y-%m-%d %H:%M:%S')  
+                        t_sec = (time_start_cpu - time_submit).total_seconds()
+                        t_sec         += 1.0  # avoid violating causality
+                        t_pend         = t_sec/t_unit
+                        t_pend_list.append(t_pend)
+                    if found_time : break
+
+        return t_pend_list
+        # end get_time_pending_from_cpu_logs
+
     def check_file_exists(self,file_name,msg_user):
         # abort if file does not exist and use self.log_assert
         # that writes error message to MERGE.LOG and FAIL to done stamp
@@ -2487,6 +2614,7 @@ class Program:
         # extracted elsewhere .
         #
         # Feb 2025: check for BAD_OUTPUT key
+        # Oct 2026: read YAML via cache to avoid re-parsing unchanged files
 
         n_key              = len(yaml_key_list)
         n_split            = len(log_file_list)
@@ -2513,7 +2641,7 @@ class Program:
             YAML_FILE = f"{script_dir}/{yaml_file}"
 
             if os.path.isfile(YAML_FILE) :
-                stats_yaml       = util.extract_yaml(YAML_FILE, None, None )
+                stats_yaml       = util.read_yaml_cached(script_dir, yaml_file)
                 aiz              = stats_yaml[key_AIZ]                    # required key
                 bad              = stats_yaml.setdefault(key_BAD,False)   # optional key (Feb 2025)
 
@@ -2570,6 +2698,37 @@ class Program:
 
         # end get_job_stats
 
+    def set_job_cache(self, JOB_INFO, prefix, upstream_list):
+
+        # Created Oct 2026
+        # Opt-in memoization of split jobs with CONFIG key JOB_CACHE_DIR.
+        # Store cache dir in JOB_INFO so that write_job_info reuses 
+        # output files {prefix}* from a previous identical job.
+        # Inputs:
+        #   JOB_INFO      : job info from prep_JOB_INFO_[program]
+        #   prefix        : prefix of all output files from this job
+        #   upstream_list : upstream data files or dirs to include in key
+        #
+        # Jobs that wait for another job's output (wait_file), or 
+        # without their own DONE file, are never cached.
+
+        CONFIG = self.config_yaml['CONFIG']
+        args   = self.config_yaml['args']
+        if KEY_JOB_CACHE_DIR not in CONFIG : return
+        if args.check_abort                : return
+        if 'wait_file' in JOB_INFO         : return
+        if len(JOB_INFO['done_file']) < 4  : return
+
+        cache_dir    = os.path.expandvars(CONFIG[KEY_JOB_CACHE_DIR])
+        code_version = self.config_prep['snana_version']
+        os.makedirs(cache_dir, exist_ok=True)
+        key = util.get_job_cache_key(JOB_INFO, prefix, upstream_list, 
+                                     code_version)
+        JOB_INFO['job_cache'] = { 'dir' : f"{cache_dir}/{key}", 
+                                  'prefix' : prefix }
+        return
+        # end set_job_cache
+
     def keynames_for_job_stats(self,keyname_base):
         keyname_sum  = f"{keyname_base}_sum"
         keyname_list = f"{keyname_base}_list"
@@ -2581,6 +2740,7 @@ class Program:
         # + writes FAIL to done_stamp_file
         # + appends msgerr to MERGE.LOG
         # + remove BUSY file
+        # + closes merge process in timeline with FAIL state
 
         if condition is False :
             output_dir      = self.config_prep['output_dir']
@@ -2589,6 +2749,13 @@ class Program:
 
             util.write_done_stamp(output_dir, done_stamp_list,STRING_FAIL)
 
+            # close open merge process in timeline (Oct 2026)
+            cpu_name = self.config_prep.get('timeline_merge_cpu',None)
+            if cpu_name is not None :
+                util.append_timeline(output_dir, [ (TIMELINE_EVENT_MERGE_END,
+                                     'MERGE', cpu_name, SUBMIT_STATE_FAIL) ] )
+                self.config_prep['timeline_merge_cpu'] = None
+
             if os.path.isfile(MERGE_LOG_PATHFILE) :
                 with open(MERGE_LOG_PATHFILE,"a") as f:
                     f.write(f"# {SNANA_ABORT_STRING}\n")
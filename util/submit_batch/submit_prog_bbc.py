@@ -92,12 +92,20 @@
 # May 03 2025: create BBC_REJECT_MONITOR.FITRES and remove code that wrote BBC_REJECT_SUMMARY.FITRES
 #              Rename make_reject_summary to make_accept_summary().
 #
+# Oct 2026: new bbc_prep_input_tables_native catenates INPUT*FITRES files
+#           in python on a process pool (devel_flag=-327 -> PREP scripts).
+#           Optional CAT_FITRES_CACHE_DIR key to reuse catenated files.
+# Oct 2026: BBC_ACCEPT_SUMMARY reads only CID columns and uses hashed
+#           IZBIN lookup (was quadratic in number of events).
+# Oct 2026: optional CONFIG key JOB_CACHE_DIR to reuse unchanged BBC jobs.
+#
 # ================================================================
 
 import os, sys, shutil, yaml, glob
 import logging
 #import coloredlogs
 import datetime, time, subprocess
+import concurrent.futures
 import submit_util as util
 import numpy  as np
 import pandas as pd
@@ -111,6 +119,10 @@ USE_INPDIR = True
 # define number of interactive jobs to parallelize this slow task.
 NJOB_PREP_INPUT_FITRES     = 10
 DOFAST_PREP_INPUT_FILES    = True
+DONATIVE_PREP_INPUT_FILES  = True   # Oct 2026: python catenation on process pool
+
+# optional CONFIG key for persistent cache of catenated INPUT*FITRES.gz files
+KEY_CAT_FITRES_CACHE_DIR   = "CAT_FITRES_CACHE_DIR"
 
 PREFIX_SALT2mu           = "SALT2mu"
 PREFIX_PREP              = "PREP"
@@ -207,6 +219,9 @@ class BBC(Program):
         if devel_flag == -328 :
             global DOFAST_PREP_INPUT_FILES
             DOFAST_PREP_INPUT_FILES = False
+        if devel_flag == -327 :
+            global DONATIVE_PREP_INPUT_FILES
+            DONATIVE_PREP_INPUT_FILES = False
 
 
         # May 2024: if WFITMUDIF_OPT is specified as item, switch to a list.
@@ -246,7 +261,9 @@ class BBC(Program):
         self.bbc_prep_copy_files()
 
         # copy & combine tables from INPDIR+ directories
-        if DOFAST_PREP_INPUT_FILES :
+        if DOFAST_PREP_INPUT_FILES and DONATIVE_PREP_INPUT_FILES :
+            self.bbc_prep_input_tables_native()  # python catenation, Oct 2026
+        elif DOFAST_PREP_INPUT_FILES :
             self.bbc_prep_input_tables_fast()  # refactored/parallel 
         else:           
             self.bbc_prep_input_tables_slow()  # original/slow code
@@ -1451,6 +1468,143 @@ class BBC(Program):
         return
         # end bbc_prep_input_tables_fast
     
+    def bbc_prep_input_tables_native(self):
+
+        # Created Oct 2026
+        # Same task as bbc_prep_input_tables_fast, but catenation is
+        # done by util.cat_fitres_native on a local process pool
+        # instead of writing PREP scripts that run sntable_cat.py.
+        #  + column alignment and -a (append_varname_missing) logic
+        #    follow SALT2mu cat_only.
+        #  + gzip uses pigz (multi-thread) if available.
+        #  + outputs with identical inputs (e.g., LCFIT FITOPTs that are
+        #    sym links to FITOPT000) are catenated once and hard-linked.
+        #  + optional CAT_FITRES_CACHE_DIR key stores catenated files
+        #    keyed by input signature so that re-submits reuse them.
+        # Use devel_flag=-327 to use PREP scripts instead.
+
+        if not USE_INPDIR: return
+
+        CONFIG             = self.config_yaml['CONFIG']
+        output_dir         = self.config_prep['output_dir']  
+        n_version          = self.config_prep['n_version_out']    
+        v_out_list         = self.config_prep['version_out_sort_list2d']
+        iver_list2         = self.config_prep['iver_list2'] 
+        ifit_list2         = self.config_prep['ifit_list2']
+        fitopt_num_outlist = self.config_prep['fitopt_num_outlist']
+        n_splitran         = self.config_prep['n_splitran']
+        idir0              = 0  # some things just need first INPDIR index
+
+        cache_dir = None
+        if KEY_CAT_FITRES_CACHE_DIR in CONFIG:
+            cache_dir = os.path.expandvars(CONFIG[KEY_CAT_FITRES_CACHE_DIR])
+            os.makedirs(cache_dir, exist_ok=True)
+
+        t_start = time.time()
+        logging.info("\n  Prepare INPUT*FITRES files for " \
+                     f"{n_version} data versions (native catenation)")
+
+        n_worker     = NJOB_PREP_INPUT_FITRES
+        nthread_gzip = max(1, (os.cpu_count() or 1) // n_worker)
+
+        # collect one cat task per output file; tasks with same input
+        # signature are done once.
+        cat_task_dict  = {}   # signature -> cat_info
+        link_list      = []   # (signature, out_file.gz)
+        vdir_list      = []
+        for iver, ifit in zip(iver_list2, ifit_list2):
+            v_dir   = v_out_list[idir0][iver]
+            v_dir  += self.suffix_splitran(n_splitran,1)
+            if v_dir not in vdir_list : vdir_list.append(v_dir)
+
+            cat_list     = self.make_cat_fitres_list(iver,ifit).split(',')
+            fitopt_num   = fitopt_num_outlist[ifit]
+            cat_file_out = f"{output_dir}/{v_dir}/INPUT_{fitopt_num}.{SUFFIX_FITRES}"
+            signature    = util.get_cat_fitres_signature(cat_list, 
+                                                         VARNAME_APPEND)
+            if signature not in cat_task_dict:
+                cat_task_dict[signature] = {
+                    'inp_file_list'  : cat_list,
+                    'out_file'       : cat_file_out,
+                    'varname_append' : VARNAME_APPEND,
+                    'gzip_flag'      : True,
+                    'nthread_gzip'   : nthread_gzip
+                }
+            else:
+                link_list.append( (signature, f"{cat_file_out}.gz") )
+
+        # check cache for tasks that were done in a previous submit
+        n_cache = 0
+        task_run_list = []
+        for signature, cat_info in cat_task_dict.items():
+            out_file_gz = f"{cat_info['out_file']}.gz"
+            cache_file  = f"{cache_dir}/{signature}.{SUFFIX_FITRES}.gz"
+            if cache_dir is not None and os.path.isfile(cache_file):
+                self.link_or_copy_file(cache_file, out_file_gz)
+                n_cache += 1
+            else:
+                task_run_list.append((signature,cat_info))
+
+        n_task = len(task_run_list)
+        logging.info(f"\t Catenate {n_task} INPUT*FITRES files with " \
+                     f"{n_worker} processes; reuse {n_cache} from cache " \
+                     f"and link {len(link_list)} duplicates.")
+
+        nrow_tot = 0
+        with concurrent.futures.ProcessPoolExecutor(max_workers=n_worker) \
+             as pool:
+            future_dict = {}
+            for signature, cat_info in task_run_list:
+                future = pool.submit(util.cat_fitres_native, cat_info)
+                future_dict[future] = signature
+
+            for future in concurrent.futures.as_completed(future_dict):
+                signature  = future_dict[future]
+                try:
+                    cat_result = future.result()
+                except Exception as e:
+                    # report worker failure as submit abort (not traceback)
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    out_file = cat_task_dict[signature]['out_file']
+                    msgerr = []
+                    msgerr.append(f"Failed to catenate INPUT FITRES files for")
+                    msgerr.append(f"   {out_file}")
+                    msgerr.append(f"   {type(e).__name__}: {e}")
+                    util.log_assert(False, msgerr)
+                nrow_tot  += cat_result['n_row']
+                if cache_dir is not None:
+                    cache_file = f"{cache_dir}/{signature}.{SUFFIX_FITRES}.gz"
+                    self.link_or_copy_file(cat_result['out_file'],cache_file)
+
+        # link duplicates to the one catenated file with same inputs
+        for signature, out_file_gz in link_list:
+            src_file = f"{cat_task_dict[signature]['out_file']}.gz"
+            self.link_or_copy_file(src_file, out_file_gz)
+
+        for v_dir in vdir_list:
+            self.tag_missing_events(TAG_REJECT_STAGE_CUTWIN,v_dir) 
+
+        # - - - - - - -
+        t_prep = time.time() - t_start
+        n_out  = len(iver_list2)
+        msg = f"Total time to prep {n_out} INPUT*FITRES.gz files " \
+              f"({nrow_tot} rows catenated): {t_prep:.0f} seconds."
+        logging.info(f"  {msg}")
+
+        return
+        # end bbc_prep_input_tables_native
+
+    def link_or_copy_file(self, src_file, dest_file):
+        # Created Oct 2026
+        # hard link src_file -> dest_file if on same file system;
+        # otherwise copy.
+        if os.path.exists(dest_file) : os.remove(dest_file)
+        try:
+            os.link(src_file, dest_file)
+        except OSError:
+            shutil.copyfile(src_file, dest_file)
+        # end link_or_copy_file
+
     def tag_missing_events(self, stage, v_dir):
 
         # Created May 5 2025
@@ -2043,6 +2197,7 @@ class BBC(Program):
         # construct row mimicking MERGE.LOG            
         row = [ None, version, fitopt_num, muopt_num, 0,0,0, 0.0, isplitran ]
         prefix_orig, prefix_final = self.bbc_prefix("bbc", row)
+        prefix_job    = prefix_orig
         input_ff      = f"INPUT_{fitopt_num}.{SUFFIX_FITRES}"
         log_file      = f"{prefix_orig}.LOG"
         done_file     = f"{prefix_orig}.DONE"
@@ -2126,6 +2281,9 @@ class BBC(Program):
         # - - - - - 
         JOB_INFO['arg_list'] = arg_list
 
+        # Oct 2026: optional reuse of identical job from previous submit;
+        # input FITRES (datafile=) is included in cache key.
+        self.set_job_cache(JOB_INFO, prefix_job, [])
 
         return JOB_INFO
 
@@ -2384,6 +2542,8 @@ class BBC(Program):
 
         # init outputs of function
         n_state_change     = 0
+        # Oct 2026: one directory read for all state checks below
+        snapshot = util.get_dir_snapshot(script_dir)
         row_list_merge_new = []
 
         nrow_check = 0
@@ -2413,7 +2573,8 @@ class BBC(Program):
 
                 # get list of LOG, DONE, and YAML files 
                 log_list, done_list, yaml_list = \
-                    util.get_file_lists_wildcard(script_dir,search_wildcard)
+                    util.get_file_lists_wildcard(script_dir,search_wildcard,
+                                                 snapshot=snapshot)
 
                 # careful to sum only the files that are NOT None
                 NLOG   = sum(x is not None for x in log_list)  
@@ -2568,8 +2729,9 @@ class BBC(Program):
             wildcard = f"{jobfile_wildcard}*.{suffix}"
             util.compress_files(+1, script_dir, wildcard, suffix, "" )
 
-        # Mar 2023: cleanup PREP files
-        if DOFAST_PREP_INPUT_FILES :
+        # Mar 2023: cleanup PREP files (Oct 2026: only if they exist)
+        n_prep = len(glob.glob1(script_dir,f"{PREFIX_PREP}*"))
+        if DOFAST_PREP_INPUT_FILES and n_prep > 0 :
             wildcard = f"{PREFIX_PREP}*"
             util.compress_files(+1, script_dir, wildcard, PREFIX_PREP, "")
 
@@ -2621,8 +2783,7 @@ class BBC(Program):
         # same data light curve measured by multiple surveys, or
         # multiple sims (e.g., LOWZ + HIGHZ) with random overlap CIDs
 
-        df_first  = pd.read_csv(first_fitres_file, 
-                                comment="#", delim_whitespace=True)
+        df_first  = self.read_cid_table(first_fitres_file)
         first_cids  = df_first[TABLE_VARNAME_CID]
         first_cids_unique, counts = np.unique(first_cids,return_counts=True)
         n_dupl   = len(counts[counts>1])
@@ -2727,24 +2888,54 @@ class BBC(Program):
         # end make_accept_summary
 
 
+    def read_cid_table(self, FF):
+        # Created Oct 2026
+        # read only the CID-related columns (CID, IDSURVEY, FIELD, IZBIN)
+        # from FITRES file FF; avoids parsing the full table of every
+        # FITOPT x MUOPT file.
+        varname_keep = [ TABLE_VARNAME_CID, TABLE_VARNAME_IDSURVEY,
+                         TABLE_VARNAME_FIELD, TABLE_VARNAME_IZBIN ]
+        df = pd.read_csv(FF, comment="#", sep=r'\s+',
+                         usecols=lambda c: c in varname_keep)
+        return df
+        # end read_cid_table
+
+    def get_izbin_unique(self, df0, key_list, key_unique):
+        # Created Oct 2026
+        # Return IZBIN for each key in key_unique using hashed lookup
+        # of first-file table df0 (first occurrence of each key).
+        # key_list are the df0 keys, aligned with df0 rows.
+        # Missing key or missing IZBIN column -> -9.
+        n_unique = len(key_unique)
+        if TABLE_VARNAME_IZBIN not in df0:
+            return np.full(n_unique, -9, dtype=int)
+
+        izbin_map = pd.Series(df0[TABLE_VARNAME_IZBIN].to_numpy(), 
+                              index=key_list)
+        izbin_map = izbin_map[~izbin_map.index.duplicated(keep='first')]
+        izbin_unique = izbin_map.reindex(key_unique).fillna(-9).astype(int)
+        return izbin_unique.to_numpy()
+        # end get_izbin_unique
+
     def get_cid_list(self,fitres_list,VOUT):
         # get cid_list of all CIDs in all files. If same events appear in 
         # each file, each CID appears n_ff times. If a CID appears less 
         # than n_ff times, it goes into reject list.
+        #
+        # Oct 2026: read only CID/IZBIN columns, concatenate once, and use
+        #    hashed lookup for IZBIN (was O(N_cid x N_rows) with df.loc).
+
         n_ff       = len(fitres_list)
-        cid_list   = []
-        izbin_list = []
-        found_first_file = False
+        cid_array_list = []
+        df0        = None
 
         for ff in fitres_list:
             FF       = f"{VOUT}/{ff}"
-            df       = pd.read_csv(FF, comment="#", delim_whitespace=True)
-            cid_list = np.concatenate((cid_list, df.CID.astype(str)))
+            df       = self.read_cid_table(FF)
+            cid_array_list.append(df[TABLE_VARNAME_CID].astype(str).to_numpy())
+            if df0 is None: df0 = df
 
-            if not found_first_file: 
-                df0 = df.copy()
-                df0[TABLE_VARNAME_CID] = df0[TABLE_VARNAME_CID].astype(str)
-                found_first_file = True
+        cid_list = np.concatenate(cid_array_list)
 
         # - - - - - - - - - - - - -
         # get list of unique CIDs, and how many times each CID appears
@@ -2760,18 +2951,9 @@ class BBC(Program):
         cid_dict['n_reject']   = n_reject
 
         # Mar 28 2022: fetch list of izbin 
-        if TABLE_VARNAME_IZBIN in df0:
-            izbin_unique = []
-            for cid in cid_unique:
-                izbin_tmplist = df0.loc[df0[TABLE_VARNAME_CID]==cid][TABLE_VARNAME_IZBIN].values
-                izbin = -9
-                if len(izbin_tmplist) > 0 : izbin = izbin_tmplist[0]
-                izbin_unique.append(izbin)
-        else:
-            ncid         = len(cid_unique)
-            izbin_unique = [ -9 ] * ncid
-
-        cid_dict['izbin_unique']  = izbin_unique
+        cid0_list = df0[TABLE_VARNAME_CID].astype(str).to_numpy()
+        cid_dict['izbin_unique'] = \
+            self.get_izbin_unique(df0, cid0_list, cid_unique)
 
         return cid_dict
         # end of get_cid_list
@@ -2780,55 +2962,39 @@ class BBC(Program):
         # get cid_list of all CIDs in all files. If same events appear in 
         # each file, each CID appears n_ff times. If a CID appears less 
         # than n_ff times, it goes into reject list.
-
-        args             = self.config_yaml['args']  
-        devel_flag       = args.devel_flag
+        #
+        # Oct 2026: same speed-ups as in get_cid_list.
 
         n_ff        = len(fitres_list)
         unique_dict = {}
-        ucid_list   = []
-        found_first_file = False
+        ucid_array_list = []
+        df0         = None
 
         for ff in fitres_list:
             FF       = f"{VOUT}/{ff}"
-            df       = pd.read_csv(FF, comment="#", delim_whitespace=True)
+            df       = self.read_cid_table(FF)
             df_id    = df.CID.astype(str) + "__" + df.IDSURVEY.astype(str) + "__" + \
                        df.FIELD.astype(str)  
-            ucid_list = np.concatenate( (ucid_list, df_id) )
+            ucid_array_list.append(df_id.to_numpy())
+            if df0 is None: 
+                df0     = df
+                ucid0   = df_id.to_numpy()
 
-
-            if not found_first_file:
-                df0 = df.copy()
-                df0[TABLE_VARNAME_CID] = df0[TABLE_VARNAME_CID].astype(str)
-                found_first_file = True
+        ucid_list = np.concatenate(ucid_array_list)
 
         # - - - - - - - - - - - - -
         # get list of unique CIDs, and how many times each CID appears
         cid_unique, n_count = np.unique(ucid_list, return_counts=True)
-        HAS_IZBIN = TABLE_VARNAME_IZBIN in df0
-
-        for ucid in cid_unique:
-            unique_dict[ucid] = {}
-            cid      = str(ucid.split("__")[0])
-            idsurvey = int(ucid.split("__")[1])
-            field    = str(ucid.split("__")[-1])  
-
-            if HAS_IZBIN:
-                izbin_list = df0.loc[(df0[TABLE_VARNAME_CID]==cid) & \
-                                     (df0[TABLE_VARNAME_IDSURVEY]==idsurvey) & \
-                                     (df0[TABLE_VARNAME_FIELD]==field) ][TABLE_VARNAME_IZBIN].values
-            else:
-                izbin_list = []
-
-            if len(izbin_list) > 0 :
-                izbin = int(izbin_list[0])
-            else:
-                izbin = -9
-
-            unique_dict[ucid][TABLE_VARNAME_CID]      = cid
-            unique_dict[ucid][TABLE_VARNAME_IDSURVEY] = idsurvey
-            unique_dict[ucid][TABLE_VARNAME_FIELD]    = field
-            unique_dict[ucid][TABLE_VARNAME_IZBIN]    = izbin
+        izbin_unique = self.get_izbin_unique(df0, ucid0, cid_unique)
+
+        for ucid, izbin in zip(cid_unique, izbin_unique):
+            wdlist = ucid.split("__")
+            unique_dict[ucid] = {
+                TABLE_VARNAME_CID      : wdlist[0],
+                TABLE_VARNAME_IDSURVEY : int(wdlist[1]),
+                TABLE_VARNAME_FIELD    : wdlist[-1],
+                TABLE_VARNAME_IZBIN    : int(izbin)
+            }
 
         # number of times each CID does not appear in a fitres file
         n_reject        = n_ff - n_count
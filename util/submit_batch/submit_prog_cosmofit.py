@@ -64,6 +64,10 @@
 # Apr 21 2025: add ndof collumn to summary file
 # Apr 24 2025: add <omm_sig> column to WFIT_SUMMARY_AVG
 #
+# Oct 2026: read fit-result YAML files in parallel and store summary in a
+#           DataFrame; FITAVG means and std err are computed with groupby.
+#           For AVG_DIFF, fix bug using wrong dir for 2nd set of values.
+#
 # ====================================================================
 
 import os, sys, shutil, yaml, glob
@@ -72,6 +76,7 @@ import logging
 import datetime, time
 import submit_util as util
 import numpy as np
+import pandas as pd
 
 from submit_params    import *
 from submit_prog_base import Program
@@ -147,6 +152,12 @@ COSMOFIT_PARNAME_nwarn     = 'nwarn'
 COSMOFIT_PARNAME_w_ran     = 'w_ran'
 COSMOFIT_PARNAME_wa_ran    = 'wa_ran'
 COSMOFIT_PARNAME_omm_ran   = 'omm_ran'
+
+# fitted params averaged in FITAVG summary (Oct 2026)
+COSMOFIT_PARNAME_AVG_LIST = [ COSMOFIT_PARNAME_w,   COSMOFIT_PARNAME_w_sig,
+                              COSMOFIT_PARNAME_wa,  COSMOFIT_PARNAME_wa_sig,
+                              COSMOFIT_PARNAME_omm, COSMOFIT_PARNAME_omm_sig,
+                              COSMOFIT_PARNAME_FoM ]
 # - - - - - - - - - - - - - - - - - - -  -
 class cosmofit(Program):
     def __init__(self, config_yaml):
@@ -1162,6 +1173,8 @@ class cosmofit(Program):
 
         # init outputs of function
         n_state_change     = 0
+        # Oct 2026: one directory read for all state checks below
+        snapshot = util.get_dir_snapshot(script_dir)
         row_list_merge_new = []
 
         nrow_check = 0
@@ -1184,7 +1197,8 @@ class cosmofit(Program):
 
                 # get list of LOG, DONE, and YAML files 
                 log_list, done_list, yaml_list = \
-                    util.get_file_lists_wildcard(script_dir,search_wildcard)
+                    util.get_file_lists_wildcard(script_dir,search_wildcard,
+                                                 snapshot=snapshot)
 
                 # careful to sum only the files that are NOT None
                 NLOG   = sum(x is not None for x in log_list)  
@@ -1274,17 +1288,20 @@ class cosmofit(Program):
         MERGE_INFO_CONTENTS,comment_lines = \
                 util.read_merge_file(MERGE_LOG_PATHFILE)
 
+        # Oct 2026: read all fit-result YAML files in parallel
+        row_list       = MERGE_INFO_CONTENTS[TABLE_MERGE]
+        yaml_file_list = [ f"{script_dir}/{self.cosmofit_prefix(row)}.YAML"
+                           for row in row_list ]
+        yaml_contents_list = util.extract_yaml_list(yaml_file_list)
+
         dirnum_last = "zzz"
-        cosmofit_summary_table = {}
+        summary_row_list = []
         nrow = 0 ; nrow_warn = 0
-        for row in MERGE_INFO_CONTENTS[TABLE_MERGE]:
+        for row, yaml_contents in zip(row_list, yaml_contents_list):
             nrow += 1
             dirnum     = row[COLNUM_COSMOFIT_MERGE_DIROPT][-5:] # e.g., DIROPT00000
             covnum     = row[COLNUM_COSMOFIT_MERGE_COVOPT][-3:] # e.g., COVOPT001
             fitnum     = row[COLNUM_COSMOFIT_MERGE_FITOPT][-3:] # idem
-            prefix     = self.cosmofit_prefix(row)
-            YAML_FILE  = f"{script_dir}/{prefix}.YAML"
-            yaml_contents        = util.extract_yaml(YAML_FILE, None, None )
                
             if COSMOFIT_CODE == COSMOFIT_CODE_WFIT:            
                 fit_values_dict = util.get_wfit_values(yaml_contents)
@@ -1329,7 +1346,8 @@ class cosmofit(Program):
                 rho_w0wa = 0
 
             # load table for mean and std err on mean (table not used here)
-            local_dict = {'dirnum': dirnum, 
+            local_dict = {'dir_name': dir_name,
+                          'dirnum': dirnum, 
                           'covnum': covnum, 
                           'fitnum': fitnum, 
                           COSMOFIT_PARNAME_w       : w, 
@@ -1346,8 +1364,7 @@ class cosmofit(Program):
                           'fitopt_label'  : fitopt_label
             }
 
-            unique_key = dir_name + '_' + covnum + '_' + fitnum 
-            cosmofit_summary_table[unique_key] = local_dict
+            summary_row_list.append(local_dict)
             
             if nrow == 1:
                 out_lines_list += \
@@ -1382,7 +1399,7 @@ class cosmofit(Program):
                 f.write(f"# {text_warn}\n\n")
             for line in out_lines_list:  f.write(f"{line}\n")
         
-        self.config_prep['cosmofit_summary_table'] = cosmofit_summary_table
+        self.config_prep['cosmofit_summary_df'] = pd.DataFrame(summary_row_list)
         # end make_cosmofit_summary
 
     def get_firecrown_values(self,script_dir):
@@ -1564,18 +1581,48 @@ class cosmofit(Program):
 
         # end make_fitavg_lists                                                                                                                              
 
-    def compute_average(self, fit_list):
-        fit_array = np.array(fit_list)
-        
-        mean        = np.mean(fit_array)
-        std_of_mean = np.std(fit_array)/np.sqrt(len(fit_list))
-
-        if np.isnan(mean):   # RK
-            mean = 0.0 
-            std_of_mean = 0.0
-
-        return mean, std_of_mean
-        # end compute_average
+    def get_fitavg_table(self, summary_df, dir_list1, dir_list2):
+
+        # Created Oct 2026 (replaces compute_average loops)
+        # Return DataFrame indexed by (covnum,fitnum) with mean and 
+        # std err on mean [ RMS/sqrt(N) ] among dir_list1 for each 
+        # COSMOFIT_PARNAME_AVG_LIST parameter, plus N_DIRs and labels.
+        # If dir_list2 is not None, average the differences between
+        # paired dirs, dir_list1[i] - dir_list2[i].
+        # Fits with nwarn > 0 (in either dir of a pair) are excluded;
+        # if all fits are excluded, mean and std err are 0.
+
+        PARNAME_nwarn = COSMOFIT_PARNAME_nwarn
+        par_list      = COSMOFIT_PARNAME_AVG_LIST
+        key_list      = [ 'covnum', 'fitnum' ]
+
+        df = summary_df[summary_df['dir_name'].isin(dir_list1)].copy()
+        df['ipair'] = df['dir_name'].map({d: i for i, d in enumerate(dir_list1)})
+
+        if dir_list2 is not None:
+            df2 = summary_df[summary_df['dir_name'].isin(dir_list2)]
+            df2 = df2[ key_list + par_list + [PARNAME_nwarn, 'dir_name'] ].copy()
+            df2['ipair'] = df2['dir_name'].map({d: i for i, d in enumerate(dir_list2)})
+            df  = df.merge(df2, on=['ipair'] + key_list, suffixes=('','_2'))
+            for par in par_list :
+                df[par] = df[par] - df[f"{par}_2"]
+            df[PARNAME_nwarn] = df[PARNAME_nwarn] + df[f"{PARNAME_nwarn}_2"]
+
+        df.loc[df[PARNAME_nwarn] > 0, par_list] = np.nan
+        df[par_list] = df[par_list].astype(float)
+
+        group    = df.groupby(key_list, sort=True)
+        n_dir    = group[par_list[0]].count()
+        mean     = group[par_list].mean().fillna(0.0)
+        std_mean = group[par_list].std(ddof=0).div(np.sqrt(n_dir), axis=0)
+        std_mean = std_mean.fillna(0.0).add_suffix('_std')
+
+        fitavg_df = pd.concat([mean, std_mean], axis=1)
+        fitavg_df['N_DIRs'] = n_dir
+        fitavg_df[['covopt_label','fitopt_label']] = \
+            group[['covopt_label','fitopt_label']].first()
+        return fitavg_df
+        # end get_fitavg_table
         
     def make_fitavg_summary(self):
 
@@ -1592,8 +1639,6 @@ class cosmofit(Program):
         use_wa           = submit_info_yaml['USE_wa']
         INPDIR_LIST      = submit_info_yaml['INPDIR_LIST']
         FITOPT_LIST      = submit_info_yaml['FITOPT_LIST']
-        cosmofit_summary_table  = self.config_prep['cosmofit_summary_table']
-        PARNAME_nwarn  = COSMOFIT_PARNAME_nwarn
         KEYNAME_FITAVG = self.get_keyname_cosmofit(KEYNAME_FITAVG_LIST)
         if KEYNAME_FITAVG is None: return
 
@@ -1658,135 +1703,53 @@ class cosmofit(Program):
             COSMOFIT_AVGTYPE_DIFF   : ' (mean and std err on fit-val differences)'
         }
 
+        summary_df = self.config_prep['cosmofit_summary_df']
+
         for fitavg in fitavg_list:
-            # use the first directory in the list to find the set of 
-            # unique covopts and unique wfitopts
             fitavg_list1 = fitavg_list[fitavg]['dirslist_fullpath1']
             fitavg_list2 = fitavg_list[fitavg]['dirslist_fullpath2']
 
-            dir_0 = fitavg_list1[0]
-            unique_matching_covopts = \
-                np.unique([f.replace(dir_0,'')[1:4] \
-                           for f in cosmofit_summary_table.keys() if f[:-8]==dir_0])
-
-            unique_matching_fitopts = \
-                np.unique([f.replace(dir_0,'')[5:] \
-                           for f in cosmofit_summary_table.keys() if f[:-8]==dir_0])
-
             avg_comment = avg_comment_dict[fitavg_list[fitavg]['avg_type']]
             f.write(f"# {fitavg} {avg_comment}\n")
 
-            for covnum in unique_matching_covopts:
-                for wfitnum in unique_matching_fitopts:
-                    str_covnum_wfitnum = f"{covnum}_{wfitnum}"  # .xyz
-                    nwarn_dict = {}
-                    idir = 0
-                    dir2_ = 'blank'
-
-                    # July 5 2023 RK - check for nwarn > 0
-                    for dir_ in fitavg_list1:
-                            unique_key     = f"{dir_}_{str_covnum_wfitnum}"
-                            summary_table  = cosmofit_summary_table[unique_key]
-                            nwarn_tot      = summary_table[PARNAME_nwarn]
-                            if fitavg_list2 is not None:
-                                dir2_          = fitavg_list2[idir]
-                                unique_key2    = f"{dir2_}_{str_covnum_wfitnum}"
-                                summary_table2 = cosmofit_summary_table[unique_key2]
-                                nwarn_tot     += summary_table2[PARNAME_nwarn]
-
-                            nwarn_dict[dir_]  = nwarn_tot
-                            nwarn_dict[dir2_] = nwarn_tot
-                            idir += 1
-                    # - - -
-                    omm_list = []; w_list = []; wa_list = []
-                    wsig_list = []; wasig_list = []; ommsig_list = [] ; FoM_list = []
-                    unique_key_list = []
-
-                    for dir_ in fitavg_list1:
-                        if nwarn_dict[dir_] > 0 : continue
-                        # xxx mark unique_key    = dir_+'_%s_%s'%(covnum,wfitnum)
-                        unique_key    = f"{dir_}_{str_covnum_wfitnum}"
-                        summary_table = cosmofit_summary_table[unique_key]
-
-                        unique_key_list.append(unique_key)
-                        omm_list.append(summary_table['omm'])
-                        w_list.append(summary_table['w'])
-                        wa_list.append(summary_table['wa'])
-                        wsig_list.append(summary_table['w_sig'])
-                        wasig_list.append(summary_table['wa_sig'])
-                        ommsig_list.append(summary_table['omm_sig'])  # Apr 2025 .xyz
-                        FoM_list.append(summary_table['FoM'])
-                    covopt_label  = summary_table['covopt_label']
-                    fitopt_label  = summary_table['fitopt_label']
-
-                    if fitavg_list2 is not None:
-                        omm_list2  = []; w_list2 = []; wa_list2 = []
-                        wsig_list2 = []; wasig_list2 = []; ommsig_list2 = [] ; FoM_list2 = []
-
-                        for dir2_ in fitavg_list2:
-                            if nwarn_dict[dir2_] > 0 : continue
-                            unique_key2   = f"{dir2_}_{str_covnum_wfitnum}"
-                            summary_table = cosmofit_summary_table[unique_key]
-                            omm_list2.append(summary_table['omm'])
-                            w_list2.append(summary_table['w'])
-                            wa_list2.append(summary_table['wa'])
-                            wsig_list2.append(summary_table['w_sig'])
-                            wasig_list2.append(summary_table['wa_sig'])
-                            ommsig_list2.append(summary_table['omm_sig'])
-                            FoM_list2.append(summary_table['FoM'])
-                    else: 
-                        # if theres no second set of dirs, this is not a 
-                        # difference so just set x_list2 to zero                         
-                        zero_list2   = np.zeros(len(w_list))
-                        omm_list2    = zero_list2
-                        w_list2      = zero_list2
-                        wa_list2     = zero_list2
-                        wsig_list2   = zero_list2
-                        wasig_list2  = zero_list2
-                        ommsig_list2 = zero_list2
-                        FoM_list2    = zero_list2
-                    
-                    ##compute mean and std err on mean
-                    logging.info(f"\t Compute averages for '{fitopt_label}' " \
-                                 f"with COVOPT={covopt_label}")
-
-                    omm_avg, omm_avg_std = \
-                        self.compute_average(np.array(omm_list)-np.array(omm_list2))
-                    w_avg, w_avg_std = \
-                        self.compute_average(np.array(w_list)-np.array(w_list2))
-                    wsig_avg, wsig_avg_std = \
-                        self.compute_average(np.array(wsig_list)-np.array(wsig_list2))
-                    ommsig_avg, ommsig_avg_std = \
-                        self.compute_average(np.array(ommsig_list)-np.array(ommsig_list2))
-
-                    if use_wa:
-                        wa_avg, wa_avg_std = \
-                            self.compute_average(np.array(wa_list)-np.array(wa_list2))
-                        wasig_avg, wasig_avg_std = \
-                            self.compute_average(np.array(wasig_list)-np.array(wasig_list2))
-                        FoM_avg, FoM_avg_std = \
-                            self.compute_average(np.array(FoM_list)-np.array(FoM_list2))
-                    else:
-                        wa_avg,  wa_avg_std  = 0.0, 0.0
-                        FoM_avg, FoM_avg_std = 0.0, 0.0
-
-                    str_nums     = f"{covnum} {wfitnum} "
-                    str_results  = f"{w_avg:7.4f} {w_avg_std:7.4f} "
-                    str_results += f"{wa_avg:7.4f} {wa_avg_std:7.4f} "
-                    str_results += f"{omm_avg:7.3f} {omm_avg_std:7.3f}  "
-                    # xxx mark delete : str_results += f"{wsig_avg:7.4f} {wsig_avg_std:7.4f}  "
+            # mean and std err on mean for all (covnum,fitnum) at once
+            fitavg_df = self.get_fitavg_table(summary_df, 
+                                              fitavg_list1, fitavg_list2)
+
+            for (covnum, wfitnum), avg in fitavg_df.iterrows():
+                covopt_label  = avg['covopt_label']
+                fitopt_label  = avg['fitopt_label']
+                logging.info(f"\t Compute averages for '{fitopt_label}' " \
+                             f"with COVOPT={covopt_label}")
+
+                w_avg,   w_avg_std   = avg['w'],   avg['w_std']
+                omm_avg, omm_avg_std = avg['omm'], avg['omm_std']
+                wsig_avg   = avg['w_sig']
+                ommsig_avg = avg['omm_sig']
+                if use_wa:
+                    wa_avg,  wa_avg_std  = avg['wa'],  avg['wa_std']
+                    FoM_avg, FoM_avg_std = avg['FoM'], avg['FoM_std']
+                    wasig_avg = avg['wa_sig']
+                else:
+                    wa_avg,  wa_avg_std  = 0.0, 0.0
+                    FoM_avg, FoM_avg_std = 0.0, 0.0
+
+                str_nums     = f"{covnum} {wfitnum} "
+                str_results  = f"{w_avg:7.4f} {w_avg_std:7.4f} "
+                str_results += f"{wa_avg:7.4f} {wa_avg_std:7.4f} "
+                str_results += f"{omm_avg:7.3f} {omm_avg_std:7.3f}  "
                     
-                    if use_wa:
-                        str_FoM      = f"{FoM_avg:5.0f} {FoM_avg_std:5.1f} "
-                        str_results += f"{wsig_avg:7.4f} {wasig_avg:7.4f} {ommsig_avg:7.4f} {str_FoM}"
-                    else:
-                        str_results += f"{wsig_avg:7.4f} {ommsig_avg:7.4f} "
-
-                    str_misc    = f"{len(w_list)}"
-                    str_labels  = f"{covopt_label:<10} {fitopt_label}"
-                    nrow +=1
-                    f.write(f"ROW: {nrow:3d} {str_nums} {str_results}  " \
-                                f"{str_misc} {str_labels}\n")
+                if use_wa:
+                    str_FoM      = f"{FoM_avg:5.0f} {FoM_avg_std:5.1f} "
+                    str_results += f"{wsig_avg:7.4f} {wasig_avg:7.4f} {ommsig_avg:7.4f} {str_FoM}"
+                else:
+                    str_results += f"{wsig_avg:7.4f} {ommsig_avg:7.4f} "
+
+                str_misc    = f"{int(avg['N_DIRs'])}"
+                str_labels  = f"{covopt_label:<10} {fitopt_label}"
+                nrow +=1
+                f.write(f"ROW: {nrow:3d} {str_nums} {str_results}  " \
+                        f"{str_misc} {str_labels}\n")
 
         f.close()
 
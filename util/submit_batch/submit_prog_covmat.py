@@ -7,6 +7,11 @@
 #
 # Nov 2024: read SIZE_COVMAT from yaml file written by create_covaraince.py,
 #           and incluce new SIZE_COVMAT colummn in MERGE.LOG
+#
+# Oct 2026: optional COVMAT_BATCH_MODE: each CPU runs one create_covariance
+#           process with a queue of tasks (--batch_task_file) so that python
+#           modules are imported once and all COVMATOPTs for a BBC subdir
+#           re-use the parsed hubble diagrams.
 
 import os, sys, shutil, yaml, glob
 import logging
@@ -22,6 +27,7 @@ from submit_prog_base import Program
 KEY_BBC_OUTDIR     = 'BBC_OUTDIR'
 KEY_COVMATOPT      = 'COVMATOPT'
 KEY_VERSION_SUBSET = 'VERSION_SUBSET'
+KEY_BATCH_MODE     = 'COVMAT_BATCH_MODE'
 
 # keys in native input file
 KEY_SYS_SCALE_FILE = 'SYS_SCALE_FILE'
@@ -35,6 +41,7 @@ COLNUM_COVMAT_MERGE_COVSIZE      = 5
 COLNUM_COVMAT_MERGE_CPU          = 6  # xxx mark delete 5
 
 PREFIX_JOB_FILES = 'COVMAT'  # for LOG, DONE, YAML 
+PREFIX_BATCH_FILES = f"BATCH_{PREFIX_JOB_FILES}" # for batch-mode TASKS,LOG,DONE
 
 # - - - - - - - - - - - - - - - - - - -  -
 class create_covmat(Program):
@@ -251,6 +258,10 @@ class create_covmat(Program):
 
     def write_command_file(self, icpu, f):
 
+        CONFIG = self.config_yaml['CONFIG']
+        if CONFIG.get(KEY_BATCH_MODE,False) :
+            return self.write_command_file_batch(icpu, f)
+
         n_core             = self.config_prep['n_core']
         bbc_outdir_dict    = self.config_prep['bbc_outdir_dict']
         covmatopt_dict     = self.config_prep['covmatopt_dict'] 
@@ -286,6 +297,77 @@ class create_covmat(Program):
         return n_job_cpu
         # end write_command_file
 
+    def write_command_file_batch(self, icpu, f):
+
+        # Created Oct 2026
+        # Write one create_covariance job for this icpu that processes a
+        # queue of covmat tasks listed in a TASKS file. Tasks are grouped
+        # by BBC outdir+subdir, and each group is assigned to one CPU so 
+        # that hubble diagrams are parsed once per group.
+        # Each task has the same LOG, DONE and YAML file as in default mode.
+
+        n_core        = self.config_prep['n_core']
+        program       = self.config_prep['program']
+        script_dir    = self.config_prep['script_dir']
+        output_dir    = self.config_prep['output_dir']
+        input_covmat_file = self.config_prep['input_covmat_file']
+        kill_on_fail  = self.config_yaml['args'].kill_on_fail
+
+        icovmat_list3 = self.config_prep['icovmat_list3']
+        idir_list3    = self.config_prep['idir_list3'] 
+        isubdir_list3 = self.config_prep['isubdir_list3']
+
+        group_list = []
+        task_list  = []
+        for icovmat,idir,isubdir in \
+            sorted(zip(icovmat_list3,idir_list3,isubdir_list3), 
+                   key = lambda x: (x[1],x[2],x[0]) ):
+
+            group = (idir,isubdir)
+            if group not in group_list : group_list.append(group)
+            if ( (len(group_list)-1) % n_core ) != icpu : continue
+
+            index_dict = { 'icovmat':icovmat, 'idir':idir, 'isubdir':isubdir, 
+                           'icpu':icpu }
+            job_info_covmat = self.prep_JOB_INFO_covmat(index_dict)
+            args_task = " ".join(job_info_covmat["arg_list"]).split()
+            task_list.append( {
+                'LOG_FILE'  : job_info_covmat['log_file'],
+                'DONE_FILE' : job_info_covmat['done_file'],
+                'ARGS'      : " ".join(args_task)
+            } )
+
+        n_job_cpu = len(task_list)
+        if n_job_cpu == 0 : return n_job_cpu
+
+        prefix_batch = f"{PREFIX_BATCH_FILES}_CPU{icpu:04d}"
+        task_file    = f"{prefix_batch}.TASKS"
+        with open(f"{script_dir}/{task_file}","wt") as t:
+            t.write(f"# {n_job_cpu} covmat tasks for CPU {icpu}\n")
+            yaml.dump({'TASK_LIST': task_list}, t, 
+                      default_flow_style=False, sort_keys=False)
+
+        JOB_INFO = {}
+        JOB_INFO['program']       = program
+        JOB_INFO['input_file']    = input_covmat_file
+        JOB_INFO['job_dir']       = script_dir
+        JOB_INFO['log_file']      = f"{prefix_batch}.LOG"
+        JOB_INFO['done_file']     = f"{prefix_batch}.DONE"
+        JOB_INFO['all_done_file'] = f"{output_dir}/{DEFAULT_DONE_FILE}"
+        JOB_INFO['kill_on_fail']  = kill_on_fail
+        JOB_INFO['arg_list']      = [ f"--batch_task_file {task_file}" ]
+        util.write_job_info(f, JOB_INFO, icpu)
+
+        # cpu 0 always has a task queue, so it gets the last merge process
+        # that waits for all DONE files.
+        n_job_tot  = self.config_prep['n_job_tot']
+        ijob_merge = n_job_tot if icpu == 0 else 1
+        job_info_merge = self.prep_JOB_INFO_merge(icpu,ijob_merge,False) 
+        util.write_jobmerge_info(f, job_info_merge, icpu)
+
+        return n_job_cpu
+        # end write_command_file_batch
+
     def prep_JOB_INFO_covmat(self,index_dict):
 
         icovmat = index_dict['icovmat']
@@ -446,6 +528,8 @@ class create_covmat(Program):
 
         # init outputs of function
         n_state_change     = 0
+        # Oct 2026: one directory read for all state checks below
+        snapshot = util.get_dir_snapshot(script_dir)
         row_list_merge_new = []
 
         nrow_check = 0
@@ -468,7 +552,8 @@ class create_covmat(Program):
 
                 # get list of LOG, DONE, and YAML files 
                 log_list, done_list, yaml_list = \
-                    util.get_file_lists_wildcard(script_dir,search_wildcard)
+                    util.get_file_lists_wildcard(script_dir,search_wildcard,
+                                                 snapshot=snapshot)
 
                 # careful to sum only the files that are NOT None
                 NLOG   = sum(x is not None for x in log_list)  
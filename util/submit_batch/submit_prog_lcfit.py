@@ -57,6 +57,12 @@
 # Sep 18 2024 M.Grayling, RK
 #    + check private_data_path for bayesn.
 #
+# Oct 2026
+#    + merge split TEXT tables with util.merge_table_TEXT_stream (no cat/awk)
+#      and take NEVT and nan counts from the same pass.
+#    + optional CONFIG key MERGE_TABLE_COLUMNAR to write parquet/feather twin.
+#    + optional CONFIG key JOB_CACHE_DIR to reuse unchanged split jobs.
+#
 # - - - - - - - - - -
 
 import os, sys, shutil, yaml, glob
@@ -171,6 +177,9 @@ PREFIX_MERGE = "MERGE"
 KEY_APPEND_TABLE_VARLIST  = "APPEND_TABLE_VARLIST"
 KEY_APPEND_TABLE_TEXTFILE = "APPEND_TABLE_TEXTFILE"
 
+# CONFIG key option to write columnar twin (PARQUET or FEATHER) of FITRES
+KEY_MERGE_TABLE_COLUMNAR  = "MERGE_TABLE_COLUMNAR"
+
 # prefix for short snana jobs to validate each version
 PREFIX_TEMP_SNANA = "TEMP_SNANA"
 
@@ -879,6 +888,10 @@ class LightCurveFit(Program):
         if LCFIT_SUBCLASS == LCFIT_SNANA:
             self.check_options_SNANA_table()
 
+        columnar_format = self.get_merge_table_columnar()
+        if columnar_format is not None:
+            logging.info(f"  Write {columnar_format} twin of merged FITRES")
+
         logging.info("")
 
         return
@@ -1208,6 +1221,10 @@ class LightCurveFit(Program):
                 'fitopt_num':fitopt_num }
             JOB_INFO['sym_link_list'] = self.get_sym_link_list(sym_link_dict)
         # - - - - - - - - 
+
+        # Oct 2026: optional reuse of identical job from previous submit
+        path_version = self.config_prep['path_version_list'][iver]
+        self.set_job_cache(JOB_INFO, prefix, [ f"{path_version}/{version}" ])
             
         return JOB_INFO
 
@@ -1422,6 +1439,8 @@ class LightCurveFit(Program):
 
         # init outputs of function
         n_state_change     = 0
+        # Oct 2026: one directory read for all state checks below
+        snapshot = util.get_dir_snapshot(script_dir)
         row_list_merge_new = []
 
         if MERGE_LAST:
@@ -1460,7 +1479,8 @@ class LightCurveFit(Program):
 
                 # get list of LOG, DONE, and YAML files 
                 log_list, done_list, yaml_list = \
-                    util.get_file_lists_wildcard(script_dir,search_wildcard)
+                    util.get_file_lists_wildcard(script_dir,search_wildcard,
+                                                 snapshot=snapshot)
 
                 # careful to sum only the files that are NOT None
                 NLOG   = sum(x is not None for x in log_list)  
@@ -1689,52 +1709,57 @@ class LightCurveFit(Program):
         flag_force_fail = \
             self.flag_force_merge_table_fail(itable,version_fitopt)
 
-        if flag_force_fail == FLAG_FORCE_MERGE_TABLE_CORRUPT :
-            table_wildcard += f(" {table_wildcard}") # double output
-
         # if no tables exist, bail out
         table_list = sorted(glob.glob1(script_dir,table_wildcard))
         if len(table_list) == 0 :
             return
 
-        # for FITRES table, check that all of the VARNAMES lists 
-        # are the same; else abort
-        if table_name == SUFFIX_FITRES :
-            self.check_table_varnames_TEXT(table_list)
-
-        # construct linux command to catenate TEXT files,
-        # and then a special awk command to remove all VARNAMES
-        # lines EXCEPT for the first VARNAMES line.
+        # Oct 2026: merge with native streaming catenation instead of
+        # 'cat' + awk; VARNAMES are collected in the same pass and the
+        # rows & nan are counted on the fly, so there is no extra read
+        # of the split tables or of the merged table.
         # Note that output extension is table name, not TEXT
-        cddir           = f"cd {script_dir}"
         out_table_file  = f"{prefix}_{version_fitopt}.{table_name}"
-        out_table_file2 = f"{prefix}2_{version_fitopt}.{table_name}" # for awk
+        OUT_TABLE_FILE  = f"{script_dir}/{out_table_file}"
+
+        if flag_force_fail == FLAG_FORCE_MERGE_TABLE_CORRUPT :
+            table_list += table_list  # double output
+
+        # optional columnar twin is written here only if the FITRES table 
+        # is not modified later by append options.
+        columnar_format = None
+        if table_name == SUFFIX_FITRES and not self.use_append_table():
+            columnar_format = self.get_merge_table_columnar()
 
-        cmd_cat  = f"cat {table_wildcard} > {out_table_file}"
-        cmd_awk  = f"awk '!/^VARNAMES/ || ++n <= 1' {out_table_file} > " \
-                   f"{out_table_file2} ; " \
-                   f"mv {out_table_file2} {out_table_file}"
+        cmd_all = f"merge_table_TEXT_stream({table_wildcard} -> " \
+                  f"{out_table_file})"
 
         msg = f"   merge {n_job_split} {suffix}-{table_name} table files."
         logging.info(msg)
 
+        merge_stats = None
         if flag_force_fail != FLAG_FORCE_MERGE_TABLE_MISSING :
             tref = datetime.datetime.now()
-            cmd_all = f"{cmd_cat} ; {cmd_awk}"
-            os.system(f"{cddir} ; {cmd_all}")
+            merge_stats = \
+                util.merge_table_TEXT_stream(script_dir, table_list, 
+                                             out_table_file, "SN:",
+                                             columnar_format=columnar_format)
             util.print_elapse_time(tref,f"merge {n_job_split} table files")
 
-        OUT_TABLE_FILE = f"{script_dir}/{out_table_file}"
         self.check_file_exists(OUT_TABLE_FILE,["Problem with table-merge"])
 
         # - - - - - -
-        # for FITRES table only, do unitarity check to make sure that 
-        # nevt_expect rows are really there. Also check options to 
+        # for FITRES table only, check that all of the VARNAMES lists 
+        # are the same (else abort), and do unitarity check to make sure 
+        # that nevt_expect rows are really there. Also check options to 
         # append variables to table.
 
         if table_name == SUFFIX_FITRES :
-            OUT_TABLE_FILE = f"{script_dir}/{out_table_file}"
-            nevt_find, n_nan = util.nrow_table_TEXT(OUT_TABLE_FILE,"SN:")
+            self.check_table_varnames_TEXT(table_list, 
+                                           merge_stats=merge_stats)
+
+            nevt_find = merge_stats['n_row']
+            n_nan     = merge_stats['n_nan']
             if n_nan > 0:
                 msgerr = [f"found {n_nan} nan in {OUT_TABLE_FILE}"]
                 self.log_assert(False,msgerr) 
@@ -1749,16 +1774,53 @@ class LightCurveFit(Program):
             self.append_table_varlist(version_fitopt_dict)  # optional
             self.append_table_textfile(version_fitopt_dict)  # optional
 
+            # columnar twin after append so that it includes appended vars
+            if self.use_append_table():
+                columnar_format = self.get_merge_table_columnar()
+                if columnar_format is not None:
+                    util.write_table_columnar(OUT_TABLE_FILE,columnar_format)
+
         return
         # end merge_table_TEXT
 
-    def check_table_varnames_TEXT(self,table_list):
+    def use_append_table(self):
+        # Created Oct 2026
+        # Returns True if merged FITRES table is modified by append options.
+        CONFIG = self.config_yaml['CONFIG']
+        key_list = [ KEY_APPEND_TABLE_VARLIST, KEY_APPEND_TABLE_TEXTFILE ]
+        for key in key_list:
+            if key in CONFIG : return True
+        return False
+        # end use_append_table
+
+    def get_merge_table_columnar(self):
+        # Created Oct 2026
+        # Return columnar format (PARQUET or FEATHER) for twin of merged
+        # FITRES table, or None if CONFIG key is not given.
+        # Abort on invalid format; called from fit_prep_table_options
+        # so that a bad value fails at submit instead of at merge.
+        CONFIG = self.config_yaml['CONFIG']
+        key    = KEY_MERGE_TABLE_COLUMNAR
+        if key not in CONFIG : return None
+
+        fmt = str(CONFIG[key]).upper()
+        if fmt not in COLUMNAR_FORMAT_LIST :
+            msgerr = [ f"Invalid {key}: {CONFIG[key]}",
+                       f"Valid formats are {COLUMNAR_FORMAT_LIST}" ]
+            self.log_assert(False,msgerr)
+        return fmt
+        # end get_merge_table_columnar
+
+    def check_table_varnames_TEXT(self,table_list, merge_stats=None):
 
         # Created Aug 31 2022
         # read VARNAMES list for each file in table_list,
         # and abort if any VARNAMES list differs from first table.
         # Beware that this works only for key (FITRES) format;
         # does not work for CSV formatted tables.
+        #
+        # Oct 2026: if merge_stats is passed from merge_table_TEXT_stream,
+        #   use its VARNAMES list instead of re-reading each table.
 
         submit_info_yaml = self.config_prep['submit_info_yaml']
         script_dir       = submit_info_yaml['SCRIPT_DIR']
@@ -1770,7 +1832,18 @@ class LightCurveFit(Program):
         VARNAMES_EMPTY = 'EMPTY'  # for empty file where 0 events pass
 
         varnames_list = []
-        for tb_file in table_list:
+        read_list     = table_list
+        if merge_stats is not None:
+            zip_list = zip(merge_stats['varnames_list'],
+                           merge_stats['nbyte_list'])
+            for varnames, nbyte in zip_list:
+                if nbyte == 0 :
+                    varnames_list.append(VARNAMES_EMPTY)
+                elif varnames is not None:
+                    varnames_list.append(varnames)
+            read_list = []  # skip reading tables below
+
+        for tb_file in read_list:
             tb_file_full = f"{script_dir}/{tb_file}"
             with open(tb_file_full,"rt") as t:
                 line_list = t.readlines()
@@ -2235,9 +2308,14 @@ class LightCurveFit(Program):
             wildcard = f"*SPLIT*{suffix}*"
             util.compress_files(+1, script_dir, wildcard,  suffix, "" )    
 
+        # Oct 2026: exclude optional columnar twins that are already 
+        #   compressed, and gzip in parallel with gzip service.
         logging.info(f" FIT cleanup: gzip merged tables.")
-        cmd_gzip = f"cd {output_dir} ; gzip */FITOPT* 2>/dev/null"
-        os.system(cmd_gzip)
+        suffix_skip = ( '.gz', '.parquet', '.feather' )
+        gzip_list   = [ f for f in glob.glob(f"{output_dir}/*/FITOPT*")
+                        if os.path.isfile(f) and not os.path.islink(f) and
+                        not f.endswith(suffix_skip) ]
+        util.gzip_files(gzip_list, GZIP_CLASS_TABLE, "merged table")
 
         self.merge_cleanup_script_dir() 
 
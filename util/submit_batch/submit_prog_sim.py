@@ -79,9 +79,16 @@
 #
 # Feb 20 2025: add TAKE_SPECTRUM to GENOPT_GLOBAL_IGNORE_SIMnorm
 #
+# Oct 2026: gzip FITS and DUMP files with parallel gzip service.
+# Oct 2026: NGEN_UNIT rate calculations run in parallel and are memoized;
+#           see get_ngentot_from_rate_all and RATECALC_CACHE_DIR.
+# Oct 2026: move sim data files with rename, stream DUMP merge, and gzip FITS
+#           + write MANIFEST (md5, size, rows) in background thread.
+#
 # ==========================================
 
-import os,sys,glob,yaml,shutil
+import os,sys,glob,yaml,shutil,fnmatch,time
+import concurrent.futures, threading, fcntl
 import logging
 #import coloredlogs
 
@@ -150,6 +157,10 @@ RANSEED_MAX = 1000000000   # 1 billion
 
 KEY_NGENTOT    = "NGENTOT_LC"
 
+# parallel/memoized INIT_ONLY rate calculations for NGEN_UNIT (Oct 2026)
+NJOB_RATECALC          = min(16, os.cpu_count() or 1)
+KEY_RATECALC_CACHE_DIR = "RATECALC_CACHE_DIR"
+
 # define valid row keys for SIMGEN dump file
 ROWKEY_SIMGEN_DUMP_LIST = [ 'SN:', 'ROW:' ]
 
@@ -162,6 +173,11 @@ class Simulation(Program):
         config_prep['program'] = PROGRAM_NAME_SIM
         super().__init__(config_yaml, config_prep)
 
+        # background threads for FITS gzip + manifest after data move,
+        # and their exceptions; key is target dir (Oct 2026)
+        self.move_thread_dict = {}
+        self.move_error_dict  = {}
+
     def set_output_dir_name(self):
         # check user-option LOGDIR; else default SIMLOGS_[GENPREFIX]
         # Since there is no explicit OUTDIR key in CONFIG, 
@@ -621,6 +637,14 @@ class Simulation(Program):
         else:
             ngen_unit = -1.0
             
+        # Oct 2026: run all rate calculations together (in parallel)
+        #   after GENOPT checks, instead of one at a time in loop below.
+        if ngen_unit >= 0.0 :
+            for iver in range(0,n_genversion):
+                for ifile in range(0,len(infile_list2d[iver])):
+                    dummy   = self.get_ngentot_from_input(iver,ifile,-1)
+            ngentmp_list2d = self.get_ngentot_from_rate_all()
+
         # print(f" xxx ngen_unit = {ngen_unit}" )
         ngentot_list2d    = []
         for iver in range(0,n_genversion):
@@ -630,8 +654,7 @@ class Simulation(Program):
                 if ngen_unit < 0.0 :
                     ngentot = self.get_ngentot_from_input(iver,ifile,+1)
                 else:
-                    dummy   = self.get_ngentot_from_input(iver,ifile,-1)
-                    ngentmp = self.get_ngentot_from_rate(iver,ifile) 
+                    ngentmp = ngentmp_list2d[iver][ifile]
                     ngentot = int(ngen_unit * ngentmp + 0.5)
 
                 # finally, check for fast option to divide by 10 or 100
@@ -728,7 +751,85 @@ class Simulation(Program):
         return genopt_replace, value
         # end extract_value_from_genopt
 
-    def get_ngentot_from_rate(self,iver,ifile):
+    def get_ngentot_from_rate_all(self):
+
+        # Created Oct 2026
+        # Return ngentot_list2d[iver][ifile] computed from rate for each
+        # GENVERSION x sim-input file (see prep_ngentot_from_rate).
+        # The INIT_ONLY sim jobs run concurrently (up to NJOB_RATECALC),
+        # and results are memoized with a hash of the sim-input file,
+        # INCLUDE files, GENOPT, GENOPT_GLOBAL and program:
+        #  + identical rate calculations within this submit run once
+        #  + optional CONFIG key RATECALC_CACHE_DIR stores SIMnorm LOG 
+        #    files to reuse in later submits.
+
+        CONFIG        = self.config_yaml['CONFIG']
+        infile_list2d = self.config_prep['infile_list2d']
+        n_genversion  = self.config_prep['n_genversion']
+
+        cache_dir = None
+        if KEY_RATECALC_CACHE_DIR in CONFIG:
+            cache_dir = os.path.expandvars(CONFIG[KEY_RATECALC_CACHE_DIR])
+            os.makedirs(cache_dir, exist_ok=True)
+
+        # prepare each command and find unique commands to run
+        info_list2d = []  ;  run_dict = {}
+        for iver in range(0,n_genversion):
+            info_list = []
+            for ifile in range(0,len(infile_list2d[iver])):
+                info = self.prep_ngentot_from_rate(iver,ifile)
+                info_list.append(info)
+                signature  = info['signature']
+                cache_file = f"{cache_dir}/SIMnorm_{signature}.LOG"
+                if signature in run_dict : continue
+                if cache_dir is not None and os.path.isfile(cache_file):
+                    info['cache_file'] = cache_file
+                    continue
+                run_dict[signature] = info
+            info_list2d.append(info_list)
+
+        # run unique rate calculations in parallel; each job is a 
+        # separate sim process, so threads are enough to launch them.
+        n_run = len(run_dict)
+        if n_run > 0 :
+            njob = min(n_run, NJOB_RATECALC)
+            logging.info(f"  Run {n_run} sim rate calculations " \
+                         f"({njob} at a time)")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=njob) \
+                 as pool:
+                cmd_list = [ info['cmd_string'] for info in run_dict.values()]
+                list(pool.map(os.system, cmd_list))
+
+        # read results; copy LOG files for memoized calculations
+        ngentot_list2d = []
+        for info_list in info_list2d:
+            ngentot_list = []
+            for info in info_list:
+                signature = info['signature']
+                info_run  = run_dict.get(signature,None)
+                if 'cache_file' in info:
+                    shutil.copyfile(info['cache_file'], info['LOG_FILE'])
+                    comment = "(from cache)"
+                elif info_run is not info :
+                    shutil.copyfile(info_run['LOG_FILE'], info['LOG_FILE'])
+                    comment = "(identical to another)"
+                else:
+                    comment = ""
+
+                ngentot = self.get_ngentot_from_rate(info)
+                logging.info(f"  Compute NGENTOT={ngentot:6d} for " \
+                             f"{info['prefix']} {comment}")
+                ngentot_list.append(ngentot)
+
+                if cache_dir is not None and comment == "" :
+                    cache_file = f"{cache_dir}/SIMnorm_{signature}.LOG"
+                    shutil.copyfile(info['LOG_FILE'], cache_file)
+            ngentot_list2d.append(ngentot_list)
+
+        return ngentot_list2d
+        # end get_ngentot_from_rate_all
+
+    def prep_ngentot_from_rate(self,iver,ifile):
 
         # Determine number of events to generate based on physical rate
         # or user-supplied NGENTOT_LC.
@@ -745,9 +846,10 @@ class Simulation(Program):
         # step, so we'll include those here. Should rarely, if ever,
         # make a difference, unless GENOPT change REDSHIFT, PEAKMJD,
         # or SOLID_ANGLE.
+        #
+        # Oct 2026: split from get_ngentot_from_rate; this function 
+        #   returns command info and hash signature without running sim.
         
-        msgerr        = []
-        key_ngentot   = "NGENTOT_RATECALC:"
         genversion    = self.config_prep['genversion_list'][iver]
         model         = self.config_prep['model_list2d'][iver][ifile] # SNIa or NONIa
         infile        = self.config_prep['infile_list2d'][iver][ifile]
@@ -756,6 +858,7 @@ class Simulation(Program):
         genopt_global = self.config_prep['genopt_global_SIMnorm']
         genopt        = self.config_prep['genopt_list2d'][iver][ifile]
         snana_dir     = self.config_yaml['args'].snana_dir
+        include_list  = self.config_prep['include_file_list_unique']
 
         # Aug 28 2024: check special JOBNAME option to use different code
         #   (e.g, older code version)
@@ -764,7 +867,6 @@ class Simulation(Program):
             genopt   = ''
         
         cddir         = f"cd {output_dir}"
-        ngentot       = 0
         
         model_string  = self.model_string_suffix(model,ifile)
         prefix        = f"SIMnorm_{genversion}_{model_string}"
@@ -790,9 +892,10 @@ class Simulation(Program):
         cmd_array.append(f"{cddir} ; ")
 
         if snana_dir is None :
-            cmd_array.append(f"{program} {infile} ")
+            program_path = program
         else:
-            cmd_array.append(f"{snana_dir}/bin/{program} {infile} ")
+            program_path = f"{snana_dir}/bin/{program}"
+        cmd_array.append(f"{program_path} {infile} ")
 
         cmd_array.append(f"{arg_list} ")
         cmd_array.append(f"> {log_file}")
@@ -803,8 +906,37 @@ class Simulation(Program):
             cmd_string += cmd
             cmd_stdout.append(f"  {cmd} \\")  # allows cut-and-paste
 
-        #print(f"{cmd_string}")
-        os.system(cmd_string)
+        # hash of everything that can change the rate calculation;
+        # sim-input and INCLUDE files were already copied to output_dir.
+        hash_file_list = [ f"{output_dir}/{os.path.basename(infile)}" ]
+        for inc_file in include_list:
+            hash_file_list.append(f"{output_dir}/{os.path.basename(inc_file)}")
+        # program hash is computed once per submit (not per GENVERSION)
+        program_hash = util.get_program_hash(program_path)
+        signature = util.get_file_hash(hash_file_list, 
+                                       f"{program_path} {program_hash} " \
+                                       f"{arg_list}")
+
+        info = {
+            'prefix'     : prefix,
+            'LOG_FILE'   : LOG_FILE,
+            'cmd_string' : cmd_string,
+            'cmd_stdout' : cmd_stdout,
+            'signature'  : signature
+        }
+        return info
+        # end prep_ngentot_from_rate
+
+    def get_ngentot_from_rate(self, info):
+
+        # Oct 2026: read NGENTOT_RATECALC from LOG_FILE created by 
+        #   command in info (from prep_ngentot_from_rate)
+
+        key_ngentot   = "NGENTOT_RATECALC:"
+        LOG_FILE      = info['LOG_FILE']
+        log_file      = os.path.basename(LOG_FILE)
+        cmd_stdout    = info['cmd_stdout']
+        ngentot       = 0
 
         # check if LOG_FILE is really there
         msgerr = []
@@ -836,8 +968,6 @@ class Simulation(Program):
             msgerr += cmd_stdout
             self.log_assert(False,msgerr)
             
-        logging.info(f"  Compute NGENTOT={ngentot:6d} for {prefix}")
-
         return ngentot
         # end get_ngentot_from_rate
 
@@ -1995,6 +2125,8 @@ class Simulation(Program):
 
         # init outputs of function
         n_state_change    = 0
+        # Oct 2026: one directory read for all state checks below
+        snapshot = util.get_dir_snapshot(simlog_dir)
         row_split_new     = []
         row_merge_new     = []
 
@@ -2018,7 +2150,8 @@ class Simulation(Program):
             if not Finished :
 
                 TMP_LOG_LIST, TMP_DONE_LIST, TMP_YAML_LIST = \
-                    util.get_file_lists_wildcard(simlog_dir,TMP_GENV)
+                    util.get_file_lists_wildcard(simlog_dir,TMP_GENV,
+                                                 snapshot=snapshot)
 
                 # DONE and YAML lists are forced to have same length 
                 # as LOG list, 
@@ -2224,43 +2357,169 @@ class Simulation(Program):
         # - - - - - - - - - - 
         # Move the FITS files, update [VERSION].LIST file, gzip FITS files.
         # Make sure to list the SNIa first, then NONIa, so that analysis 
-        # init is based on SNIa. 2>/dev/null suppresses linux error
-        # message when SNIa or NONIa FITS files are not there.
-        # 
-
-        cd_dir    = f"cd {target_dir}"
-        mv_FITS   = f"mv {from_dir}/*.FITS* ."
-        
-        tmp_FITS  = f"*{MODEL_SNIa}MODEL*HEAD.FITS*"
-        ls_SNIa   = f"ls {tmp_FITS}  >     {list_file} 2>/dev/null"
-
-        tmp_FITS  = f"*{MODEL_NONIa}MODEL*HEAD.FITS*"
-        ls_NONIa  = f"ls {tmp_FITS} >> {list_file} 2>/dev/null"
-
-        ls_LIST    = f"{ls_SNIa};  {ls_NONIa}"
-
-        #remove .gz extensions in LIST file
-        rm_gz      = f"sed -i 's/FITS.gz/FITS/g' {list_file}"
-
-        cmd     = f"{cd_dir}; {mv_FITS}; {ls_LIST}; {rm_gz} "
-
-        # gzip FITS files if not already gzipped.
-        if GZIP_DATA_FILES: 
-            fits_list = glob.glob1(target_dir,"*.FITS")
-            if len(fits_list) > 0 :  cmd += "; gzip *.FITS"
-
-        # - - - -
-        os.system(cmd)
+        # init is based on SNIa. 
+        # Oct 2026: 
+        #  + move with rename (no data copy) instead of shell 'mv'
+        #  + write LIST file in python
+        #  + stream TMP DUMP files into combined DUMP file 
+        #  + gzip FITS files and write MANIFEST in background thread so that
+        #    the merge BUSY lock is not held during the heavy I/O;
+        #    merge_job_wrapup waits for this thread (and for threads 
+        #    from other merge processes via MOVE_BUSY file).
+
+        fits_list = []
+        for FROM_FILE in sorted(glob.glob(f"{from_dir}/*.FITS*")):
+            TARGET_FILE = f"{target_dir}/{os.path.basename(FROM_FILE)}"
+            util.move_file(FROM_FILE, TARGET_FILE)
+            fits_list.append(TARGET_FILE)
+
+        self.write_sim_list_file(target_dir, list_file)
 
         # loop over TMP_*DUMP files and append combined DUMP file
-
+        dump_info_list = []
         for suffix, split_list in DUMP_FILE_LIST_DICT.items():
             merge_file    = DUMP_FILE_MERGE_DICT[suffix]
             for split_file in split_list:
-                self.append_merge_dump_file(split_file, merge_file)
+                n_row = self.append_merge_dump_file(split_file, merge_file)
+                dump_info_list.append( (os.path.basename(split_file), n_row) )
+
+        self.start_move_finish(target_dir, genversion_combine, 
+                               fits_list, dump_info_list, GZIP_DATA_FILES)
         return
         # end move_sim_data_files
 
+    def write_sim_list_file(self, target_dir, list_file):
+
+        # Created Oct 2026 (replaces 'ls' commands)
+        # Write list of HEAD files in target_dir; SNIa first, then NONIa.
+        # Remove .gz extension, and avoid duplicates in case gzip from
+        # another merge process is in progress (X.FITS and X.FITS.gz).
+
+        file_list = sorted(os.listdir(target_dir))
+        head_list = []
+        for model in [ MODEL_SNIa, MODEL_NONIa ] :
+            wildcard = f"*{model}MODEL*HEAD.FITS*"
+            for file_name in fnmatch.filter(file_list, wildcard):
+                head_list.append(file_name.replace(".FITS.gz",".FITS"))
+        head_list = list(dict.fromkeys(head_list))
+
+        with open(list_file,"wt") as f:
+            for head_file in head_list:
+                f.write(f"{head_file}\n")
+        return
+        # end write_sim_list_file
+
+    def start_move_finish(self, target_dir, genversion, fits_list,
+                          dump_info_list, gzip_flag):
+
+        # Created Oct 2026
+        # Start background thread to gzip FITS files and append MANIFEST;
+        # MOVE_BUSY file in target_dir signals other merge processes that
+        # data movement is still in progress. Threads are not daemons, 
+        # so this process does not exit before they finish.
+
+        n_busy    = sum(len(t) for t in self.move_thread_dict.values())
+        busy_file = f"{target_dir}/{PREFIX_MOVE_BUSY}_{os.getpid()}_{n_busy}"
+        with open(busy_file,"wt") as f:
+            f.write(f"{len(fits_list)} FITS files\n")
+
+        thread = threading.Thread(target=self.finish_move,
+                                  args=(target_dir, genversion, fits_list,
+                                        dump_info_list, gzip_flag, busy_file))
+        thread.start()
+        self.move_thread_dict.setdefault(target_dir,[]).append(thread)
+        return
+        # end start_move_finish
+
+    def finish_move(self, target_dir, genversion, fits_list,
+                    dump_info_list, gzip_flag, busy_file):
+
+        # Created Oct 2026
+        # Thread target: gzip FITS files with gzip service, then append
+        # checksum, size and number of rows for each file to
+        # [genversion].MANIFEST. DUMP rows have checksum '-' because
+        # the combined DUMP file is still growing.
+        # Exceptions are stored in move_error_dict and in a MOVE_FAIL 
+        # file (for other merge processes), and then reported by 
+        # wait_move_finish.
+        try:
+            if gzip_flag :
+                gz_list = [ f for f in fits_list if f.endswith('.FITS') ]
+                t_submit    = time.time()
+                future_list = util.gzip_files_async(gz_list, GZIP_CLASS_FITS)
+                util.wait_gzip_futures(future_list, "FITS", t_submit)
+                fits_list = [ f"{f}.gz" if f.endswith('.FITS') else f 
+                              for f in fits_list ]
+
+            pool = util.get_gzip_pool()
+            checksum_list = list(pool.map(util.get_file_checksum, fits_list))
+            nrow_list     = list(pool.map(util.get_fits_nrow,     fits_list))
+
+            lines = []
+            for fits_file, checksum, nrow in \
+                zip(fits_list, checksum_list, nrow_list):
+                nbyte = os.path.getsize(fits_file)
+                lines.append(f"FILE: {os.path.basename(fits_file)} " \
+                             f"{nbyte} {nrow} {checksum}\n")
+            for dump_file, nrow in dump_info_list:
+                lines.append(f"FILE: {dump_file} -1 {nrow} -\n")
+
+            # file lock serializes threads and merge processes; header
+            # is written only if file is empty after lock is acquired.
+            manifest_file = f"{target_dir}/{genversion}.{SUFFIX_MANIFEST}"
+            with open(manifest_file,"at") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                if f.seek(0, os.SEEK_END) == 0 :
+                    f.write(f"VARNAMES: FILE NBYTE NROW MD5\n")
+                f.write("".join(lines))
+                f.flush()
+                fcntl.flock(f, fcntl.LOCK_UN)
+        except Exception as e:
+            logging.exception(e)
+            msg = f"{type(e).__name__}: {e}"
+            self.move_error_dict.setdefault(target_dir,[]).append(msg)
+            fail_file = busy_file.replace(PREFIX_MOVE_BUSY, PREFIX_MOVE_FAIL)
+            with open(fail_file,"wt") as f:
+                f.write(f"{msg}\n")
+        finally:
+            os.remove(busy_file)
+        return
+        # end finish_move
+
+    def wait_move_finish(self, target_dir):
+
+        # Created Oct 2026
+        # Wait for background data movement to target_dir:
+        # threads from this process, then MOVE_BUSY files from any process.
+        # Abort if any thread (from any process) failed.
+
+        for thread in self.move_thread_dict.pop(target_dir,[]) :
+            thread.join()
+
+        wildcard = f"{target_dir}/{PREFIX_MOVE_BUSY}_*"
+        t_start  = time.time()
+        while len(glob.glob(wildcard)) > 0 :
+            if time.time() - t_start > TMAX_WAIT_MOVE_BUSY :
+                logging.warning(f"WARNING: ignore stale {wildcard}")
+                break
+            time.sleep(2)
+
+        # error messages from this process, or from MOVE_FAIL files
+        # written by threads in other merge processes
+        msg_list = self.move_error_dict.pop(target_dir,[])
+        for fail_file in glob.glob(f"{target_dir}/{PREFIX_MOVE_FAIL}_*"):
+            with open(fail_file,"rt") as f:
+                msg = f.read().strip()
+            if msg not in msg_list : msg_list.append(msg)
+
+        if len(msg_list) > 0 :
+            msgerr = [ f"Failed to gzip FITS and write MANIFEST in",
+                       f"   {target_dir}" ]
+            msgerr += [ f"   {msg}" for msg in msg_list ]
+            self.log_assert(False, msgerr)
+        return
+        # end wait_move_finish
+
     def get_readme_file_name(self,simdir):
         
         submit_info_yaml = self.config_prep['submit_info_yaml']
@@ -2280,6 +2539,8 @@ class Simulation(Program):
         # read input dump_split_file and save the lines
         # with "SN:" key. Append these SN lines to already
         # existing dump_file.
+        # Oct 2026: stream lines with large buffers instead of storing 
+        #           all lines; return number of rows appended.
 
         # make sure both dump files exist
         msgerr = []
@@ -2290,20 +2551,17 @@ class Simulation(Program):
         util.check_file_exists(dump_file,msgerr)
 
         # - - - - 
-        lines_SN = []
-        with open (dump_split_file,"r") as f :
-            for line in f:
-                word_list = line.split()
-                if len(word_list) > 0 :
-                    if word_list[0] in ROWKEY_SIMGEN_DUMP_LIST :
-                        lines_SN.append(line)
-
-#         nline_SN = len(lines_SN)
-#         print(f" xxx grab {nline_SN} lines from {dump_split_file} ")
-
-        with open (dump_file,"a") as f :
-            f.write("".join(lines_SN) )
-
+        rowkey_list = tuple(ROWKEY_SIMGEN_DUMP_LIST)
+        n_row = 0
+        with open (dump_split_file,"r", buffering=BUFSIZE_MERGE_TABLE) as f_in,\
+             open (dump_file,"a", buffering=BUFSIZE_MERGE_TABLE) as f_out :
+            for line in f_in:
+                word_list = line.split(None,1)
+                if len(word_list) > 0 and word_list[0] in rowkey_list :
+                    f_out.write(line)
+                    n_row += 1
+
+        return n_row
         # end update_merge_dump_file
 
     def create_simgen_dump_file(self,dump_file_template,dump_file):
@@ -2387,15 +2645,22 @@ class Simulation(Program):
         if BLIND:
             self.merge_write_blind_readme(readme_file)
             
-        # gzip DUMP files. (Apr 2024)
+        # gzip DUMP files. (Apr 2024; parallel gzip service Oct 2026)
+        dump_list = []
         for suffix in SUFFIX_DUMP_LIST:
             dump_file = f"{path_genv}/{genversion}.{suffix}"
             if os.path.exists(dump_file):
-                cmd_gzip = f"gzip {dump_file}"
-                os.system(cmd_gzip)
+                dump_list.append(dump_file)
+        util.gzip_files(dump_list, GZIP_CLASS_TABLE, "DUMP")
                 
         # move README files to misc/ for REPEAT only
         os.mkdir(misc_dir)
+
+        # wait for background FITS gzip, then move MANIFEST to misc/
+        self.wait_move_finish(path_genv)
+        manifest_file = f"{path_genv}/{genversion}.{SUFFIX_MANIFEST}"
+        if os.path.exists(manifest_file):
+            shutil.move(manifest_file, misc_dir)
         TMP_GENV_LIST = []
         for row in row_list_split :
             if iver == row[COLNUM_SIM_MERGE_IVER] :
@@ -2430,11 +2695,7 @@ class Simulation(Program):
         # other jobs in progress.
         if cleanup_flag :
             # first tar up misc dir
-            tar      = f"tar -cf {misc_subdir}.tar {misc_subdir} "
-            gzip     = f"gzip {misc_subdir}.tar"
-            rm       = f"rm -r {misc_subdir}"
-            clean    = f"cd {path_genv}; {tar}; {gzip}; {rm}"
-            os.system(clean)
+            util.compress_subdir(+1, f"{path_genv}/{misc_subdir}")
 
             msg = f"\t Remove TMP_ GENVERSIONs"
             logging.info(msg)
@@ -10,15 +10,32 @@
 # Sep 26 2022: in nrow_table_TEXT(), check for nan
 # Mar 18 2023: add gzip_list_by_chunks
 # Nov    2024: add diagnostices  in read_merge_file if merge_log cannot be opened.
+# Oct    2026: add merge_table_TEXT_stream to merge TEXT tables without cat/awk.
+# Oct    2026: add cat_fitres_native (python version of SALT2mu cat_only)
+# Oct    2026: add gzip thread-pool service (gzip_files) used by 
+#              gzip_list_by_chunks, compress_files and compress_subdir.
+# Oct    2026: add timeline tracing (append_timeline, write_timeline_trace)
+# Oct    2026: add get_dir_snapshot for get_file_lists_wildcard
+# Oct    2026: extract_yaml uses CSafeLoader; add read_yaml_cached
+# Oct    2026: optional job cache in write_job_info (get_job_cache_key)
+# Oct    2026: nrow_table_TEXT reads in chunks; also reads gzipped table.
+# Oct    2026: add move_file, get_file_checksum, get_fits_nrow for sim 
+#              data movement.
+# Oct    2026: add extract_yaml_list (parallel read of yaml files)
 #
 # ==============================================
 
 import os, sys, yaml, shutil, glob, math, ntpath, re
 import logging, subprocess, tarfile, pathlib
+import gzip, queue, threading, hashlib, concurrent.futures, json, io
+import bisect, fnmatch, pickle
 #import coloredlogs
 import pandas as pd
 from   submit_params import *
 
+# use C-accelerated yaml loader if libyaml is available (Oct 2026)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 # =================================================
 
 def print_elapse_time(t0,comment):
@@ -445,7 +462,6 @@ def compress_files(flag, dir_name, wildcard, name_backup, wildcard_keep ):
 
     if flag > 0 :
         cmd_tar  = f"tar -cf {tar_file} {wildcard} "
-        cmd_gzip = f"gzip {tar_file}"
 
         if len(wildcard_keep) == 0 :
             cmd_rm   = f"rm {wildcard}"
@@ -454,7 +470,10 @@ def compress_files(flag, dir_name, wildcard, name_backup, wildcard_keep ):
             cmd_rm = f"find {wildcard} ! -name '{wildcard_keep}' " + \
                      "-type f -exec rm {} +"
 
-        cmd_all  = f"{cddir} ; {cmd_tar} ; {cmd_gzip} ; {cmd_rm} "
+        # Oct 2026: gzip with compression service instead of gzip shell
+        os.system(f"{cddir} ; {cmd_tar}")
+        gzip_files([f"{dir_name}/{tar_file}"], GZIP_CLASS_TAR, tar_file)
+        cmd_all  = f"{cddir} ; {cmd_rm} "
     else:
         cmd_unpack = f"tar -xzf {targz_file}"
         cmd_rm     = f"rm {targz_file}"
@@ -490,10 +509,10 @@ def compress_subdir(flag,dir_name):
 
     if flag > 0:  # compress
         cmd_tar    = f"tar -cf {tar_file} {subdir_name}"
-        cmd_gzip   = f"gzip {tar_file}"
         cmd_rmdir  = f"rm -rf {subdir_name}"
-        cmd_all    = f"{cddir} ; {cmd_tar}; {cmd_gzip} ; {cmd_rmdir}"
-        os.system(cmd_all)
+        os.system(f"{cddir} ; {cmd_tar}")
+        gzip_files([f"{topdir_name}/{tar_file}"], GZIP_CLASS_TAR, tar_file)
+        os.system(f"{cddir} ; {cmd_rmdir}")
     else:  # uncompress if tar file exists
         exist_tar = os.path.exists(f"{topdir_name}/{targz_file}")
         if exist_tar :
@@ -516,55 +535,17 @@ def gzip_list_by_chunks(topdir, file_spec, nchunk):
     #       e.g., */INPUT/FITOPT*.FITRES
     #   nchunk : number of chunks to gzip in parallel
     #
+    # Oct 2026: use gzip thread pool (gzip_files) and wait on futures
+    #    instead of background gzip shells and polling for .gz files.
+    #    nchunk is no longer used; see NTHREAD_GZIP_POOL.
 
     f_posix_list = list(pathlib.Path(topdir).rglob(file_spec))
 
     # remake list without the silly posix('...')
-    f_list = []
-    for item in f_posix_list:
-        f_list.append(os.fspath(item))
-
-    len_list = len(f_list)
-    chunk_list = []
-    for i in range(0, len_list, nchunk):
-        chunk      = f_list[i:i + nchunk]
-        chunk_list.append(chunk)
-
-    # do the chhunks in reverse order to ensure that the last one launched
-    # has full number of files to gzip because this is the one with ampersand
-    # that we wait for. E.g., if the number of files per chunk is 10 10 10 2,
-    # submitting in normal order means that the last chunk of 2 finishes quickly
-    # before the other chunks of 10 files. Submitting in reverse order means
-    # that we wait on 10 files to gzip.
-
-    n_chunk = len(chunk_list)
-    for chunk in reversed(chunk_list):
-        nfile_gzip = len(chunk)
-        logging.info(f"\t gzip {nfile_gzip} files from {file_spec}")
-
-        gzip_cmd = "gzip " + " ".join(chunk) 
-        if  chunk == chunk_list[0] :
-            logging.info(f"\t (waiting on last gzip)")
-        else:
-            gzip_cmd += ' & '
-
-        os.system(gzip_cmd)
-        #print(f" xxx gzip_cmd = {gzip_cmd}")
-
-    # wait until all gzip files exist
-    done_gzip = False
-    t_sleep   = 2
-    t_wait    = 0
-    while not done_gzip:
-        time.sleep(t_sleep)
-        t_wait += t_sleep 
-        n_gzip = 0
-        for f in f_list:
-            gzip_file = f"{f}.gz"
-            if os.path.exists(gzip_file): n_gzip += 1
-        logging.info(f"\t Found {n_gzip} of {len_list} gzipped INPUT files.")
-        if n_gzip == len_list: 
-            done_gzip = True
+    f_list = [ os.fspath(item) for item in f_posix_list ]
+
+    logging.info(f"\t gzip {len(f_list)} files from {file_spec}")
+    gzip_files(f_list, GZIP_CLASS_TABLE, file_spec)
 
     return
     # end gzip_list_by_chunks
@@ -590,7 +571,33 @@ def untar_script_dir(script_dir):
     return
     # end untar_script_dir
  
-def get_file_lists_wildcard(search_dir, search_wildcard):
+def get_dir_snapshot(search_dir):
+
+    # Created Oct 2026
+    # Single os.scandir pass over search_dir to index LOG, DONE and YAML
+    # files; returned snapshot is passed to get_file_lists_wildcard so
+    # that all state checks within one merge process query memory
+    # instead of doing glob + stat calls per job (very slow on 
+    # Lustre/GPFS with many split jobs).
+
+    file_set = set()
+    with os.scandir(search_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name[0] == '.' : continue   # same as glob
+            if not name.endswith(SUFFIX_SNAPSHOT_LIST) : continue
+            if entry.is_file():  file_set.add(name)
+
+    log_list = sorted([ f for f in file_set if f.endswith('.LOG') ])
+    snapshot = {
+        'search_dir' : search_dir,
+        'file_set'   : file_set,
+        'log_list'   : log_list
+    }
+    return snapshot
+    # end get_dir_snapshot
+
+def get_file_lists_wildcard(search_dir, search_wildcard, snapshot=None):
 
     # for input search_wildcard, search for the following file lists:
     #    {search_dir}/{search_wildcard}.LOG
@@ -612,10 +619,27 @@ def get_file_lists_wildcard(search_dir, search_wildcard):
     # Mar 25 2021: find last dot (with .rindex) instead of first dot
     #              to allow for dot in version name.
     #
+    # Oct 2026: optional snapshot from get_dir_snapshot(search_dir) 
+    #           replaces glob and stat calls with in-memory lookup.
+    #
 
     # search .LOG first to define list.
     search_log = f"{search_wildcard}.LOG"
-    log_list   = sorted(glob.glob1(search_dir, f"{search_log}") )
+    if snapshot is None:
+        log_list   = sorted(glob.glob1(search_dir, f"{search_log}") )
+        file_set   = None
+    else:
+        # bisect sorted LOG list on literal prefix before first wildcard
+        snap_list  = snapshot['log_list']
+        file_set   = snapshot['file_set']
+        prefix     = re.split(r'[\*\?\[]', search_log, maxsplit=1)[0]
+        i0         = bisect.bisect_left(snap_list, prefix)
+        log_list   = []
+        for log_file in snap_list[i0:] :
+            if not log_file.startswith(prefix) : break
+            if fnmatch.fnmatchcase(log_file, search_log) :
+                log_list.append(log_file)
+
     done_list = []
     yaml_list = []
 
@@ -629,9 +653,16 @@ def get_file_lists_wildcard(search_dir, search_wildcard):
 
         yaml_file = f"{prefix}.YAML"
         YAML_FILE = f"{search_dir}/{yaml_file}"
-        if not os.path.isfile(DONE_FILE) :
+        if file_set is None :
+            exist_done = os.path.isfile(DONE_FILE)
+            exist_yaml = os.path.isfile(YAML_FILE)
+        else:
+            exist_done = done_file in file_set
+            exist_yaml = yaml_file in file_set
+
+        if not exist_done :
             done_file = None
-        if not os.path.isfile(YAML_FILE) :
+        if not exist_yaml :
             yaml_file = None
                 
         done_list.append(done_file)
@@ -649,16 +680,579 @@ def nrow_table_TEXT(table_file, row_key):
     # Sep 26 2022: also check for number of nan.
     # Nov 28 2022: add pad spaces to search ' nan ' instead of "nan"
     #              to avoid false nan for words like "snana"
+    # Oct 2026: read in chunks of BUFSIZE_MERGE_TABLE bytes instead of 
+    #    reading entire file into memory; gzipped table_file is 
+    #    decompressed on the fly. Each chunk is cut after its last 
+    #    newline and the partial line is carried into the next chunk;
+    #    search strings never contain newline, so counts are the same
+    #    as counting on the full file.
+
+    nan_list     = [ b' nan ', b' NaN ' ]
+    row_key_byte = row_key.encode()
+    n_row = 0 ;  n_nan = 0 ;  carry = b''
+
+    if table_file.endswith('.gz') :
+        f = gzip.open(table_file, "rb")
+    else:
+        f = open(table_file, "rb", buffering=0)
 
-    with open(table_file,"rt") as f:
-        lines  = f.read()
-        n_row  = lines.count(row_key)
-        n_nan  = lines.count(" nan ")  
-        n_nan += lines.count(" NaN ")
+    with f:
+        while True:
+            chunk = f.read(BUFSIZE_MERGE_TABLE)
+            if not chunk :
+                data = carry
+            else:
+                data  = carry + chunk
+                icut  = data.rfind(b'\n') + 1
+                carry = data[icut:]
+                data  = data[:icut]
+
+            n_row += data.count(row_key_byte)
+            for nan in nan_list:  n_nan += data.count(nan)
+            if not chunk : break
 
     return n_row, n_nan
 
-    # end nrow_table_TEXT   
+    # end nrow_table_TEXT
+
+def merge_table_TEXT_stream(table_dir, table_list, out_table_file, row_key,
+                            gzip_twin=False, columnar_format=None):
+
+    # Created Oct 2026
+    # Native replacement for 'cat + awk' merge of split-job TEXT tables.
+    # Single streaming pass over table_list that
+    #   + writes {table_dir}/{out_table_file} keeping only first VARNAMES line
+    #   + counts rows with row_key, and ' nan ' / ' NaN ', on the fly;
+    #     same counts as nrow_table_TEXT, but without re-reading output.
+    #   + stores VARNAMES string for each input table so that caller can
+    #     validate VARNAMES without another read of the split tables.
+    #
+    # Optional outputs, each fed the same byte chunks by queue and
+    # written in a parallel thread while catenating:
+    #   gzip_twin = True -> also write {out_table_file}.gz
+    #   columnar_format  -> PARQUET or FEATHER twin of merged table
+    #                       (see write_table_columnar)
+    # Exceptions in these threads are re-raised here via future.result()
+    # so that a failed twin aborts the merge instead of being lost.
+    #
+    # Function returns merge_stats dictionary with
+    #   n_row, n_nan, varnames_list (None if no VARNAMES), nbyte_list
+    #
+
+    OUT_TABLE_FILE = f"{table_dir}/{out_table_file}"
+    key_varnames   = b'VARNAMES:'
+    nan_list       = [ b' nan ', b' NaN ' ]
+    row_key_byte   = row_key.encode()
+
+    n_row = 0;  n_nan = 0;  found_varnames = False
+    varnames_list = []
+    nbyte_list    = []
+
+    # each twin is fed by its own queue so that compression and
+    # columnar conversion run in parallel with reading the split tables.
+    # feed_list holds [queue, future] for each twin.
+    feed_list = []
+    executor  = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    if gzip_twin :
+        gzip_queue  = queue.Queue(maxsize=NQUEUE_MERGE_TABLE)
+        future = executor.submit(write_gzip_from_queue,
+                                 f"{OUT_TABLE_FILE}.gz", gzip_queue)
+        feed_list.append([gzip_queue, future])
+
+    if columnar_format is not None:
+        col_queue = queue.Queue(maxsize=NQUEUE_MERGE_TABLE)
+        future = executor.submit(write_table_columnar,
+                                 OUT_TABLE_FILE, columnar_format,
+                                 chunk_queue=col_queue)
+        feed_list.append([col_queue, future])
+
+    buf_list = [] ; nbyte_buf = 0
+    with open(OUT_TABLE_FILE,"wb", buffering=BUFSIZE_MERGE_TABLE) as f_out:
+        for table_file in table_list:
+            varnames = None ; nbyte = 0
+            TABLE_FILE = f"{table_dir}/{table_file}"
+            with open(TABLE_FILE,"rb", buffering=BUFSIZE_MERGE_TABLE) as f_in:
+                for line in f_in:
+                    nbyte += len(line)
+                    if varnames is None and key_varnames in line :
+                        varnames = line.split(key_varnames)[1].decode()
+
+                    # same logic as awk '!/^VARNAMES/ || ++n <= 1'
+                    if line.startswith(b'VARNAMES') :
+                        if found_varnames : continue
+                        found_varnames = True
+
+                    n_row += line.count(row_key_byte)
+                    for nan in nan_list:  n_nan += line.count(nan)
+
+                    buf_list.append(line)
+                    nbyte_buf += len(line)
+                    if nbyte_buf > BUFSIZE_MERGE_TABLE :
+                        chunk = b''.join(buf_list)
+                        f_out.write(chunk)
+                        feed_chunk_queues(feed_list, chunk)
+                        buf_list = [] ; nbyte_buf = 0
+
+            varnames_list.append(varnames)
+            nbyte_list.append(nbyte)
+
+        # flush remaining buffer, then signal end of stream
+        chunk = b''.join(buf_list)
+        f_out.write(chunk)
+        feed_chunk_queues(feed_list, chunk)
+        feed_chunk_queues(feed_list, None)
+
+    executor.shutdown(wait=True)
+    for chunk_queue, future in feed_list:
+        try:
+            future.result()
+        except Exception as e:
+            msgerr = [ f"Failed writing twin of {OUT_TABLE_FILE}",
+                       f"{type(e).__name__}: {e}" ]
+            log_assert(False,msgerr)
+
+    merge_stats = {
+        'n_row'         : n_row,
+        'n_nan'         : n_nan,
+        'varnames_list' : varnames_list,
+        'nbyte_list'    : nbyte_list
+    }
+
+    return merge_stats
+    # end merge_table_TEXT_stream
+
+def feed_chunk_queues(feed_list, chunk):
+    # Created Oct 2026
+    # put chunk on each [queue, future] in feed_list.
+    # If consumer thread has already finished (error, or skipped twin),
+    # stop feeding it so that a full queue cannot block the merge;
+    # any exception is re-raised later by future.result().
+    for feed in feed_list:
+        chunk_queue, future = feed
+        if chunk_queue is None : continue
+        while True:
+            if future.done() :
+                feed[0] = None ; break
+            try:
+                chunk_queue.put(chunk, timeout=1.0)
+                break
+            except queue.Full:
+                pass
+    return
+    # end feed_chunk_queues
+
+class ChunkQueueReader(io.RawIOBase):
+    # Created Oct 2026
+    # read-only file object over byte chunks from a queue (None = EOF),
+    # so that pandas can parse the merged table while it is written.
+    def __init__(self, chunk_queue):
+        self.chunk_queue = chunk_queue
+        self.buf = b''
+        self.eof = False
+    def readable(self):
+        return True
+    def readinto(self, b):
+        while not self.buf and not self.eof :
+            chunk = self.chunk_queue.get()
+            if chunk is None : self.eof = True
+            else:              self.buf = chunk
+        n = min(len(b), len(self.buf))
+        b[:n] = self.buf[:n]
+        self.buf = self.buf[n:]
+        return n
+    # end ChunkQueueReader
+
+def write_gzip_from_queue(gzip_file, chunk_queue):
+    # Created Oct 2026
+    # write byte chunks from chunk_queue into gzip_file until
+    # None is received. Used as thread target to compress
+    # while another thread produces the chunks.
+    with gzip.open(gzip_file, "wb", compresslevel=GZIP_LEVEL_MERGE_TABLE) as g:
+        while True:
+            chunk = chunk_queue.get()
+            if chunk is None: break
+            g.write(chunk)
+    return
+    # end write_gzip_from_queue
+
+def write_table_columnar(table_file, columnar_format, chunk_queue=None):
+
+    # Created Oct 2026
+    # Read SNANA key-format TEXT table (VARNAMES: + SN: rows) and write
+    # columnar twin {table_file}.parquet or {table_file}.feather.
+    # If chunk_queue is given, parse byte chunks from queue as they are
+    # merged (see merge_table_TEXT_stream) instead of re-reading table_file.
+    # Requires pyarrow; if pyarrow is not available, give warning
+    # and skip because the TEXT table remains the primary output.
+
+    fmt = columnar_format.upper()
+    if fmt not in COLUMNAR_FORMAT_LIST :
+        msgerr = [ f"Invalid columnar format '{columnar_format}'",
+                   f"Valid formats are {COLUMNAR_FORMAT_LIST}" ]
+        log_assert(False,msgerr)
+
+    try:
+        import pyarrow
+    except ImportError:
+        logging.warning(f"WARNING: cannot import pyarrow -> " \
+                        f"skip {fmt} twin for {table_file}")
+        return
+
+    if chunk_queue is None :
+        f_in = table_file
+    else:
+        f_in = io.BufferedReader(ChunkQueueReader(chunk_queue),
+                                 buffer_size=BUFSIZE_MERGE_TABLE)
+
+    df = pd.read_csv(f_in, comment="#", sep=r'\s+')
+    df = df.drop(columns=['VARNAMES:'], errors='ignore')
+
+    out_file = f"{table_file}.{fmt.lower()}"
+    if fmt == COLUMNAR_FORMAT_PARQUET :
+        df.to_parquet(out_file, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(out_file)
+
+    return
+    # end write_table_columnar
+
+def open_table_TEXT(table_file, mode="rt"):
+    # Created Oct 2026
+    # open table_file or table_file.gz, whichever exists.
+    # Same convention as SNANA C code: caller need not know if gzipped.
+    if not os.path.isfile(table_file) and os.path.isfile(f"{table_file}.gz"):
+        table_file = f"{table_file}.gz"
+    if table_file.endswith(".gz") :
+        return gzip.open(table_file, mode)
+    else:
+        return open(table_file, mode, buffering=BUFSIZE_MERGE_TABLE)
+    # end open_table_TEXT
+
+def get_cat_fitres_signature(inp_file_list, varname_append):
+
+    # Created Oct 2026
+    # Return hash string that changes if any input file changes,
+    # or if the list of append-varnames changes.
+    # Each input is resolved with realpath so that sym links
+    # (e.g., LCFIT FITOPTs linked to FITOPT000) give the same signature.
+
+    sig_list = [ varname_append ]
+    for inp_file in inp_file_list:
+        if not os.path.exists(inp_file) : inp_file += '.gz'
+        real_file = os.path.realpath(inp_file)
+        st        = os.stat(real_file)
+        sig_list.append(f"{real_file} {st.st_size} {st.st_mtime_ns}")
+
+    sig_string = '\n'.join(sig_list)
+    return hashlib.md5(sig_string.encode()).hexdigest()
+    # end get_cat_fitres_signature
+
+def get_file_hash(file_list, extra_string):
+
+    # Created Oct 2026
+    # Return md5 hash of the contents of each file in file_list
+    # and extra_string (e.g., command-line arguments).
+    md5 = hashlib.md5(extra_string.encode())
+    for file_name in file_list:
+        md5.update(file_name.encode())
+        if not os.path.isfile(file_name) : continue
+        with open(file_name,"rb") as f:
+            for chunk in iter(lambda: f.read(BUFSIZE_MERGE_TABLE), b''):
+                md5.update(chunk)
+    return md5.hexdigest()
+    # end get_file_hash
+
+PROGRAM_HASH_DICT = {}   # memoized program hash for this submit process
+
+def get_program_hash(program):
+    # Created Oct 2026
+    # Return md5 hash of program executable (found in PATH), computed
+    # only once per process because executables can be large.
+    if program not in PROGRAM_HASH_DICT:
+        program_which = shutil.which(program)
+        if program_which is None:
+            PROGRAM_HASH_DICT[program] = 'MISSING'
+        else:
+            PROGRAM_HASH_DICT[program] = get_file_hash([program_which], '')
+    return PROGRAM_HASH_DICT[program]
+    # end get_program_hash
+
+def get_file_checksum(file_name):
+    # Created Oct 2026
+    # return md5 checksum of file contents (same as md5sum)
+    md5 = hashlib.md5()
+    with open(file_name,"rb") as f:
+        for chunk in iter(lambda: f.read(BUFSIZE_MERGE_TABLE), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+    # end get_file_checksum
+
+def get_fits_nrow(fits_file):
+    # Created Oct 2026
+    # Return number of rows (NAXIS2) in first extension of FITS table,
+    # or -1 if not found. Only header blocks are read (gzip is 
+    # decompressed on the fly), so no FITS library is needed.
+
+    nbyte_block = 2880 ;  nbyte_card = 80
+    ihdu  = 0 ;  bitpix = 8 ;  naxis_list = []
+    if fits_file.endswith('.gz') :
+        f = gzip.open(fits_file,"rb")
+    else:
+        f = open(fits_file,"rb")
+
+    with f:
+        while True:
+            block = f.read(nbyte_block)
+            if len(block) < nbyte_block : return -1
+            found_end = False
+            for i in range(0, nbyte_block, nbyte_card):
+                card  = block[i:i+nbyte_card]
+                key   = card[0:8].strip()
+                value = card[10:].split(b'/')[0].strip()
+                if ihdu == 1 and key == b'NAXIS2' :
+                    return int(value)
+                if ihdu == 0 and key == b'BITPIX' :
+                    bitpix = int(value)
+                if ihdu == 0 and key.startswith(b'NAXIS') and key != b'NAXIS':
+                    naxis_list.append(int(value))
+                if key == b'END' :
+                    found_end = True ; break
+
+            if found_end and ihdu == 0 :
+                # skip primary data (usually none for SNANA tables)
+                nbyte_data = 0
+                if len(naxis_list) > 0 :
+                    nbyte_data = abs(bitpix)//8 * math.prod(naxis_list)
+                nblock = (nbyte_data + nbyte_block - 1) // nbyte_block
+                f.read(nblock*nbyte_block)
+                ihdu += 1
+            elif found_end :
+                return -1
+    # end get_fits_nrow
+
+def move_file(from_file, to_file):
+    # Created Oct 2026
+    # Move file with rename, which is instant and does not copy data 
+    # on the same file system; fall back to copy if rename fails 
+    # (e.g., target is on another file system).
+    try:
+        os.rename(from_file, to_file)
+    except OSError:
+        shutil.move(from_file, to_file)
+    # end move_file
+
+def read_varnames_cat_fitres(table_file):
+    # Created Oct 2026
+    # return list of VARNAMES (without VARNAMES: key) in table_file.
+    # Note that BBC-appended variables (CUTMASK, MU, MUMODEL ...)
+    # are chopped, same as SALT2mu cat_only, to allow recycling BBC output.
+    with open_table_TEXT(table_file) as f:
+        for line in f:
+            if line.startswith('VARNAMES:'):
+                varnames = line.split()[1:]
+                for j, var in enumerate(varnames):
+                    if var in VARNAMES_BBC_RECYCLE:
+                        return varnames[0:j]
+                return varnames
+    return []
+    # end read_varnames_cat_fitres
+
+def get_varnames_cat_fitres(varnames_list, varname_append):
+
+    # Created Oct 2026
+    # Python version of SALT2mu store_output_varnames for cat_only:
+    #  + keep every column in first file that appears in every file
+    #  + then for each varname_append item (comma-sep, * = wildcard),
+    #    keep columns in subset of files; missing values are filled later.
+    # Order follows the C code so that outputs are identical.
+
+    varnames_out = []
+    for var in varnames_list[0] :
+        if all(var in vlist for vlist in varnames_list):
+            varnames_out.append(var)
+
+    for item in varname_append.split(','):
+        item = item.strip()
+        if len(item) == 0 : continue
+        wildcard = '*' in item
+        item     = item.replace('*','')
+        for vlist in varnames_list:
+            for var in vlist:
+                if var in varnames_out : continue
+                if wildcard :
+                    match = item in var
+                else:
+                    match = (var == item)
+                if match : varnames_out.append(var)
+
+    return varnames_out
+    # end get_varnames_cat_fitres
+
+def cat_fitres_native(cat_info):
+
+    # Created Oct 2026
+    # Native (python) replacement for 'SALT2mu.exe cat_only' used by
+    # sntable_cat.py; designed to run as process-pool worker,
+    # so all inputs are in one dictionary:
+    #   inp_file_list  : list of FITRES files (with or without .gz)
+    #   out_file       : name of catenated output (without .gz)
+    #   varname_append : e.g., 'PROB*,zPRIOR*'; fill -9.0 if missing
+    #   gzip_flag      : True -> gzip output (see gzip_file)
+    #   nthread_gzip   : number of threads for gzip (if pigz exists)
+    #
+    # Function returns dictionary with out_file and number of rows.
+
+    inp_file_list  = cat_info['inp_file_list']
+    out_file       = cat_info['out_file']
+    varname_append = cat_info['varname_append']
+    gzip_flag      = cat_info.get('gzip_flag',True)
+    nthread_gzip   = cat_info.get('nthread_gzip',1)
+
+    varnames_list = [ read_varnames_cat_fitres(f) for f in inp_file_list ]
+    varnames_out  = get_varnames_cat_fitres(varnames_list, varname_append)
+    n_row = 0
+
+    with open(out_file,"wt", buffering=BUFSIZE_MERGE_TABLE) as f_out:
+
+        # copy DOCANA block from first file, then cat notes
+        with open_table_TEXT(inp_file_list[0]) as f:
+            found_docana = False
+            for line in f:
+                wdlist = line.split()
+                if len(wdlist) == 0 : continue
+                if wdlist[0] == f"{KEY_DOCANA_START}:" : found_docana = True
+                if not found_docana : continue
+                f_out.write(line)
+                if wdlist[0] == f"{KEY_DOCANA_END}:" : break
+
+        f_out.write(f"# Catenated {len(inp_file_list)} tables with " \
+                    f"append_varname_missing='{varname_append}'\n")
+        f_out.write(f"VARNAMES: {' '.join(varnames_out)}\n\n")
+
+        for inp_file, varnames in zip(inp_file_list, varnames_list):
+            # map output column -> input column (-1 -> missing)
+            ivar_map  = [ varnames.index(v) if v in varnames else -1
+                          for v in varnames_out ]
+            same_cols = (varnames == varnames_out)
+            nvar      = len(varnames)
+            with open_table_TEXT(inp_file) as f:
+                for line in f:
+                    if line[0:3] != 'SN:' and line[0:4] != 'ROW:' : continue
+                    n_row += 1
+                    wdlist = line.split()
+                    if same_cols :
+                        f_out.write(' '.join(wdlist[0:nvar+1]) + '\n')
+                        continue
+                    row_out = [ wdlist[0] ]
+                    for ivar in ivar_map:
+                        if ivar < 0 :
+                            row_out.append(NULLVAL_CAT_FITRES)
+                        else:
+                            row_out.append(wdlist[ivar+1])
+                    f_out.write(' '.join(row_out) + '\n')
+
+    if gzip_flag :
+        gzip_file(out_file, GZIP_LEVEL_MERGE_TABLE, nthread_gzip)
+        out_file += '.gz'
+
+    cat_result = { 'out_file': out_file, 'n_row': n_row }
+    return cat_result
+    # end cat_fitres_native
+
+def gzip_file(file_name, level, nthread):
+    # Created Oct 2026
+    # gzip file_name -> file_name.gz and remove file_name (same as gzip).
+    # Use multi-threaded pigz if available and nthread>1;
+    # otherwise use zlib via python gzip module (zlib releases the GIL,
+    # so several files can be compressed in parallel threads).
+    # Returns number of bytes before and after compression.
+
+    if not os.path.isfile(file_name) :
+        logging.warning(f"WARNING: cannot gzip missing {file_name}")
+        return 0, 0
+
+    nbyte_in = os.path.getsize(file_name)
+    pigz     = shutil.which('pigz')
+    done     = False
+    if pigz is not None and nthread > 1 :
+        cmd = f"{pigz} -f -{level} -p {nthread} {file_name}"
+        ret = subprocess.run( cmd, shell=True )
+        done = (ret.returncode == 0)
+
+    if not done:
+        with open(file_name,"rb") as f_in:
+            with gzip.open(f"{file_name}.gz","wb",compresslevel=level) as f_out:
+                shutil.copyfileobj(f_in, f_out, BUFSIZE_MERGE_TABLE)
+        os.remove(file_name)
+
+    nbyte_out = os.path.getsize(f"{file_name}.gz")
+    return nbyte_in, nbyte_out
+    # end gzip_file
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - 
+# Compression service (Oct 2026): one thread pool per process
+# that replaces background gzip shells + polling for .gz files.
+
+GZIP_POOL = None
+
+def get_gzip_pool():
+    global GZIP_POOL
+    if GZIP_POOL is None:
+        GZIP_POOL = concurrent.futures.ThreadPoolExecutor(
+            max_workers=NTHREAD_GZIP_POOL, thread_name_prefix='gzip')
+    return GZIP_POOL
+    # end get_gzip_pool
+
+def set_gzip_level(level_dict):
+    # update gzip level per artifact class from user input
+    # (CONFIG key GZIP_LEVEL); abort on unknown class.
+    if level_dict is None: return
+    for gzip_class, level in level_dict.items():
+        if gzip_class not in GZIP_LEVEL_DICT:
+            msgerr = [ f"Unknown gzip class '{gzip_class}' in " \
+                       f"{KEY_GZIP_LEVEL}",
+                       f"Valid classes: {list(GZIP_LEVEL_DICT.keys())}" ]
+            log_assert(False,msgerr)
+        GZIP_LEVEL_DICT[gzip_class] = int(level)
+    # end set_gzip_level
+
+def gzip_files_async(file_list, gzip_class):
+    # Submit each file in file_list to gzip pool and return list of 
+    # futures; each future.result() is (nbyte_in, nbyte_out).
+    # If there is only one file, give it all of the pool threads via pigz.
+    pool    = get_gzip_pool()
+    level   = GZIP_LEVEL_DICT[gzip_class]
+    nthread = NTHREAD_GZIP_POOL if len(file_list) == 1 else 1
+    future_list = [ pool.submit(gzip_file, f, level, nthread) 
+                    for f in file_list ]
+    return future_list
+    # end gzip_files_async
+
+def wait_gzip_futures(future_list, comment, t_submit):
+    # wait for gzip futures and report throughput since t_submit
+    # (time.time() before the files were submitted to gzip pool).
+    nbyte_in = 0 ; nbyte_out = 0
+    for future in concurrent.futures.as_completed(future_list):
+        nb_in, nb_out = future.result()
+        nbyte_in  += nb_in
+        nbyte_out += nb_out
+
+    dt  = max(time.time() - t_submit, 1.0E-3)
+    MB  = 1.0E-6 * nbyte_in
+    msg = f"\t gzip {len(future_list)} {comment} files: " \
+          f"{MB:.1f} MB -> {1.0E-6*nbyte_out:.1f} MB " \
+          f"({MB/dt:.1f} MB/sec)"
+    logging.info(msg)
+    return nbyte_in, nbyte_out
+    # end wait_gzip_futures
+
+def gzip_files(file_list, gzip_class, comment):
+    # gzip all files in file_list with parallel threads and wait.
+    if len(file_list) == 0 : return 0, 0
+    t_submit    = time.time()
+    future_list = gzip_files_async(file_list, gzip_class)
+    return wait_gzip_futures(future_list, comment, t_submit)
+    # end gzip_files
 
 def extract_arg(key):
     # If key is of the form  KEY(ARG), function returns ARG.
@@ -908,6 +1502,223 @@ def backup_merge_file(merge_file):
     shutil.copyfile(merge_file, merge_file_save )
     # end backup_merge_file
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - 
+# Timeline tracing (Oct 2026): each submit and merge process appends
+# timestamped events to TIMELINE_FILE under output_dir; 
+# write_timeline_trace converts one or more timelines into 
+# Chrome-trace JSON (chrome://tracing or ui.perfetto.dev) and a CSV
+# summary of queue wait, run time and merge latency per job.
+
+def get_timeline_states(MERGE_INFO_CONTENTS):
+    # Return dictionary [(table,irow)] = (job, state) for each
+    # table row in MERGE.LOG; job is a compact label from the row 
+    # index and two columns after STATE (e.g., VERSION and FITOPT).
+    state_dict = {}
+    for table, row_list in MERGE_INFO_CONTENTS.items():
+        if not isinstance(row_list, list) : continue
+        for irow, row in enumerate(row_list):
+            if not isinstance(row, list) or len(row) < 2 : continue
+            job   = '_'.join([ str(x) for x in row[1:3] ])
+            job   = f"{irow:04d}-" + job.replace(' ','')
+            state = str(row[COLNUM_MERGE_STATE]).strip()
+            state_dict[(table,irow)] = (job, state)
+    return state_dict
+    # end get_timeline_states
+
+def get_timeline_transitions(state_start, state_end):
+    # Return list of STATE events for rows whose state changed.
+    event_list = []
+    for key, (job, state) in state_end.items():
+        if key in state_start and state_start[key][1] == state : continue
+        table = key[0]
+        event_list.append( ( TIMELINE_EVENT_STATE, table, job, state) )
+    return event_list
+    # end get_timeline_transitions
+
+def append_timeline(output_dir, event_list):
+    # Append event_list to TIMELINE_FILE with current time stamp.
+    # Each event is (event, table, job, state); use '-' for undefined.
+    # All lines are written in a single append so that lines from 
+    # different processes are not interleaved.
+    if len(event_list) == 0 : return
+    t_now = time.time()
+    lines = ''
+    for event, table, job, state in event_list:
+        lines += f"{t_now:.3f} {event} {table} {job} {state}\n"
+    try:
+        with open(f"{output_dir}/{TIMELINE_FILE}", "a") as f:
+            f.write(lines)
+    except OSError as e:
+        logging.warning(f"WARNING: cannot append {TIMELINE_FILE}: {e}")
+    # end append_timeline
+
+def read_timeline(timeline_file):
+    # return list of (t, event, table, job, state)
+    event_list = []
+    with open(timeline_file, "rt") as f:
+        for line in f:
+            wdlist = line.split()
+            if len(wdlist) != 5 or line[0] == '#' : continue
+            event_list.append( (float(wdlist[0]), *wdlist[1:]) )
+    return event_list
+    # end read_timeline
+
+def read_proctime_file(proctime_file):
+    # Created Oct 2026
+    # Read per-CPU sidecar written by CPU*.CMD script,
+    #   TIME_START: YYYY-MM-DD HH:MM:SS
+    #   TIME_END:   YYYY-MM-DD HH:MM:SS
+    #   CPU_TIMES:  0m0.010s 0m0.002s
+    #   12m30.500s 0m4.100s
+    # where CPU_TIMES is output of bash 'times' (user & sys for shell,
+    # then user & sys for child processes).
+    # Return dict with datetime for TIME_START/TIME_END and CPU_SEC;
+    # missing keys (job still running) are None.
+
+    proctime = { 'TIME_START': None, 'TIME_END': None, 'CPU_SEC': None }
+    with open(proctime_file, "rt") as f:
+        for line in f:
+            wdlist = line.split()
+            if len(wdlist) == 0 : continue
+            key = wdlist[0].rstrip(':')
+            if key in [ 'TIME_START', 'TIME_END' ] and len(wdlist) >= 3 :
+                t_str = f"{wdlist[1]} {wdlist[2]}"
+                proctime[key] = \
+                    datetime.datetime.strptime(t_str, '%Y-%m-%d %H:%M:%S')
+                continue
+            if key == 'CPU_TIMES' :
+                wdlist = wdlist[1:]
+                proctime['CPU_SEC'] = 0.0
+            if proctime['CPU_SEC'] is None : continue
+            for t_str in wdlist :
+                t_min, t_sec = t_str.rstrip('s').split('m')
+                proctime['CPU_SEC'] += 60.0*float(t_min) + float(t_sec)
+    return proctime
+    # end read_proctime_file
+
+def write_timeline_trace(output_dir_list):
+    # Created Oct 2026
+    # Read TIMELINE_FILE from each output_dir (e.g., sim, LCFIT, BBC
+    # and cosmofit stages of one chain) and write TIMELINE_TRACE_FILE
+    # and TIMELINE_SUMMARY_FILE in current directory. Each stage is a
+    # separate 'process' in the trace; each job row is a 'thread' with
+    # queue and run spans, and merge processes are on thread 0.
+    # 
+    # Definitions for summary (sec):
+    #   T_QUEUE : launch of CPU running job -> job observed RUN 
+    #   T_RUN   : job observed RUN      -> job observed DONE/FAIL
+    #   T_MERGE : last SPLIT job DONE   -> MERGE row DONE (MERGE table only)
+    # Note that RUN and DONE are observed by merge processes, so times
+    # are quantized by the merge cadence. SPLIT-table jobs are assigned
+    # to CPUs round-robin (same as write_command_file in each program);
+    # for other tables, or timelines without per-CPU launch events,
+    # T_QUEUE is measured from first launch of stage.
+
+    stage_list = []
+    for output_dir in output_dir_list:
+        timeline_file = f"{output_dir}/{TIMELINE_FILE}"
+        if not os.path.exists(timeline_file):
+            msgerr = [ f"Cannot find timeline file:", f"  {timeline_file}" ]
+            log_assert(False,msgerr)
+        stage = os.path.basename(os.path.normpath(output_dir))
+        stage_list.append( (stage, read_timeline(timeline_file)) )
+
+    t_list = [ ev[0] for stage, ev_list in stage_list for ev in ev_list ]
+    if len(t_list) == 0 :
+        log_assert(False, [ f"No events found in {TIMELINE_FILE}" ] )
+    t0 = min(t_list)
+
+    def usec(t): return int(1.0E6*(t-t0))
+
+    trace_list = []  ; summary_rows = []
+    for pid, (stage, ev_list) in enumerate(stage_list):
+        trace_list.append( { 'name':'process_name', 'ph':'M', 'pid':pid,
+                             'args': {'name': stage} } )
+        trace_list.append( { 'name':'thread_name', 'ph':'M', 'pid':pid, 
+                             'tid':0, 'args': {'name':'merge'} } )
+        t_submit = None ; t_split_done = None
+        merge_begin = {} ; job_dict = {} ; t_launch_cpu = {}
+        for t, event, table, job, state in ev_list:
+            if event == TIMELINE_EVENT_SUBMIT:
+                if t_submit is None: t_submit = t
+                # job is CPU[nnnn] (or CPU[nnnn]_JOBLIST* batch file)
+                if job[0:3] == 'CPU' and job[3:7].isdigit() :
+                    t_launch_cpu.setdefault(int(job[3:7]), t)
+                trace_list.append( { 'name':f"launch {job}", 'ph':'i', 
+                                     's':'p', 'pid':pid, 'tid':0, 
+                                     'ts':usec(t) } )
+            elif event == TIMELINE_EVENT_MERGE_BEGIN:
+                merge_begin[job] = t
+            elif event == TIMELINE_EVENT_MERGE_END and job in merge_begin:
+                tb = merge_begin.pop(job)
+                trace_list.append( { 'name':f"merge {job}", 'ph':'X',
+                                     'pid':pid, 'tid':0, 'ts':usec(tb),
+                                     'dur':usec(t)-usec(tb),
+                                     'args': {'state':state} } )
+            elif event == TIMELINE_EVENT_STATE:
+                key = (table,job)
+                if key not in job_dict:
+                    job_dict[key] = { 'tid': len(job_dict)+1, 'state':state,
+                                      't_run':None, 't_done':None, 
+                                      't_split_done':None }
+                info = job_dict[key]
+                info['state'] = state
+                if state == SUBMIT_STATE_RUN.strip() and info['t_run'] is None:
+                    info['t_run'] = t
+                if state in [ SUBMIT_STATE_DONE, SUBMIT_STATE_FAIL ]:
+                    info['t_done'] = t
+                    if table == TABLE_SPLIT:
+                        t_split_done = t
+                    else:
+                        info['t_split_done'] = t_split_done
+
+        for (table,job), info in job_dict.items():
+            tid = info['tid']
+            trace_list.append( { 'name':'thread_name', 'ph':'M', 'pid':pid,
+                                 'tid':tid, 'args':{'name':f"{table} {job}"}})
+            t_run = info['t_run'] ; t_done = info['t_done']
+            t_queue = None; t_exec = None; t_merge = None
+            t_launch = t_submit
+            irow_str = job.split('-')[0]
+            if table == TABLE_SPLIT and len(t_launch_cpu) > 0 and \
+               irow_str.isdigit() :
+                icpu     = int(irow_str) % (max(t_launch_cpu)+1)
+                t_launch = t_launch_cpu.get(icpu, t_submit)
+            if t_launch is not None and t_run is not None:
+                t_queue = t_run - t_launch
+                trace_list.append( { 'name':'queue', 'ph':'X', 'pid':pid,
+                                     'tid':tid, 'ts':usec(t_launch),
+                                     'dur':usec(t_run)-usec(t_launch) } )
+            if t_run is not None and t_done is not None:
+                t_exec = t_done - t_run
+                trace_list.append( { 'name':'run', 'ph':'X', 'pid':pid,
+                                     'tid':tid, 'ts':usec(t_run), 
+                                     'dur':usec(t_done)-usec(t_run),
+                                     'args': {'state':info['state']} } )
+            if table == TABLE_MERGE and t_done is not None and \
+               info['t_split_done'] is not None:
+                t_merge = t_done - info['t_split_done']
+
+            summary_rows.append( [ stage, table, job, info['state'], 
+                                   t_queue, t_exec, t_merge ] )
+
+    with open(TIMELINE_TRACE_FILE,"wt") as f:
+        json.dump( { 'traceEvents': trace_list, 
+                     'displayTimeUnit': 'ms' }, f )
+
+    def fmt(x): return '' if x is None else f"{x:.1f}"
+    with open(TIMELINE_SUMMARY_FILE,"wt") as f:
+        f.write("STAGE,TABLE,JOB,STATE,T_QUEUE,T_RUN,T_MERGE\n")
+        for stage, table, job, state, tq, tr, tm in summary_rows:
+            f.write(f"{stage},{table},{job},{state}," \
+                    f"{fmt(tq)},{fmt(tr)},{fmt(tm)}\n")
+
+    logging.info(f" Wrote {len(trace_list)} trace events to " \
+                 f"{TIMELINE_TRACE_FILE}")
+    logging.info(f" Wrote {len(summary_rows)} jobs to {TIMELINE_SUMMARY_FILE}")
+    return
+    # end write_timeline_trace
+
 def get_SNANA_program_path(snana_dir, program_name):
     # Created May 30 2024
     # Return full path of SNANA program executable in /bin directory.
@@ -972,6 +1783,104 @@ def wait_for_files(n_file_wait, wait_dir, wait_files):
 
     # end wait_for_file
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - 
+# Job memoization (Oct 2026): optional JOB_INFO['job_cache'] points 
+# to a content-addressed cache dir; write_job_info then reuses 
+# cached outputs (copy) instead of running the program.
+# Small input files (NML, KCOR, datafile=, ...) are keyed on contents;
+# gzipped files are hashed after decompression because the gzip header
+# includes a time stamp. Directories (e.g., upstream data VERSION) and
+# files larger than JOB_CACHE_NBYTE_CONTENT are keyed on cheap metadata
+# (name, size, mtime) so that the key costs no bulk I/O at submit;
+# a rewritten upstream file therefore gives a new key (safe miss).
+
+JOB_CACHE_SIG_DICT = {}   # memoized file/dir signatures for this process
+
+def get_job_cache_signature(path):
+    # return md5 of decompressed contents for a small file, or md5 of
+    # (size, mtime) for a large file, or md5 of (name, size, mtime)
+    # for each file in a directory.
+    real_path = os.path.realpath(path)
+    if real_path in JOB_CACHE_SIG_DICT:
+        return JOB_CACHE_SIG_DICT[real_path]
+
+    if os.path.isdir(real_path):
+        md5 = hashlib.md5()
+        with os.scandir(real_path) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                if not entry.is_file() : continue
+                st = entry.stat()
+                md5.update(f"{entry.name} {st.st_size} " \
+                           f"{st.st_mtime_ns}\n".encode())
+        sig = md5.hexdigest()
+    elif os.path.isfile(real_path) and \
+         os.path.getsize(real_path) > JOB_CACHE_NBYTE_CONTENT :
+        st  = os.stat(real_path)
+        sig = hashlib.md5(f"{st.st_size} {st.st_mtime_ns}".encode()).hexdigest()
+    elif os.path.isfile(real_path):
+        md5 = hashlib.md5()
+        open_file = gzip.open if real_path.endswith('.gz') else open
+        with open_file(real_path,"rb") as f:
+            for chunk in iter(lambda: f.read(BUFSIZE_MERGE_TABLE), b''):
+                md5.update(chunk)
+        sig = md5.hexdigest()
+    else:
+        sig = 'MISSING'
+
+    JOB_CACHE_SIG_DICT[real_path] = sig
+    return sig
+    # end get_job_cache_signature
+
+def get_job_cache_file_list(string, job_dir, prefix):
+    # return list of existing files named in string (e.g., program
+    # arguments or contents of NML input file), relative to job_dir.
+    # Output files of this job (starting with prefix) are skipped.
+    file_list = []
+    for token in re.split(r'[\s=,\'"]+', string):
+        if len(token) == 0 : continue
+        token = os.path.expandvars(token)
+        path  = token if os.path.isabs(token) else f"{job_dir}/{token}"
+        if os.path.basename(path).startswith(prefix) : continue
+        for p in [ path, f"{path}.gz" ] :
+            if os.path.isfile(p) :  file_list.append(p); break
+    return file_list
+    # end get_job_cache_file_list
+
+def get_job_cache_key(JOB_INFO, prefix, upstream_list, code_version):
+
+    # Created Oct 2026
+    # Return hash key for a split job from 
+    #   + code version and program executable
+    #   + program arguments
+    #   + input file and any file named in the arguments or in the
+    #     input file (relative to job_dir), e.g., BBC datafile= and
+    #     LCFIT KCOR_FILE.
+    #   + upstream_list of files/dirs, e.g., LCFIT data VERSION dir.
+    # Output files of this job (prefix*) are excluded.
+
+    job_dir    = JOB_INFO['job_dir']
+    program    = JOB_INFO['program']
+    arg_list   = [ arg.strip() for arg in JOB_INFO['arg_list'] ]
+    input_file = f"{job_dir}/{JOB_INFO['input_file']}"
+
+    sig_list = [ code_version, program, ' '.join(arg_list),
+                 get_program_hash(program) ]
+
+    file_list = [ input_file ]
+    file_list += get_job_cache_file_list(' '.join(arg_list), job_dir, prefix)
+    if os.path.isfile(input_file):
+        with open(input_file,"rt",errors='ignore') as f:
+            file_list += get_job_cache_file_list(f.read(), job_dir, prefix)
+
+    # each file is included once; file name is relative to job_dir
+    # so that the key does not depend on output dir
+    for path in list(dict.fromkeys(file_list)) + upstream_list :
+        name = os.path.relpath(path, job_dir)
+        sig_list.append(f"{name} {get_job_cache_signature(path)}")
+
+    return hashlib.md5('\n'.join(sig_list).encode()).hexdigest()
+    # end get_job_cache_key
+
 def write_job_info(f, JOB_INFO, icpu):
 
     # write job program plus arguemnts to file pointer f.
@@ -1066,6 +1975,21 @@ def write_job_info(f, JOB_INFO, icpu):
     # check optional start-file stamp (alternate way to get CPU time)
     if 'start_file' in JOB_INFO :
         f.write(f"touch {JOB_INFO['start_file']} \n")
+
+    # Oct 2026: check job cache; if this job already finished in a 
+    # previous submit, copy its output instead of running program.
+    # Copies (not hard links) ensure that output and cache files 
+    # are never modified through each other.
+    use_job_cache = 'job_cache' in JOB_INFO
+    if use_job_cache :
+        cache_dir    = JOB_INFO['job_cache']['dir']
+        cache_prefix = JOB_INFO['job_cache']['prefix']
+        f.write(f"JOB_CACHE={cache_dir}\n")
+        f.write(f"if [ -f $JOB_CACHE/{JOB_CACHE_DONE_FILE} ] ; then \n")
+        f.write(f"  echo \"Reuse {cache_prefix} output from $JOB_CACHE\" \n")
+        f.write(f"  cp $JOB_CACHE/{cache_prefix}* . \n")
+        f.write(f"else \n")
+
     # - - - - - - - - - 
     f.write(f"{program} {input_file} \\\n")
     # write each arg on separte line for easier viewing
@@ -1074,11 +1998,28 @@ def write_job_info(f, JOB_INFO, icpu):
             f.write(f"   {arg} \\\n")
         
     f.write(f"  &>  {log_file} \n" )   # write to stdout and stderr
+    if use_job_cache :
+        f.write(f"JOB_STATUS=$? \n")
     f.write(f"echo Finished {program} at {ECHO_TIME}\n")
     # Apr 2022: for lcfit program, remove minuit stdout from log file
     if PROGRAM_NAME_LCFIT in program:
         f.write(f"remove_minuit_stdout.py {log_file}\n")
 
+    if use_job_cache :
+        # store copy of output from successful job (program status 0
+        # and YAML output exists); rename tmp dir so that the cache
+        # never has a partial job.
+        tmp_dir = "$JOB_CACHE.tmp$$"
+        f.write(f"if [ $JOB_STATUS -eq 0 ] && " \
+                f"[ -f {cache_prefix}.YAML ] ; then \n")
+        f.write(f"  mkdir -p {tmp_dir} && " \
+                f"cp -p {cache_prefix}* {tmp_dir}/ && " \
+                f"touch {tmp_dir}/{JOB_CACHE_DONE_FILE} && " \
+                f"mv -T {tmp_dir} $JOB_CACHE 2>/dev/null " \
+                f"|| rm -rf {tmp_dir} \n")
+        f.write(f"fi \n")
+        f.write(f"fi \n")
+
     if len(done_file) > 4 :
         f.write(f"touch {done_file} \n")
         f.write(f"echo 'Create {done_file}' \n")
@@ -1412,12 +2353,91 @@ def extract_yaml(input_file, key_start, key_end):
             # xxx mark delete if line.startswith("#END_YAML"): break
             line_list.append(line)
 
-    config = yaml.safe_load("\n".join(line_list))
+    config = yaml.load("\n".join(line_list), Loader=YAML_LOADER)
 
     #logging.info(f" YAML config loaded successfully from {input_file}")
     return config
     # end extract_yaml
 
+def extract_yaml_list(input_file_list):
+    # Created Oct 2026
+    # Return list of parsed yaml contents for each file in input_file_list,
+    # reading files in parallel threads (mainly helps on network disks).
+    with concurrent.futures.ThreadPoolExecutor(NTHREAD_YAML_READ) as pool:
+        contents_list = list(pool.map(lambda f: extract_yaml(f,None,None),
+                                      input_file_list))
+    return contents_list
+    # end extract_yaml_list
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - 
+# Oct 2026: cache of parsed split-job YAML files so that merge passes
+# never re-parse unchanged files. One cache per directory, kept in 
+# memory for this process and saved to {dir}/JOB_YAML_CACHE_FILE 
+# for the next merge process. Each entry is keyed on file name and
+# validated with (size, mtime_ns).
+
+YAML_CACHE_DICT = {}   # [cache_file] = { 'changed':bool, 'contents':dict }
+
+def get_yaml_cache(cache_file):
+    if cache_file not in YAML_CACHE_DICT:
+        contents = {}
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file,"rb") as f:
+                    contents = pickle.load(f)
+            except Exception as e:
+                logging.warning(f"WARNING: ignore corrupt {cache_file}: {e}")
+                contents = {}
+        YAML_CACHE_DICT[cache_file] = { 'changed':False, 'contents':contents }
+    return YAML_CACHE_DICT[cache_file]
+    # end get_yaml_cache
+
+def read_yaml_cached(yaml_dir, yaml_file):
+    # Return parsed contents of {yaml_dir}/{yaml_file}, using cache
+    # if file size and mtime_ns are unchanged.
+    YAML_FILE  = f"{yaml_dir}/{yaml_file}"
+    cache      = get_yaml_cache(f"{yaml_dir}/{JOB_YAML_CACHE_FILE}")
+    st         = os.stat(YAML_FILE)
+    sig        = ( st.st_size, st.st_mtime_ns )
+    entry      = cache['contents'].get(yaml_file,None)
+
+    if entry is None or entry[0] != sig :
+        contents = extract_yaml(YAML_FILE, None, None)
+        cache['contents'][yaml_file] = ( sig, contents )
+        cache['changed'] = True
+    else:
+        contents = entry[1]
+
+    # return copy so that caller can modify (e.g., setdefault)
+    return dict(contents)
+    # end read_yaml_cached
+
+def save_yaml_cache():
+    # write each changed cache; write tmp file then rename so that 
+    # a crash never leaves a truncated cache.
+    for cache_file, cache in YAML_CACHE_DICT.items():
+        if not cache['changed'] : continue
+        if not os.path.isdir(os.path.dirname(cache_file)) : continue
+        tmp_file = f"{cache_file}.tmp{os.getpid()}"
+        with open(tmp_file,"wb") as f:
+            pickle.dump(cache['contents'], f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        cache['changed'] = False
+    # end save_yaml_cache
+
+def remove_yaml_cache(output_dir):
+    # remove cache files (final cleanup) so that they are not tarred.
+    # Search all of output_dir because caches written by earlier merge
+    # processes are not necessarily loaded in this process; include
+    # tmp files left by a crash during save_yaml_cache.
+    cache_list = list(YAML_CACHE_DICT.keys())
+    for pattern in [ JOB_YAML_CACHE_FILE, f"{JOB_YAML_CACHE_FILE}.tmp*" ]:
+        cache_list += glob.glob(f"{output_dir}/**/{pattern}", recursive=True)
+    for cache_file in set(cache_list):
+        if os.path.exists(cache_file): os.remove(cache_file)
+    YAML_CACHE_DICT.clear()
+    # end remove_yaml_cache
+
 
 def get_wfit_values(wfit_yaml):
 
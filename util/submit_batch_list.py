@@ -12,10 +12,19 @@
 #
 # July 9 2024: remove scancel --me ... later, need to scancel specific pids
 #
+# Oct 2026: new --pipeline option launches each input file as soon as its
+#   own upstream outputs are ready instead of waiting for every ALL.DONE
+#   in the previous row:
+#     + LCFIT (VERSION key) waits only for the matching sim GENVERSIONs
+#       in upstream sim MERGE.LOG tables.
+#     + BBC/wfit (INPDIR+/INPDIR keys) wait only for ALL.DONE of the
+#       upstream OUTDIRs listed there.
+#     + any other input waits for all previous rows (as without --pipeline).
+#
 # ==================================================
 
 import os, sys, datetime, shutil, subprocess, time, glob, yaml, argparse
-import getpass, logging
+import getpass, logging, fnmatch
 
 SNANA_DIR        = os.getenv('SNANA_DIR')
 USERNAME         = getpass.getuser()
@@ -35,6 +44,16 @@ ALL_DONE_FILE      = "ALL.DONE"
 
 STRING_SUCCESS = "SUCCESS"
 
+# for --pipeline option (Oct 2026)
+KEY_VERSION            = 'VERSION'                # LCFIT
+KEY_INPDIR_LIST        = [ 'INPDIR+', 'INPDIR' ]  # BBC, wfit
+KEY_GENVERSION_LIST    = 'GENVERSION_LIST'        # sim
+TABLE_MERGE            = 'MERGE'
+COLNUM_MERGE_STATE     = 0
+COLNUM_SIM_GENVERSION  = 2
+STATE_DONE             = 'DONE'
+BUSY_FILE_WILDCARD     = "BUSY_MERGE_CPU*.LOCK"
+
 WAIT_TIME_CHECK_DONE    =  20.0   # time (sec) between checking for done files
 WAIT_TIME_STDOUT_UPDATE = 600.0   # time (sec) betweeing printing status to stdout 
 
@@ -63,6 +82,10 @@ def parse_args():
     parser.add_argument("-l", "--list_file", help=msg, default=None, 
                         type=str)
 
+    msg = f"launch each input when its upstream versions/dirs are done " \
+          f"(instead of waiting for previous row)"
+    parser.add_argument("--pipeline", help=msg, action="store_true")
+
     args = parser.parse_args()
 
     if args.snana_dir is None:
@@ -121,6 +144,11 @@ SUBMIT_LIST:
 # 4th set of jobs
   - LCFIT_DES_FITOPT_SPARSE.NML  LCFIT_LOWZ_FITOPT_SPARSE.NML
   - BBC_FITOPT_MAP.INPUT
+
+# With --pipeline, each LCFIT input is launched as soon as ALL of the sim 
+# GENVERSIONs matching its VERSION list are merged, and each BBC/wfit
+# input as soon as its INPDIR(s) have ALL.DONE; other inputs still
+# wait for all previous rows.
 """
     sys.exit(f"{help_menu}")
 
@@ -267,13 +295,14 @@ def get_outdir_list(config):
     # end parse_outdir
 
 
-def run_submit(infile_list, outdir_list, SUBMIT_INFO ):
+def launch_submit(infile, outdir, SUBMIT_INFO):
+
+    # Oct 2026: launch one submit_batch_jobs task (moved from run_submit)
+    # and return name of its done file.
 
     INPUTS = SUBMIT_INFO['INPUTS']  # command line inputs
     config = SUBMIT_INFO['config']  # contents of config input file
 
-    # infile_list is space-separated list of input files
-    # to launch with submit_batch_jobs
     SUBMIT_JOB_NAME = os.path.expandvars(INPUTS.jobname)
     snana_dir       = INPUTS.snana_dir
     submit_dir      = config[KEY_SUBMIT_DIR]
@@ -281,37 +310,44 @@ def run_submit(infile_list, outdir_list, SUBMIT_INFO ):
     if not os.path.exists(SUBMIT_LOG_DIR):
         os.mkdir(SUBMIT_LOG_DIR)
 
-    done_file_list = []
-    info_file_list = []
-    for infile, outdir in zip(infile_list, outdir_list) :
-        merge_file       = f"{submit_dir}/{outdir}/{MERGE_LOG_FILE}"
-        merge_iter1_file = f"{submit_dir}/{outdir}_ITER1/{MERGE_LOG_FILE}"
-        info_file        = f"{submit_dir}/{outdir}/{SUBMIT_INFO_FILE}"
-        info_iter1_file  = f"{submit_dir}/{outdir}_ITER1/{SUBMIT_INFO_FILE}"
-        done_file        = f"{submit_dir}/{outdir}/{ALL_DONE_FILE}"      
-        info_file_list.append(info_file)
-        done_file_list.append(done_file)
-        logging.info(f" submit {infile}  -> {outdir}")
+    merge_file       = f"{submit_dir}/{outdir}/{MERGE_LOG_FILE}"
+    merge_iter1_file = f"{submit_dir}/{outdir}_ITER1/{MERGE_LOG_FILE}"
+    info_file        = f"{submit_dir}/{outdir}/{SUBMIT_INFO_FILE}"
+    info_iter1_file  = f"{submit_dir}/{outdir}_ITER1/{SUBMIT_INFO_FILE}"
+    done_file        = f"{submit_dir}/{outdir}/{ALL_DONE_FILE}"      
+    logging.info(f" submit {infile}  -> {outdir}")
+
+    arg_list   = [ infile ]
+    arg_string = infile
+    if snana_dir != SNANA_DIR:  
+        arg_list   = [ infile, f"--snana_dir", f"{snana_dir}" ]
+        arg_string = f"{infile} --snana_dir {snana_dir}"
 
-        arg_list   = [ infile ]
-        arg_string = infile
-        if snana_dir != SNANA_DIR:  
-            arg_list   = [ infile, f"--snana_dir", f"{snana_dir}" ]
-            arg_string = f"{infile} --snana_dir {snana_dir}"
+    prefix          = infile.split('.')[0]
+    submit_log_file = f"{SUBMIT_LOG_DIR}/submit_{prefix}.log"
 
-        prefix          = infile.split('.')[0]
-        submit_log_file = f"{SUBMIT_LOG_DIR}/submit_{prefix}.log"
+    cmd_list   = [ SUBMIT_JOB_NAME ] + arg_list
+    cmd_string = f"{SUBMIT_JOB_NAME} {arg_string} >& {submit_log_file} "
 
-        cmd_list   = [ SUBMIT_JOB_NAME ] + arg_list
-        cmd_string = f"{SUBMIT_JOB_NAME} {arg_string} >& {submit_log_file} "
+    ret = subprocess.run( [cmd_string], cwd=submit_dir,
+                          shell=True, capture_output=True, text=True )
 
-        ret = subprocess.run( [cmd_string], cwd=submit_dir,
-                              shell=True, capture_output=True, text=True )
+    time.sleep(1)
+    check_file_exists( [ merge_file, merge_iter1_file] )
+    check_file_exists( [ info_file,  info_iter1_file ] )
+    time.sleep(3)
 
-        time.sleep(1)
-        check_file_exists( [ merge_file, merge_iter1_file] )
-        check_file_exists( [ info_file,  info_iter1_file ] )
-        time.sleep(3)
+    return done_file
+    # end launch_submit
+
+def run_submit(infile_list, outdir_list, SUBMIT_INFO ):
+
+    # infile_list is space-separated list of input files
+    # to launch with submit_batch_jobs
+    done_file_list = []
+    for infile, outdir in zip(infile_list, outdir_list) :
+        done_file = launch_submit(infile, outdir, SUBMIT_INFO)
+        done_file_list.append(done_file)
 
     # - - - - - - - 
     # wait for done files
@@ -349,6 +385,185 @@ def run_submit(infile_list, outdir_list, SUBMIT_INFO ):
 
     # end run_submit
 
+def get_pipeline_nodes(infile_submit_list, outdir_submit_list, config,
+                       nrowskip):
+
+    # Created Oct 2026
+    # Return list of nodes for --pipeline option; one node per input 
+    # file, with info needed to decide when the node is ready to launch.
+
+    submit_dir = config[KEY_SUBMIT_DIR]
+    node_list  = []
+    irow       = -1
+    for infile_set, outdir_set in zip(infile_submit_list,outdir_submit_list):
+        irow += 1
+        if irow < nrowskip : continue
+        for infile, outdir in zip(infile_set.split(), outdir_set.split()):
+            input_yaml = extract_yaml(f"{submit_dir}/{infile}")
+            CONFIG     = input_yaml['CONFIG']
+
+            version_list = CONFIG.get(KEY_VERSION, None)
+            if isinstance(version_list, str) : 
+                version_list = version_list.split()
+
+            inpdir_list = None
+            for key in KEY_INPDIR_LIST:
+                if key not in CONFIG : continue
+                tmp_list = CONFIG[key]
+                if not isinstance(tmp_list, list) : tmp_list = [ tmp_list ]
+                inpdir_list = [ get_real_dir(submit_dir,d) for d in tmp_list
+                                if str(d) != 'None' ]
+
+            node = {
+                'irow'         : irow,
+                'infile'       : infile,
+                'outdir'       : outdir,
+                'OUTDIR'       : get_real_dir(submit_dir,outdir),
+                'is_sim'       : KEY_GENVERSION_LIST in input_yaml,
+                'n_genversion' : len(input_yaml.get(KEY_GENVERSION_LIST,[])),
+                'version_list' : version_list,
+                'inpdir_list'  : inpdir_list,
+                'done_file'    : None,
+                'done'         : False
+            }
+            node_list.append(node)
+
+    return node_list
+    # end get_pipeline_nodes
+
+def get_real_dir(submit_dir, dir_name):
+    dir_name = os.path.expandvars(str(dir_name))
+    if not os.path.isabs(dir_name):
+        dir_name = f"{submit_dir}/{dir_name}"
+    return os.path.realpath(dir_name)
+
+def get_sim_genversion_states(node):
+    # return dictionary [genversion] = True if DONE, and return True
+    # if MERGE.LOG is not ready to trust. Merge process rewrites MERGE.LOG
+    # in place, so a read can see an empty or partial file; therefore
+    # check BUSY lock before and after reading, and treat any of the
+    # following as busy (i.e., retry on next poll):
+    #   + BUSY lock exists before or after read (or appears/disappears)
+    #   + yaml parse error, or empty contents
+    #   + fewer MERGE rows than GENVERSIONs in sim input (truncated file)
+    merge_file    = f"{node['OUTDIR']}/{MERGE_LOG_FILE}"
+    busy_wildcard = f"{node['OUTDIR']}/{BUSY_FILE_WILDCARD}"
+    state_dict    = {}
+    if not os.path.exists(merge_file) : return state_dict, True
+
+    busy_list0 = glob.glob(busy_wildcard)
+    try:
+        contents = extract_yaml(merge_file)
+    except Exception:
+        contents = None
+    busy_list1 = glob.glob(busy_wildcard)
+
+    if len(busy_list0) > 0 or len(busy_list1) > 0 : return state_dict, True
+    if not isinstance(contents,dict)              : return state_dict, True
+
+    row_list = contents.get(TABLE_MERGE,None)
+    if not isinstance(row_list,list) : return state_dict, True
+    if len(row_list) < node['n_genversion'] : return state_dict, True
+
+    for row in row_list :
+        if not isinstance(row,list) or len(row) <= COLNUM_SIM_GENVERSION:
+            return {}, True
+        genversion = str(row[COLNUM_SIM_GENVERSION])
+        state_dict[genversion] = (row[COLNUM_MERGE_STATE] == STATE_DONE)
+
+    return state_dict, False
+    # end get_sim_genversion_states
+
+def is_pipeline_node_ready(node, node_list):
+
+    # Return True if node can be launched.
+    # If no upstream dependency is found from VERSION or INPDIR keys, 
+    # wait for all nodes in previous rows (same as without --pipeline).
+    #
+    # Granularity is one launch per input file: an LCFIT input waits for
+    # every GENVERSION matched by its VERSION list. A per-version launch
+    # would need a separate OUTDIR per version, which breaks downstream
+    # BBC/wfit inputs whose INPDIR expects the single LCFIT OUTDIR.
+
+    node_prev_list = [ n for n in node_list if n['irow'] < node['irow'] ]
+
+    version_list = node['version_list']
+    if version_list is not None :
+        n_match = 0
+        for n in node_prev_list:
+            if not n['is_sim'] : continue
+            if n['done_file'] is None : return False  # not launched yet
+            state_dict, busy = get_sim_genversion_states(n)
+            for genversion, done in state_dict.items():
+                match = any( [ fnmatch.fnmatch(genversion,v) 
+                               for v in version_list ] )
+                if not match : continue
+                n_match += 1
+                if busy or not done : return False
+        if n_match > 0 : return True
+
+    inpdir_list = node['inpdir_list']
+    if inpdir_list is not None :
+        n_match = 0
+        for n in node_prev_list:
+            match = any( [ fnmatch.fnmatch(n['OUTDIR'],d) 
+                           for d in inpdir_list ] )
+            if not match : continue
+            n_match += 1
+            if not n['done'] : return False
+        if n_match > 0 : return True
+
+    return all( [ n['done'] for n in node_prev_list ] )
+    # end is_pipeline_node_ready
+
+def run_pipeline(node_list, SUBMIT_INFO):
+
+    # Created Oct 2026
+    # Launch each node as soon as it is ready, and wait for all 
+    # ALL.DONE files. Any FAIL in ALL.DONE aborts (check_done_file).
+
+    NDONE_EXPECT = len(node_list)
+    NDONE_LAST   = -9
+    t_proc_sec   = 0.0
+    t_proc_upd   = 0.0
+
+    while True:
+        for node in node_list :
+            if node['done_file'] is not None : continue
+            if is_pipeline_node_ready(node, node_list):
+                node['done_file'] = \
+                    launch_submit(node['infile'], node['outdir'], SUBMIT_INFO)
+
+        NDONE_FIND = 0 ; NRUN = 0
+        for node in node_list :
+            if node['done_file'] is None : continue
+            if not node['done'] :
+                node['done'] = check_done_file(node['done_file'])
+            if node['done'] : 
+                NDONE_FIND += 1
+            else:
+                NRUN += 1
+
+        if NDONE_FIND == NDONE_EXPECT : break
+
+        t_proc_min  = t_proc_sec/60.0
+        DO_STDOUT_UPD = (NDONE_FIND > NDONE_LAST) or \
+                        (t_proc_upd >= WAIT_TIME_STDOUT_UPDATE)
+        if DO_STDOUT_UPD:
+            msg = f"\t found {NDONE_FIND} of {NDONE_EXPECT} {ALL_DONE_FILE} " \
+                  f"files; {NRUN} running ({t_proc_min:.1f} minutes)"
+            logging.info(msg)
+            t_proc_upd = 0.0
+        NDONE_LAST = NDONE_FIND
+
+        time.sleep(WAIT_TIME_CHECK_DONE)
+        t_proc_sec += WAIT_TIME_CHECK_DONE
+        t_proc_upd += WAIT_TIME_CHECK_DONE
+
+    logging.info(f"\t Finished pipeline with {STRING_SUCCESS}" )
+    return
+    # end run_pipeline
+
 # ===================================
 # ============== MAIN ===============
 # ===================================
@@ -389,6 +604,12 @@ if __name__ == "__main__":
     logging.info(f"\n# - - - - - - - - - - - - - - - - - -"); 
     logging.info(f" Output subDirs under {submit_dir}\n")
 
+    if INPUTS.pipeline :
+        node_list = get_pipeline_nodes(infile_submit_list, outdir_submit_list,
+                                       config, INPUTS.nrowskip)
+        run_pipeline(node_list, SUBMIT_INFO)
+        infile_submit_list = []  # skip row-by-row submit below
+
     nset =  0
     for infile_set, outdir_set in zip(infile_submit_list,outdir_submit_list):
         nset += 1